@@ -0,0 +1,522 @@
+import argparse
+import json
+import html
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+import types
+from typing import List, Tuple
+
+from lexer.fmt import FiniteStateMachine
+from lexer.states import InitialState
+from page.generator import PageGenerator
+from page.layout import PageLayout
+from page.search import SearchIndex
+from page.template import TextTemplate
+from parser.builder import StructureBuilder
+from parser.fmt import ParserFiniteStateMachine
+from parser.parser import Parser
+from parser.states import ParserInitialState
+from util.source_reader import SourceReader
+from util.util import SymbolIndex, DocumentedFile, DocumentedClass, DocumentedMethod, DocumentedProperty
+
+JAVA_SOURCE = '''/**
+ * Sample {@link Base} file.
+ */
+package org.example.core;
+
+import java.util.List;
+import org.example.api.Base;
+
+/**
+ * Sample class.
+ *
+ * @since 1.0
+ */
+@Component
+public abstract class Sample extends Base implements Runnable, Serializable {
+    /** the count */
+    private static final int count = 0;
+    protected List<String> names;
+
+    /**
+     * Runs it.
+     *
+     * @param x the x
+     * @return the x
+     */
+    @Override
+    public synchronized <R> R run(Map<String, List<R>> x, int[] y) throws Exception {
+        if (x == null) { return null; }
+        return x;
+    }
+
+    static class Inner implements Runnable {
+        public void run() {}
+    }
+}
+'''
+
+
+def generate_synthetic_tree(root: str, packages: int, files_per_package: int) -> str:
+    for p in range(packages):
+        package_dir = os.path.join(root, 'org', 'example', 'p{}'.format(p))
+        os.makedirs(package_dir)
+
+        for f in range(files_per_package):
+            class_name = 'Sample{}'.format(f)
+            with open(os.path.join(package_dir, class_name + '.java'), 'w') as file:
+                file.write(JAVA_SOURCE.replace('org.example.core', 'org.example.p{}'.format(p))
+                           .replace('Sample', class_name))
+
+    return root
+
+
+def generate_documented_files(files: int) -> List[DocumentedFile]:
+    """Parsed models of files in 50 packages, each with a class of 60 methods and 39 properties."""
+    file_list = []
+    for i in range(files):
+        documented_file = DocumentedFile()
+        documented_file.file_path = 'org/example/p{}/Class{}.java'.format(i % 50, i)
+        documented_file.package = 'org.example.p{}'.format(i % 50)
+
+        c = DocumentedClass.create(None, [], 'public', [], 'Class{}'.format(i), None, [], [
+            DocumentedMethod.create(None, [], 'public', [], 'int', 'getValue{}'.format(j), [['int', 'x']])
+            for j in range(60)], [])
+        c.properties = [DocumentedProperty.create(None, [], 'private', [], 'int', 'value{}'.format(j))
+                        for j in range(39)]
+        documented_file.classes = [c]
+        file_list.append(documented_file)
+
+    return file_list
+
+
+def render_by_splicing(template: TextTemplate, **kwargs) -> str:
+    """Previous TextTemplate.render, kept as the baseline for the template benchmark."""
+    shift = 0
+    text = template.text
+    for match in TextTemplate.placeholder_regex.finditer(template.text):
+        argument = str(kwargs.get(match.group(1), None))
+        text = text[:match.start() + shift] + argument + text[match.end() + shift:]
+        shift += len(argument) - match.end() + match.start()
+    return text
+
+
+def template_arguments(size: int) -> dict:
+    """Arguments of the page and class templates, the text ones of the given size."""
+    big_argument = 'x' * size
+    return {
+        'root': dict(rel_path_bootstrap='a.css', rel_path_stylesheet='b.css', rel_path_search_script='s.js',
+                     package_structure_path='p.html', root_path='..', file_path_hash='f', file_path='f',
+                     file_doc=big_argument, package_name='p', index_page_path='index.html', classes=big_argument),
+        'class': dict(anchor='C', name='C', docs=big_argument, extends='E', impl_list='I',
+                      inner_classes=big_argument, methods=big_argument, properties=big_argument)
+    }
+
+
+def as_dict_backed(obj):
+    """Copy of a parsed model with plain instance dicts and without shared strings, as the model was before slots."""
+    if isinstance(obj, str):
+        return obj.encode().decode() if obj else obj
+    if isinstance(obj, list):
+        return [as_dict_backed(item) for item in obj]
+    if hasattr(obj, '_attributes'):
+        return types.SimpleNamespace(**{name: as_dict_backed(value) for name, value in obj._attributes().items()})
+    return obj
+
+
+def render_doc_string_by_splicing(doc, documented_file, symbol_index) -> str:
+    """Previous PageGenerator.render_doc_string, kept as the baseline for the doc string benchmark."""
+    result = ''
+    for line in doc.split('\n'):
+        i = line.rfind('*')
+
+        if i < 0:
+            line = line + '\n'
+        elif i + 1 < len(line) and line[i + 1] == '/':
+            line = ''
+        else:
+            line = line[i + 1:].strip() + '\n'
+
+        shift = 0
+        for match in re.finditer(r'{(?:@code) (.*?)}', line):
+            argument = html.escape(match.group(1))
+            line = line[:match.start() + shift] + argument + line[match.end() + shift:]
+            shift += len(argument) - match.end() + match.start()
+
+        shift = 0
+        for match in re.finditer(r'{(?:@link) ([\w.]+)}', line):
+            argument = PageGenerator._render_class_link(match.group(1), documented_file, symbol_index)
+            line = line[:match.start() + shift] + argument + line[match.end() + shift:]
+            shift += len(argument) - match.end() + match.start()
+
+        result += re.sub(r'(@[a-z]+)', r'<span class="text-primary">\1</span>', line)
+
+    return result
+
+
+class StepRecorder:
+
+    def __init__(self, fmt):
+        self.states = []
+        self._step = fmt.step
+        fmt.step = self.step
+        self.fmt = fmt
+
+    def step(self, event):
+        entry = self._step(event)
+        self.states.append(self.fmt.state)
+        return entry
+
+    @property
+    def allocated(self) -> int:
+        return len({id(state) for state in self.states})
+
+
+def record_states(source: str) -> Tuple[StepRecorder, StepRecorder]:
+    """Lexes and parses the source, records the states the lexer and the parser step through."""
+    lexer_fmt = FiniteStateMachine(InitialState())
+    lexer_recorder = StepRecorder(lexer_fmt)
+    lexer_fmt.process_string(source)
+
+    parser_fmt = ParserFiniteStateMachine(ParserInitialState())
+    parser_recorder = StepRecorder(parser_fmt)
+    parser_fmt.process_tokens(lexer_fmt.partition.exclude('WhitespaceState', 'InitialState'))
+
+    return lexer_recorder, parser_recorder
+
+
+
+def measure_page_memory(methods: int) -> Tuple[int, int, int]:
+    """Returns the size of a page with that many documented methods, peaks of streaming it and of rendering it."""
+    source = ''.join('''
+    /**
+     * Method {0} with a {{@code long}} description.
+     */
+    public String method{0}(Map<String, List<Integer>> x, int y) {{ return null; }}
+'''.format(i) for i in range(methods))
+    documented_file = Parser.parse_structure('package org.example;\nclass Huge {' + source + '}\n')
+    documented_file.file_path = 'org/example/Huge.java'
+    symbol_index = SymbolIndex([documented_file])
+
+    # parsed and compiled comments stay on the model objects, only the page buffers are measured
+    for method in documented_file.classes[0].methods:
+        PageGenerator.render_javadoc(method.javadoc, documented_file, symbol_index)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        PageGenerator.create_file(documented_file, symbol_index, tmp)
+        _, streaming_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        page_size = os.path.getsize(os.path.join(tmp, documented_file.file_path + '.html'))
+
+    tracemalloc.start()
+    PageGenerator.render_file(documented_file, symbol_index)
+    _, rendering_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return page_size, streaming_peak, rendering_peak
+
+
+def measure_model_memory(files: int) -> Tuple[int, int]:
+    """Returns memory taken by models of that many parsed files and by their dict-backed copies."""
+    sources = [JAVA_SOURCE.replace('org.example.core', 'org.example.p{}'.format(i % 10))
+               .replace('Sample', 'Sample{}'.format(i)) for i in range(files)]
+
+    tracemalloc.start()
+    models = [Parser.parse_structure(source).classes for source in sources]
+    slotted = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    # the copies are referenced until the measurement is taken
+    dict_backed_models = [as_dict_backed(classes) for classes in models]
+    dict_backed = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return slotted, dict_backed
+
+
+def measure_sidebar(root: str, packages: int) -> Tuple[int, int]:
+    """Returns sizes of the sidebar page and of its manifest for a project of that many packages of 25 files."""
+    root_path = generate_synthetic_tree(os.path.join(root, 'src'), packages, 25)
+    tree = Parser._generate_tree_from_list(Parser._list_files_hierarchy(root_path, False))
+    Parser._parse_tree(tree, root_path, 'fsm', False, 1)
+
+    output_dir = os.path.join(root, 'out')
+    PageGenerator.create_package_structure(tree, output_dir)
+
+    return (os.path.getsize(os.path.join(output_dir, PageGenerator.PACKAGE_STRUCTURE_PAGE)),
+            os.path.getsize(os.path.join(output_dir, PageGenerator.PACKAGE_MANIFEST)))
+
+
+def measure_split_pages(inner_classes: int, split_members: int) -> List[Tuple[int, int]]:
+    """Returns page counts and largest page sizes of a file with that many inner classes, unsplit and split."""
+    # generated sources keep hundreds of inner classes in one file
+    source = ''.join('''
+    /** Inner class {0}. */
+    public static class Inner{0} {{
+        /** Reads the value. */
+        public int getValue() {{ return 0; }}
+        /** Writes the value. */
+        public void setValue(int value) {{ }}
+        /** Resets the value. */
+        public void reset() {{ }}
+    }}
+'''.format(i) for i in range(inner_classes))
+    documented_file = Parser.parse_structure('package org.example;\n\n/** Generated. */\npublic class Generated {'
+                                             + source + '}\n')
+    documented_file.file_path = 'org/example/Generated.java'
+    symbol_index = SymbolIndex([documented_file])
+
+    sizes = []
+    for layout in [PageLayout(), PageLayout(split_members)]:
+        pages = PageGenerator.render_pages(documented_file, symbol_index, layout)
+        sizes.append((len(pages), max(len(contents) for _, contents in pages)))
+    return sizes
+
+
+def measure_parse_memory(copies: int) -> Tuple[int, int]:
+    """Returns peaks of parsing copies of the sample source stage by stage and streamed."""
+    source = JAVA_SOURCE * copies
+
+    def parse_staged(contents):
+        lexer_fmt = FiniteStateMachine(InitialState())
+        lexer_fmt.process_string(contents)
+        parser_fmt = ParserFiniteStateMachine(ParserInitialState())
+        parser_fmt.process_tokens(lexer_fmt.partition.exclude('WhitespaceState', 'InitialState'))
+        return StructureBuilder().build(parser_fmt.partition)
+
+    peaks = []
+    for parse in [parse_staged, Parser.parse_structure]:
+        tracemalloc.start()
+        parse(source)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return peaks[0], peaks[1]
+
+
+def parallel_page_rendering():
+    with tempfile.TemporaryDirectory() as tmp:
+        root_path = generate_synthetic_tree(os.path.join(tmp, 'src'), packages=10, files_per_package=15)
+
+        tree = Parser._generate_tree_from_list(Parser._list_files_hierarchy(root_path, False))
+        Parser._parse_tree(tree, root_path, 'fsm', False, 1)
+
+        file_list = []
+        tree.traverse(file_list.append)
+
+        timings = {}
+        for jobs in [1, 4]:
+            start = time.perf_counter()
+            PageGenerator.create_files(file_list, os.path.join(tmp, 'out{}'.format(jobs)), jobs)
+            timings[jobs] = time.perf_counter() - start
+
+    print('{} pages: serial {:.2f} s, 4 jobs {:.2f} s, speedup {:.1f}x'.format(
+        len(file_list), timings[1], timings[4], timings[1] / timings[4]))
+
+
+
+def template_render_throughput():
+    arguments = template_arguments(100000)
+
+    for name, kwargs in arguments.items():
+        template = PageGenerator.templates.get(name)
+
+        timings = []
+        for render in [lambda: render_by_splicing(template, **kwargs), lambda: template.render(**kwargs)]:
+            start = time.perf_counter()
+            for _ in range(200):
+                render()
+            timings.append(time.perf_counter() - start)
+
+        print('{} template: splicing {:.0f} renders/s, compiled {:.0f} renders/s'.format(
+            name, 200 / timings[0], 200 / timings[1]))
+
+
+def source_reading_throughput():
+    with tempfile.TemporaryDirectory() as tmp:
+        small_root = generate_synthetic_tree(os.path.join(tmp, 'small'), packages=10, files_per_package=50)
+        large_root = os.path.join(tmp, 'large')
+        os.makedirs(large_root)
+        for f in range(5):
+            with open(os.path.join(large_root, 'Large{}.java'.format(f)), 'w') as file:
+                file.write(JAVA_SOURCE * 2000)
+
+        def read_text_mode(file_path):
+            with open(file_path, 'r') as file:
+                return file.read()
+
+        for name, root in [('small', small_root), ('large', large_root)]:
+            file_paths = [os.path.join(directory, file) for directory, _, files in os.walk(root) for file in files]
+            size = sum(os.path.getsize(file_path) for file_path in file_paths)
+
+            timings = []
+            for read in [read_text_mode, SourceReader.read]:
+                start = time.perf_counter()
+                for file_path in file_paths:
+                    read(file_path)
+                timings.append(time.perf_counter() - start)
+
+            print('{} files ({} x {:.0f} KB): text mode {:.0f} MB/s, source reader {:.0f} MB/s'.format(
+                name, len(file_paths), size / len(file_paths) / 1024,
+                size / timings[0] / 2 ** 20, size / timings[1] / 2 ** 20))
+
+
+def doc_string_rendering_throughput():
+    documented_file = Parser.parse_structure(JAVA_SOURCE)
+    documented_file.file_path = 'org/example/core/Sample.java'
+    symbol_index = SymbolIndex([documented_file])
+
+    # inherited and boilerplate comments repeat, every tenth one is distinct
+    docs = ['/**\n * Returns the {{@code value}} of {{@link Base}} number {0}.\n *\n * @param x the x\n */'.format(
+        i % 10 if i % 10 else i) for i in range(5000)]
+
+    timings = []
+    for render in [render_doc_string_by_splicing, PageGenerator.render_doc_string]:
+        start = time.perf_counter()
+        for doc in docs:
+            render(doc, documented_file, symbol_index)
+        timings.append(time.perf_counter() - start)
+
+    print('{} doc strings: spliced {:.1f} ms, compiled {:.1f} ms'.format(len(docs), timings[0] * 1000,
+                                                                        timings[1] * 1000))
+
+
+def documented_class_rendering():
+    methods = ''.join('''
+    /**
+     * Returns the {{@code value}} number {0}. Uses {{@link Base}}.
+     *
+     * @param x the x
+     * @return the value
+     */
+    public int value{0}(int x) {{ return x; }}
+'''.format(i) for i in range(500))
+    documented_file = Parser.parse_structure('package org.example;\nclass Documented {' + methods + '}\n')
+    documented_file.file_path = 'org/example/Documented.java'
+    symbol_index = SymbolIndex([documented_file])
+
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        PageGenerator.render_file(documented_file, symbol_index)
+        timings.append(time.perf_counter() - start)
+
+    print('500 documented methods: first render {:.1f} ms, repeated render {:.1f} ms'.format(
+        timings[0] * 1000, timings[1] * 1000))
+
+
+def parser_time_per_token():
+    lexer_fmt = FiniteStateMachine(InitialState())
+    lexer_fmt.process_string(JAVA_SOURCE * 100)
+    partition = lexer_fmt.partition.exclude('WhitespaceState', 'InitialState')
+
+    timings = []
+    for _ in range(5):
+        parser_fmt = ParserFiniteStateMachine(ParserInitialState())
+        start = time.perf_counter()
+        parser_fmt.process_tokens(partition)
+        timings.append(time.perf_counter() - start)
+
+    print('{} tokens: {:.2f} us/token'.format(len(partition.sequence), min(timings) / len(partition.sequence) * 1e6))
+
+
+def state_allocations_per_kb():
+    for copies in [1, 10]:
+        source = JAVA_SOURCE * copies
+        kb = len(source) / 1024
+
+        start = time.perf_counter()
+        lexer_recorder, parser_recorder = record_states(source)
+        elapsed = time.perf_counter() - start
+
+        print('{:.1f} KB: {} lexer steps, {:.1f} lexer states/KB, {:.1f} parser states/KB, {:.1f} ms'.format(
+            kb, len(lexer_recorder.states), lexer_recorder.allocated / kb, parser_recorder.allocated / kb,
+            elapsed * 1000))
+
+
+def streaming_page_peak_memory():
+    page_size, streaming_peak, rendering_peak = measure_page_memory(3000)
+    print('{:.0f} KB page: streaming peak {:.0f} KB, in-memory peak {:.0f} KB'.format(
+        page_size / 1024, streaming_peak / 1024, rendering_peak / 1024))
+
+
+def data_model_memory():
+    slotted, dict_backed = measure_model_memory(200)
+    print('200 files: dict-backed {:.0f} KB, slotted and interned {:.0f} KB ({:.0f}% less)'.format(
+        dict_backed / 1024, slotted / 1024, 100 - slotted * 100 / dict_backed))
+
+
+def search_index_size():
+    file_list = generate_documented_files(1000)
+
+    start = time.perf_counter()
+    data = json.dumps(SearchIndex.build(file_list), separators=(',', ':'))
+    elapsed = time.perf_counter() - start
+
+    symbols = len(file_list) * 100
+    print('{} symbols: {:.0f} KB index, {:.1f} bytes/symbol, built in {:.0f} ms'.format(
+        symbols, len(data) / 1024, len(data) / symbols, elapsed * 1000))
+
+
+def sidebar_size():
+    for packages in [2, 20]:
+        with tempfile.TemporaryDirectory() as tmp:
+            page_size, manifest_size = measure_sidebar(tmp, packages)
+
+        print('{} files: sidebar page {} bytes, manifest {:.1f} KB'.format(packages * 25, page_size,
+                                                                          manifest_size / 1024))
+
+
+def split_page_size():
+    (_, page_size), (pages, split_page_size) = measure_split_pages(400, 100)
+    print('400 inner classes: one page of {:.0f} KB, split into {} pages of at most {:.0f} KB'.format(
+        page_size / 1024, pages, split_page_size / 1024))
+
+
+def streaming_parse_peak_memory():
+    staged_peak, streamed_peak = measure_parse_memory(200)
+    print('{:.0f} KB source: staged peak {:.0f} KB, streamed peak {:.0f} KB'.format(
+        len(JAVA_SOURCE) * 200 / 1024, staged_peak / 1024, streamed_peak / 1024))
+
+
+BENCHMARKS = [
+    parallel_page_rendering,
+    template_render_throughput,
+    source_reading_throughput,
+    doc_string_rendering_throughput,
+    documented_class_rendering,
+    parser_time_per_token,
+    state_allocations_per_kb,
+    streaming_page_peak_memory,
+    data_model_memory,
+    search_index_size,
+    sidebar_size,
+    split_page_size,
+    streaming_parse_peak_memory
+]
+
+
+def main():
+    names = [benchmark.__name__ for benchmark in BENCHMARKS]
+
+    arg_parser = argparse.ArgumentParser(description='Benchmarks of the documentation generator.')
+    arg_parser.add_argument('names', nargs='*', metavar='NAME', help='Benchmarks to run, all by default: '
+                                                                      + ', '.join(names) + '.')
+    args = arg_parser.parse_args()
+
+    unknown = [name for name in args.names if name not in names]
+    if unknown:
+        arg_parser.error('unknown benchmarks: ' + ', '.join(unknown))
+
+    for benchmark in BENCHMARKS:
+        if not args.names or benchmark.__name__ in args.names:
+            benchmark()
+
+
+if __name__ == '__main__':
+    main()
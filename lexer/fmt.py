@@ -1,5 +1,7 @@
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
 from lexer.states import InitialState, State, CharacterEvent
-from lexer.util import LexerPartition, Token
+from lexer.util import LexerPartition, Token, TokenKind
 
 
 class FiniteStateMachine:
@@ -10,20 +12,35 @@ class FiniteStateMachine:
         self._current_series = []
 
     def process_string(self, string: str, end=True):
-        for index, char in enumerate(string):
-            self.step(CharacterEvent(index, string))
+        self._partition.extend(self._entries(string, end))
+
+    def tokens(self, string: str, exclude: Iterable[Union[str, TokenKind]] = ()) -> Iterator[Token]:
+        """Lexes the string lazily, tokens of the excluded kinds are dropped as they are produced."""
+        return LexerPartition.generate_tokens(self._entries(string, True), exclude)
+
+    def _entries(self, string: str, end: bool) -> Iterator[Tuple[str, List[str]]]:
+        event = CharacterEvent(0, string)
+        for index in range(len(string)):
+            entry = self.step(event.move_to(index))
+            if entry is not None:
+                yield entry
         if end:
-            self.step(CharacterEvent(len(string), string))
+            entry = self.step(event.move_to(len(string)))
+            if entry is not None:
+                yield entry
 
-    def step(self, event: CharacterEvent):
+    def step(self, event: CharacterEvent) -> Optional[Tuple[str, List[str]]]:
+        """Returns the series finished by this event together with the type of its state."""
         _previous_state = self.state
         self.state = self.state.on_event(event)
 
+        entry = None
         if event.eof or _previous_state.separated or _previous_state.type != self.state.type:
-            self._partition.append((_previous_state.type, self._current_series))
+            entry = (_previous_state.type, self._current_series)
             self._current_series = []
 
         self._current_series.append(event.character_met)
+        return entry
 
     @property
     def partition(self) -> LexerPartition:
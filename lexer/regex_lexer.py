@@ -0,0 +1,109 @@
+import re
+from typing import Iterable, Iterator, List, Tuple, Union
+
+from lexer.states import InitialState
+from lexer.util import LexerPartition, Token, TokenKind
+
+
+class RegexLexer:
+    """Lexer backend equivalent to FiniteStateMachine(InitialState()) built on a single master regex.
+
+    Every alternative of the master regex mirrors one path through the lexer states, so the token
+    sequence (without whitespace and InitialState runs) is identical to the one produced by the FSM.
+    """
+
+    _patterns = {}
+
+    def __init__(self):
+        self._partition = []
+
+    def process_string(self, string: str, end=True):
+        self._partition.extend(self._entries(string))
+
+    def tokens(self, string: str, exclude: Iterable[Union[str, TokenKind]] = ()) -> Iterator[Token]:
+        """Lexes the string lazily, tokens of the excluded kinds are dropped as they are produced."""
+        return LexerPartition.generate_tokens(((state, value) for state, value, _ in self._entries(string)), exclude)
+
+    def _entries(self, string: str) -> Iterator[Tuple[str, List[str], bool]]:
+        delimiters = InitialState.delimiters
+        keywords = dict(InitialState.keywords)
+
+        # only the last entry can still grow, everything before it is final
+        entries = []
+        for match in self._compile(keywords).finditer(string):
+            kind = match.lastgroup
+
+            if kind == 'javadoc':
+                self._append(entries, 'JavadocState', match.group())
+            elif kind == 'multiline_comment':
+                self._append(entries, 'MultilineCommentState', match.group())
+            elif kind == 'comment':
+                self._append(entries, 'CommentState', match.group('comment_text'))
+                self._append(entries, 'InitialState', match.group('comment_end'))
+            elif kind == 'delimiter':
+                as_state, separated = delimiters[match.group()]
+                self._append(entries, as_state, match.group(), separated)
+            elif kind == 'keyword':
+                self._append(entries, keywords[match.group()], match.group())
+            elif kind == 'annotation':
+                self._append(entries, 'AnnotationState', match.group('annotation_value'))
+                self._append(entries, 'InitialState', match.group('annotation_end'))
+            elif kind == 'method_generic':
+                self._append(entries, 'ModifierState', match.group())
+            elif kind == 'name':
+                self._append(entries, 'NameState', match.group('name_value'))
+                self._append(entries, 'ArgumentsParenthesisState', match.group('arguments'))
+            elif kind == 'whitespace':
+                self._append(entries, 'WhitespaceState', match.group())
+            else:
+                self._append(entries, 'InitialState', match.group())
+
+            if len(entries) > 1:
+                yield from entries[:-1]
+                del entries[:-1]
+
+        yield from entries
+
+    @staticmethod
+    def _append(entries: list, state: str, value, separated=False):
+        if not value:
+            return
+
+        if not separated and entries and entries[-1][0] == state and not entries[-1][2]:
+            entries[-1][1].append(value)
+        else:
+            entries.append((state, [value], separated))
+
+    @staticmethod
+    def _compile(keywords) -> 're.Pattern':
+        key = tuple(sorted(keywords))
+        pattern = RegexLexer._patterns.get(key)
+
+        if pattern is None:
+            keyword_alternatives = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+            delimiter_class = ''.join(re.escape(char) for char in InitialState.delimiters)
+
+            pattern = RegexLexer._patterns[key] = re.compile(r'''
+                (?P<javadoc>/\*\*[\s\S]*?(?:\*/|\Z))
+              | (?P<multiline_comment>/\*[\s\S]*?(?:\*/|\Z))
+              | (?P<comment>(?P<comment_text>//[^\n]*)(?P<comment_end>\n?))
+              | (?P<delimiter>[''' + delimiter_class + r'''])
+              | (?P<keyword>(?:''' + keyword_alternatives + r''')(?![^\W\d]))
+              | (?P<annotation>
+                    (?P<annotation_value>@(?:[^\W\d_]|\.)*(?P<annotation_arguments>\([^)]*\)?)?)
+                    (?(annotation_arguments)|(?P<annotation_end>[\s\S]?))
+                )
+              | (?P<method_generic><(?:[\s\S](?=>)|[<\s\w?])*>?)
+              | (?P<name>
+                    (?P<name_value>[^\W\d][\w.\[\]]*(?P<name_generic><(?:[\s\S](?=>)|[<\s\w?,])*>?)?)
+                    (?(name_generic)|(?P<arguments>\([\w<>,\[\]?.@\s]*\)?)?)
+                )
+              | (?P<whitespace>\s+)
+              | (?P<other>[\s\S])
+            ''', re.VERBOSE)
+
+        return pattern
+
+    @property
+    def partition(self) -> LexerPartition:
+        return LexerPartition((state, value) for state, value, _ in self._partition)
@@ -1,13 +1,74 @@
-from abc import ABC, abstractmethod
+import inspect
+from abc import ABCMeta, abstractmethod
 
-from lexer.util import CharacterEvent
+from lexer.util import CharacterEvent, KeywordTable
 
 
-class State(ABC):
+class StateMeta(ABCMeta):
+    """Creates every distinct (class, arguments) state once, states are immutable and shared.
+
+    Keyword and default arguments are bound to the parameters of `__init__`, so equal states share one key.
+    """
+
+    _flyweights = {}
+
+    def __init__(cls, name, bases, namespace, **kwargs):
+        super().__init__(name, bases, namespace, **kwargs)
+
+        cls._parameters = ()
+        if cls.__init__ is not object.__init__:
+            cls._parameters = tuple(inspect.signature(cls.__init__).parameters.values())[1:]
+            if any(parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD, parameter.KEYWORD_ONLY)
+                   for parameter in cls._parameters):
+                raise TypeError(name + '.__init__ can only take positional arguments, they form the flyweight key')
+
+    def __call__(cls, *args, **kwargs):
+        # calls are looked up as written first, binding arguments only happens for a call seen the first time
+        key = (cls, StateMeta, args, tuple(kwargs.items())) if kwargs else (cls,) + args
+        instance = StateMeta._flyweights.get(key)
+        if instance is None:
+            instance = StateMeta._flyweights[key] = cls._create(cls._bind(args, kwargs))
+        return instance
+
+    def _create(cls, args: tuple):
+        key = (cls,) + args
+        instance = StateMeta._flyweights.get(key)
+        if instance is None:
+            instance = StateMeta._flyweights[key] = super().__call__(*args)
+        return instance
+
+    def _bind(cls, args: tuple, kwargs: dict) -> tuple:
+        if len(args) > len(cls._parameters):
+            raise TypeError('{}() takes {} arguments, {} given'.format(cls.__name__, len(cls._parameters), len(args)))
+
+        bound = list(args)
+        for parameter in cls._parameters[len(args):]:
+            if parameter.name in kwargs:
+                bound.append(kwargs.pop(parameter.name))
+            elif parameter.default is not parameter.empty:
+                bound.append(parameter.default)
+            else:
+                raise TypeError('{}() missing argument {}'.format(cls.__name__, parameter.name))
+
+        if kwargs:
+            raise TypeError('{}() got unexpected arguments {}'.format(cls.__name__, ', '.join(kwargs)))
+        return tuple(bound)
+
+
+class State(metaclass=StateMeta):
     __slots__ = ()
 
     separated = False
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # the default type is read on every step, store it as a plain class attribute
+        overridden = any('type' in base.__dict__ and isinstance(base.__dict__['type'], property)
+                         for base in cls.__mro__[:cls.__mro__.index(State)])
+        if not overridden:
+            cls.type = cls.__name__
+
     @abstractmethod
     def on_event(self, event) -> 'State':
         pass
@@ -30,10 +91,42 @@ class WhitespaceState(State):
 
 
 class InitialState(State):
+    delimiters = {
+        '=': ('DelimiterState', False),
+        ',': ('DelimiterState', False),
+        ';': ('DelimiterState', False),
+        '{': ('OpenBracketState', True),
+        '}': ('ClosedBracketState', True),
+        '(': ('OpenParenthesisState', False),
+        ')': ('ClosedParenthesisState', False),
+    }
+
+    keywords = KeywordTable({
+        '@interface': 'IdentifierState',
+        'class': 'IdentifierState',
+        'interface': 'IdentifierState',
+        'enum': 'IdentifierState',
+        'new': 'IdentifierState',
+        'extends': 'IdentifierState',
+        'implements': 'IdentifierState',
+        'import': 'IdentifierState',
+        'package': 'IdentifierState',
+        'default': 'ModifierState',
+        'throws': 'ModifierState',
+        'static': 'ModifierState',
+        'abstract': 'ModifierState',
+        'final': 'ModifierState',
+        'synchronized': 'ModifierState',
+        'protected': 'AccessModifierState',
+        'private': 'AccessModifierState',
+        'public': 'AccessModifierState',
+    })
 
     def on_event(self, event: CharacterEvent) -> State:
         # todo string literals
-        if event.character_met == '/':
+        character = event.character_met
+
+        if character == '/':
             lookahead = event.lookahead(2)
 
             if lookahead[0] == '*':
@@ -44,74 +137,25 @@ class InitialState(State):
             elif lookahead[0] == '/':
                 return SkipState(CommentState())
 
-        elif event.character_met == '=':
-            return SkipState(InitialState(), activate=True, as_state='DelimiterState')
-        elif event.character_met == ',':
-            return SkipState(InitialState(), activate=True, as_state='DelimiterState')
-        elif event.character_met == ';':
-            return SkipState(InitialState(), activate=True, as_state='DelimiterState')
-
-        elif event.character_met == '{':
-            return SkipState(InitialState(), activate=True, as_state='OpenBracketState', separated=True)
-        elif event.character_met == '}':
-            return SkipState(InitialState(), activate=True, as_state='ClosedBracketState', separated=True)
-
-        elif event.character_met == '(':
-            return SkipState(InitialState(), activate=True, as_state='OpenParenthesisState')
-        elif event.character_met == ')':
-            return SkipState(InitialState(), activate=True, as_state='ClosedParenthesisState')
-
-        elif event.is_start_of('@interface'):
-            return SkipState(InitialState(), activate=True, skip_count=10, as_state='IdentifierState')
-        elif event.character_met == '@':
-            return AnnotationState()
+            return self
 
-        elif event.is_start_of('class'):
-            return SkipState(InitialState(), activate=True, skip_count=5, as_state='IdentifierState')
-        elif event.is_start_of('interface'):
-            return SkipState(InitialState(), activate=True, skip_count=9, as_state='IdentifierState')
-        elif event.is_start_of('enum'):
-            return SkipState(InitialState(), activate=True, skip_count=4, as_state='IdentifierState')
-        elif event.is_start_of('new'):
-            return SkipState(InitialState(), activate=True, skip_count=3, as_state='IdentifierState')
-        elif event.is_start_of('default'):
-            return SkipState(InitialState(), activate=True, skip_count=7, as_state='ModifierState')
-        elif event.is_start_of('throws'):
-            return SkipState(InitialState(), activate=True, skip_count=6, as_state='ModifierState')
-
-        elif event.is_start_of('static'):
-            return SkipState(InitialState(), activate=True, skip_count=6, as_state='ModifierState')
-        elif event.is_start_of('abstract'):
-            return SkipState(InitialState(), activate=True, skip_count=8, as_state='ModifierState')
-        elif event.is_start_of('default'):
-            return SkipState(InitialState(), activate=True, skip_count=7, as_state='ModifierState')
-        elif event.is_start_of('final'):
-            return SkipState(InitialState(), activate=True, skip_count=5, as_state='ModifierState')
-        elif event.is_start_of('synchronized'):
-            return SkipState(InitialState(), activate=True, skip_count=12, as_state='ModifierState')
+        delimiter = self.delimiters.get(character)
+        if delimiter is not None:
+            as_state, separated = delimiter
+            return SkipState(InitialState(), activate=True, as_state=as_state, separated=separated)
 
-        elif event.character_met == '<':
-            return MethodGenericState()
+        keyword = self.keywords.match(event)
+        if keyword is not None:
+            keyword, as_state = keyword
+            return SkipState(InitialState(), activate=True, skip_count=len(keyword), as_state=as_state)
 
-        elif event.is_start_of('extends'):
-            return SkipState(InitialState(), activate=True, skip_count=7, as_state='IdentifierState')
-        elif event.is_start_of('implements'):
-            return SkipState(InitialState(), activate=True, skip_count=10, as_state='IdentifierState')
-        elif event.is_start_of('import'):
-            return SkipState(InitialState(), activate=True, skip_count=6, as_state='IdentifierState')
-        elif event.is_start_of('package'):
-            return SkipState(InitialState(), activate=True, skip_count=7, as_state='IdentifierState')
-
-        elif event.is_start_of('protected'):
-            return SkipState(InitialState(), activate=True, skip_count=9, as_state='AccessModifierState')
-        elif event.is_start_of('private'):
-            return SkipState(InitialState(), activate=True, skip_count=7, as_state='AccessModifierState')
-        elif event.is_start_of('public'):
-            return SkipState(InitialState(), activate=True, skip_count=6, as_state='AccessModifierState')
-
-        elif event.character_met.isidentifier():
+        if character == '@':
+            return AnnotationState()
+        elif character == '<':
+            return MethodGenericState()
+        elif character.isidentifier():
             return NameState()
-        elif event.character_met.isspace():
+        elif character.isspace():
             return WhitespaceState()
 
         return self
@@ -254,18 +298,20 @@ class AnnotationBracketsState(State):
 
 
 class SkipState(State):
+    __slots__ = ('count', 'next_state', '_activate_next_state', '_as_state', '_type', 'separated')
 
     def __init__(self, next_state: State, activate=False, skip_count=1, as_state=None, separated=False):
         self.count = skip_count
         self.next_state = next_state
         self._activate_next_state = activate
+        self._as_state = as_state
         self._type = next_state.type if not as_state else as_state
         self.separated = separated
 
     def on_event(self, event) -> State:
         if self.count > 1:
-            self.count -= 1
-            return self
+            return SkipState(self.next_state, self._activate_next_state, self.count - 1, self._as_state,
+                             self.separated)
 
         if self._activate_next_state:
             return self.next_state.on_event(event)
@@ -1,38 +1,113 @@
-import itertools
-from typing import Optional
+from enum import IntEnum
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple, Union
 
 from util.util import Representable
 
 
 class CharacterEvent:
+    __slots__ = ('_contents', 'index', 'eof', 'character_met')
 
     def __init__(self, character_index: int, file_contents: str):
-        self.eof = character_index >= len(file_contents)
-        self.character_met = '' if self.eof else file_contents[character_index]
-        self._lookahead = file_contents[character_index + 1:]
+        self._contents = file_contents
+        self.move_to(character_index)
 
     def __repr__(self) -> str:
         return 'CharacterEvent[{0}]'.format(repr(self.character_met))
 
+    def move_to(self, character_index: int) -> 'CharacterEvent':
+        self.index = character_index
+        self.eof = character_index >= len(self._contents)
+        self.character_met = '' if self.eof else self._contents[character_index]
+        return self
+
     def lookahead(self, n) -> str:
-        n_lookahead = list(itertools.islice(self._lookahead, n))
-        n_lookahead.extend([' '] * (n - len(n_lookahead)))
-        return ''.join(n_lookahead)
+        start = self.index + 1
+        n_lookahead = self._contents[start:start + n]
+        return n_lookahead + ' ' * (n - len(n_lookahead))
 
     def is_start_of(self, string: str) -> bool:
-        return string == self.character_met + self._lookahead[:len(string) - 1] \
-               and (len(self._lookahead) < len(string) or not self._lookahead[len(string) - 1].isidentifier())
+        end = self.index + len(string)
+        return not self.eof and self._contents.startswith(string, self.index) \
+               and (end >= len(self._contents) or not self._contents[end].isidentifier())
+
+
+class KeywordTable:
+
+    def __init__(self, keywords: Dict[str, str] = None):
+        self._index = {}  # type: Dict[str, List[Tuple[str, str]]]
+
+        for keyword, state in (keywords or {}).items():
+            self.add(keyword, state)
+
+    def add(self, keyword: str, state: str):
+        candidates = [item for item in self._index.get(keyword[0], []) if item[0] != keyword]
+        candidates.append((keyword, state))
+        candidates.sort(key=lambda item: len(item[0]), reverse=True)
+        self._index[keyword[0]] = candidates
+
+    def __iter__(self):
+        for candidates in self._index.values():
+            yield from candidates
+
+    def match(self, event: CharacterEvent) -> Optional[Tuple[str, str]]:
+        for keyword, state in self._index.get(event.character_met, ()):
+            if event.is_start_of(keyword):
+                return keyword, state
+        return None
+
+
+class TokenKind(IntEnum):
+    """Kind of a lexer token, the lexer state name it comes from is kept for debugging and repr."""
+
+    INITIAL = 0
+    WHITESPACE = 1
+    COMMENT = 2
+    MULTILINE_COMMENT = 3
+    JAVADOC = 4
+    ANNOTATION = 5
+    ACCESS_MODIFIER = 6
+    MODIFIER = 7
+    IDENTIFIER = 8
+    NAME = 9
+    ARGUMENTS_PARENTHESIS = 10
+    DELIMITER = 11
+    OPEN_BRACKET = 12
+    CLOSED_BRACKET = 13
+    OPEN_PARENTHESIS = 14
+    CLOSED_PARENTHESIS = 15
+
+    @property
+    def state_name(self) -> str:
+        return _STATE_NAMES[self]
+
+    @staticmethod
+    def of(state: Union[str, 'TokenKind']) -> 'TokenKind':
+        if isinstance(state, TokenKind):
+            return state
+        return _KINDS[state]
+
+
+_STATE_NAMES = [''.join(part.capitalize() for part in kind.name.split('_')) + 'State' for kind in TokenKind]
+_KINDS = {state_name: kind for kind, state_name in zip(TokenKind, _STATE_NAMES)}
 
 
 class Token(Representable):
+    __slots__ = ('value', 'kind')
 
-    def __init__(self, state, value):
+    def __init__(self, state: Union[str, TokenKind], value):
         self.value = value
-        self.state = state
+        self.kind = TokenKind.of(state)
+
+    @property
+    def state(self) -> str:
+        return _STATE_NAMES[self.kind]
+
+    def _attributes(self) -> dict:
+        return {'value': self.value, 'state': self.state}
 
     def __eq__(self, other: object) -> bool:
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self.value == other.value and self.kind == other.kind
         return False
 
 
@@ -46,11 +121,23 @@ class LexerPartition(Representable):
 
     @staticmethod
     def _generate_string_partition(partition_list):
-        return tuple(Token(state_type, ''.join(string_value)) for state_type, string_value in partition_list)
+        return tuple(LexerPartition.generate_tokens(partition_list))
+
+    @staticmethod
+    def generate_tokens(partition_list: Iterable[Tuple[str, List[str]]],
+                        exclude: Iterable[Union[str, TokenKind]] = ()) -> Iterator[Token]:
+        kinds = frozenset(TokenKind.of(arg) for arg in exclude)
+
+        for state_type, string_value in partition_list:
+            kind = _KINDS[state_type]
+            if kind not in kinds:
+                yield Token(kind, ''.join(string_value))
+
+    def exclude(self, *args: Union[str, TokenKind]) -> 'LexerPartition':
+        kinds = frozenset(TokenKind.of(arg) for arg in args)
 
-    def exclude(self, *args: str) -> 'LexerPartition':
         partition = LexerPartition()
-        partition.sequence = tuple(item for item in self.sequence if all(arg != item.state for arg in args))
+        partition.sequence = tuple(item for item in self.sequence if item.kind not in kinds)
         return partition
 
     def state_at(self, index) -> Optional[str]:
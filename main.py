@@ -1,6 +1,9 @@
 import argparse
 
+from page.assets import AssetSync
 from parser.parser import Parser
+from parser.watcher import Watcher
+from util.source_reader import DEFAULT_FALLBACK_ENCODING
 
 parser = argparse.ArgumentParser(description='Documentation generator for Java.')
 
@@ -10,8 +13,32 @@ parser.add_argument('output_directory', type=str, help='Documentation destinatio
 parser.add_argument('--shallow', dest='shallow', help='Scan only files in passed directory.', action='store_true')
 parser.add_argument('--name', type=str, dest='project_name', help='Project name, showed on index page.')
 parser.add_argument('--version', type=str, dest='project_version', help='Project version, showed on index page.')
+parser.add_argument('--lexer', type=str, dest='lexer', choices=sorted(Parser.LEXERS), default='fsm',
+                    help='Lexer backend used to tokenize sources.')
+parser.add_argument('--jobs', type=int, dest='jobs', default=1,
+                    help='Number of processes used to parse sources and render pages.')
+parser.add_argument('--no-cache', dest='use_cache', action='store_false',
+                    help='Ignore the build cache in the output directory and regenerate everything.')
+parser.add_argument('--fallback-encoding', type=str, dest='fallback_encoding', default=DEFAULT_FALLBACK_ENCODING,
+                    help='Encoding used for sources that are not valid UTF-8.')
+parser.add_argument('--assets', type=str, dest='asset_mode', choices=AssetSync.MODES, default='copy',
+                    help='How static assets are placed in the output directory.')
+parser.add_argument('--minified-assets', dest='minified_assets', action='store_true',
+                    help='Ship only the minified Bootstrap stylesheet, without source maps.')
+parser.add_argument('--split-classes', type=int, dest='split_members', metavar='MEMBERS',
+                    help='Write package summary pages and move classes to pages of their own until a page lists '
+                         'fewer than MEMBERS members.')
+parser.add_argument('--watch', dest='watch', action='store_true',
+                    help='Keep running and regenerate documentation when sources change.')
 parser.add_argument('-v', dest='verbose', help='Verbose output', action='store_true')
 
 args = parser.parse_args()
 
-Parser.parse(args.input, args.output_directory, args.project_name, args.project_version, args.verbose, args.shallow)
+if args.watch:
+    Watcher(args.input, args.output_directory, args.project_name, args.project_version, args.verbose, args.shallow,
+            args.lexer, fallback_encoding=args.fallback_encoding, asset_mode=args.asset_mode,
+            minified_assets=args.minified_assets, split_members=args.split_members).run()
+else:
+    Parser.parse(args.input, args.output_directory, args.project_name, args.project_version, args.verbose,
+                 args.shallow, args.lexer, args.jobs, args.use_cache, args.fallback_encoding, args.asset_mode,
+                 args.minified_assets, args.split_members)
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import shutil
+from typing import Dict, Tuple
+
+
+class AssetSync:
+    """Brings static assets of the output directory up to date, leaving files that are already identical alone."""
+
+    MODES = ['copy', 'hardlink', 'symlink']
+
+    @staticmethod
+    def list_assets(source_dir: str) -> Dict[str, str]:
+        """Maps output paths of the assets to their source paths."""
+        assets = {}
+        for root, _, files in os.walk(source_dir):
+            for file in files:
+                rel_path = os.path.relpath(os.path.join(root, file), source_dir)
+                assets[rel_path] = rel_path
+        return assets
+
+    @staticmethod
+    def list_minified_assets(source_dir: str) -> Dict[str, str]:
+        """Lists assets without source maps, minified stylesheets are installed under the name of the full ones."""
+        sources = AssetSync.list_assets(source_dir)
+
+        assets = {}
+        for rel_path in sources:
+            if rel_path.endswith('.map') or rel_path.endswith('.min.css'):
+                continue
+
+            # pages always link the full name, e.g. static/css/bootstrap.css
+            minified = os.path.splitext(rel_path)[0] + '.min.css'
+            assets[rel_path] = minified if rel_path.endswith('.css') and minified in sources else rel_path
+        return assets
+
+    @staticmethod
+    def sync(source_dir: str, target_dir: str, mode: str = 'copy', minified: bool = False) -> Tuple[int, int]:
+        """Returns the number of updated and unchanged assets."""
+        if mode not in AssetSync.MODES:
+            raise ValueError('Invalid asset mode: ' + mode)
+
+        assets = AssetSync.list_minified_assets(source_dir) if minified else AssetSync.list_assets(source_dir)
+        AssetSync._remove_unlisted(target_dir, assets)
+
+        updated = 0
+        for target_rel_path, source_rel_path in sorted(assets.items()):
+            source = os.path.abspath(os.path.join(source_dir, source_rel_path))
+            target = os.path.join(target_dir, target_rel_path)
+
+            if AssetSync._up_to_date(source, target, mode):
+                continue
+
+            AssetSync._install(source, target, mode)
+            updated += 1
+
+        return updated, len(assets) - updated
+
+    @staticmethod
+    def _up_to_date(source: str, target: str, mode: str) -> bool:
+        if mode == 'symlink':
+            return os.path.islink(target) and os.readlink(target) == source
+
+        if not os.path.isfile(target) or os.path.islink(target):
+            return False
+
+        source_stat = os.stat(source)
+        target_stat = os.stat(target)
+
+        if os.path.samestat(source_stat, target_stat):
+            # a copy that is still a link to the source has to be replaced
+            return mode == 'hardlink'
+
+        # a copy, also when links could not be created on an earlier run and _install fell back to copying
+
+        if source_stat.st_size != target_stat.st_size:
+            return False
+        if source_stat.st_mtime_ns == target_stat.st_mtime_ns:
+            return True
+
+        if AssetSync._hash(source) != AssetSync._hash(target):
+            return False
+
+        # identical contents, take over the mtime so the next run stops at the stat comparison
+        os.utime(target, ns=(target_stat.st_atime_ns, source_stat.st_mtime_ns))
+        return True
+
+    @staticmethod
+    def _remove_unlisted(target_dir: str, assets: Dict[str, str]):
+        # left over from an earlier sync with other options, e.g. source maps before switching to minified assets
+        for root, _, files in os.walk(target_dir):
+            for file in files:
+                file_path = os.path.join(root, file)
+                if os.path.relpath(file_path, target_dir) not in assets:
+                    os.remove(file_path)
+
+    @staticmethod
+    def _install(source: str, target: str, mode: str):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        # never write through an old link into the source file
+        if os.path.lexists(target):
+            os.remove(target)
+
+        try:
+            if mode == 'hardlink':
+                os.link(source, target)
+                return
+            if mode == 'symlink':
+                os.symlink(source, target)
+                return
+        except OSError:
+            # links across file systems or without the privilege to create them, fall back to a copy
+            pass
+
+        shutil.copy2(source, target)
+
+    @staticmethod
+    def _hash(file_path: str) -> str:
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -1,72 +1,239 @@
 import collections
+import hashlib
+import itertools
+import json
 import os
-import re
 import time
-from distutils import dir_util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pydoc import html
-from typing import Optional, List
+from typing import Optional, List, Iterator, Set, Tuple
+from urllib import parse
 
+from page.assets import AssetSync
+from page.javadoc import DocTemplate
+from page.layout import PageLayout
+from page.search import SearchIndex
 from page.template import FileTemplate, TemplateRegistry
+from page.writer import PageWriter
 from util.util import DocumentedFile, FileTreeNode, DocumentedClass, DocumentedInterface, \
-    DocumentedEnum
+    DocumentedEnum, SymbolIndex, Javadoc
 
 cwd = os.path.dirname(os.path.realpath(__file__))
 
 
 class PageGenerator:
-    templates = TemplateRegistry()
+    PACKAGE_STRUCTURE_PAGE = 'package_structure.html'
+    PACKAGE_MANIFEST = 'package_manifest.js'
+    PACKAGE_MANIFEST_CALLBACK = 'packageStructureLoaded'
 
-    docstring_code_regex = re.compile(r'{(?:@code) (.*?)}')
-    docstring_link_regex = re.compile(r'{(?:@link) ([\w.]+)}')
-    docstring_directive_regex = re.compile(r'(@[a-z]+)')
+    templates = TemplateRegistry(strict=True)
+    _worker_inputs = None
 
     @staticmethod
-    def copy_resources(dir: str):
-        dir_util.copy_tree(os.path.join(cwd, '../templates/static'), os.path.join(dir, 'static'))
+    def copy_resources(dir: str, mode: str = 'copy', minified: bool = False, verbose: bool = False):
+        updated, unchanged = AssetSync.sync(os.path.join(cwd, '../templates/static'), os.path.join(dir, 'static'),
+                                            mode, minified)
+        if verbose:
+            print('assets:', updated, 'updated,', unchanged, 'unchanged')
 
     @staticmethod
-    def create_file(tree: FileTreeNode, documented_file: DocumentedFile, file_list: List[DocumentedFile], dir: str):
-        html_file_path = os.path.join(dir, documented_file.file_path + '.html')
+    def create_file(documented_file: DocumentedFile, symbol_index: SymbolIndex, dir: str, layout: PageLayout = None):
+        for page_path, chunks in PageGenerator.stream_pages(documented_file, symbol_index, layout):
+            PageWriter.write(os.path.join(dir, page_path), chunks)
 
-        os.makedirs(os.path.dirname(html_file_path), exist_ok=True)
+    @staticmethod
+    def create_files(file_list: List[DocumentedFile], dir: str, jobs: int = 1, pages: List[DocumentedFile] = None,
+                     layout: PageLayout = None):
+        if pages is None:
+            pages = file_list
+        if layout is None:
+            layout = PageLayout()
+
+        if jobs <= 1:
+            symbol_index = SymbolIndex(file_list, layout)
+            for documented_file in pages:
+                PageGenerator.create_file(documented_file, symbol_index, dir, layout)
+        else:
+            indexes = {id(documented_file): i for i, documented_file in enumerate(file_list)}
 
-        with open(html_file_path, 'w') as file:
-            rendered_classes_list = []
-            for c in documented_file.classes:
-                rendered_classes_list.append(PageGenerator._render_class_like_object(c, documented_file, file_list))
-
-            rendered_package_structure = PageGenerator._render_tree(tree, documented_file,
-                                                                    PageGenerator.templates.get('list_package'),
-                                                                    PageGenerator.templates.get('list_item'))
-
-            file.write(
-                PageGenerator.templates.get('root').render(
-                    rel_path_bootstrap=os.path.relpath('static/css/bootstrap.css',
-                                                       os.path.dirname(documented_file.file_path)),
-                    rel_path_stylesheet=os.path.relpath('static/css/styles.css',
-                                                        os.path.dirname(documented_file.file_path)),
-                    package_structure=rendered_package_structure,
-                    file_path=documented_file.file_path,
-                    file_doc=PageGenerator.render_doc_string(documented_file.file_doc, documented_file, file_list),
-                    package_name=documented_file.package or '',
-                    index_page_path=os.path.relpath('index.html',
-                                                    os.path.dirname(documented_file.file_path)),
-                    classes=''.join(rendered_classes_list)))
-
-    @staticmethod
-    def _render_class_like_object(obj, documented_file: DocumentedFile, file_list: List[DocumentedFile]) -> str:
+            # the file list is sent to every worker once, the symbol index is built there
+            with ProcessPoolExecutor(jobs, initializer=PageGenerator._init_render_worker,
+                                     initargs=(file_list, layout)) as renderers, \
+                    ThreadPoolExecutor(jobs) as writers:
+                rendered_files = renderers.map(PageGenerator._render_worker_file,
+                                               [indexes[id(documented_file)] for documented_file in pages],
+                                               chunksize=max(1, len(pages) // (jobs * 4)))
+
+                writes = [writers.submit(PageWriter.write, os.path.join(dir, page_path), [contents])
+                          for rendered_pages in rendered_files for page_path, contents in rendered_pages]
+
+                for write in writes:
+                    write.result()
+
+        PageGenerator._remove_stale_class_pages(pages, dir, layout)
+
+    @staticmethod
+    def _init_render_worker(file_list: List[DocumentedFile], layout: PageLayout):
+        PageGenerator._worker_inputs = file_list, SymbolIndex(file_list, layout), layout
+
+    @staticmethod
+    def _render_worker_file(index: int) -> List[Tuple[str, str]]:
+        file_list, symbol_index, layout = PageGenerator._worker_inputs
+        return PageGenerator.render_pages(file_list[index], symbol_index, layout)
+
+    @staticmethod
+    def _remove_stale_class_pages(documented_files: List[DocumentedFile], dir: str, layout: PageLayout):
+        # pages of classes that were removed or fit on the page of their file again
+        directories = collections.defaultdict(lambda: (set(), set()))
+        for documented_file in documented_files:
+            directory, file_name = os.path.split(documented_file.file_path)
+            file_names, current = directories[directory]
+            file_names.add(file_name)
+            current.update(os.path.basename(layout.class_page(documented_file.file_path, anchor))
+                           for anchor in layout.split_classes(documented_file))
+
+        for directory, (file_names, current) in directories.items():
+            for page in PageLayout.class_pages(os.path.join(dir, directory), file_names):
+                if page not in current:
+                    os.remove(os.path.join(dir, directory, page))
+
+    @staticmethod
+    def create_package_structure(tree: FileTreeNode, dir: str):
+        # the sidebar page is the same for every project, the tree is rendered in the browser from the manifest
+        PageWriter.write(os.path.join(dir, PageGenerator.PACKAGE_STRUCTURE_PAGE),
+                         PageGenerator.templates.get('package_structure').stream(
+                             manifest_path=PageGenerator.PACKAGE_MANIFEST))
+
+        data = json.dumps(PageGenerator.package_manifest(tree), separators=(',', ':'), ensure_ascii=False)
+        PageWriter.write(os.path.join(dir, PageGenerator.PACKAGE_MANIFEST),
+                         [PageGenerator.PACKAGE_MANIFEST_CALLBACK, '(', data, ');\n'])
+
+    @staticmethod
+    def package_manifest(tree: FileTreeNode) -> list:
+        """Returns the package as [name, file paths, packages], in the order of the rendered package structure."""
+        return [tree.directory, [file.file_path for file in tree.files],
+                [PageGenerator.package_manifest(child) for child in tree.children]]
+
+    @staticmethod
+    def remove_file(file_path: str, dir: str):
+        directory, file_name = os.path.split(os.path.join(dir, file_path))
+        for page in [file_name + '.html'] + PageLayout.class_pages(directory, {file_name}):
+            try:
+                os.remove(os.path.join(directory, page))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def render_file(documented_file: DocumentedFile, symbol_index: SymbolIndex) -> str:
+        return ''.join(PageGenerator.stream_file(documented_file, symbol_index))
+
+    @staticmethod
+    def render_pages(documented_file: DocumentedFile, symbol_index: SymbolIndex,
+                     layout: PageLayout = None) -> List[Tuple[str, str]]:
+        return [(page_path, ''.join(chunks))
+                for page_path, chunks in PageGenerator.stream_pages(documented_file, symbol_index, layout)]
+
+    @staticmethod
+    def stream_file(documented_file: DocumentedFile, symbol_index: SymbolIndex,
+                    layout: PageLayout = None) -> Iterator[str]:
+        """Yields the page in chunks, no chunk is larger than a single rendered method or property."""
+        return next(PageGenerator.stream_pages(documented_file, symbol_index, layout))[1]
+
+    @staticmethod
+    def stream_pages(documented_file: DocumentedFile, symbol_index: SymbolIndex,
+                     layout: PageLayout = None) -> Iterator[Tuple[str, Iterator[str]]]:
+        """Yields the path and the chunks of every page of the file, the page of the file itself comes first."""
+        if layout is None:
+            layout = PageLayout()
+        split = layout.split_classes(documented_file)
+
+        rendered_classes = itertools.chain.from_iterable(
+            PageGenerator._render_class_like_object(c, documented_file, symbol_index, None, split)
+            for c in documented_file.classes)
+
+        yield PageLayout.file_page(documented_file.file_path), PageGenerator._stream_page(
+            documented_file.file_path, documented_file.package, layout,
+            PageGenerator.render_doc_string(documented_file.file_doc, documented_file, symbol_index),
+            rendered_classes)
+
+        for anchor, c in PageGenerator._declared_classes(documented_file):
+            if anchor in split:
+                yield layout.class_page(documented_file.file_path, anchor), PageGenerator._stream_page(
+                    documented_file.file_path, documented_file.package, layout, '',
+                    PageGenerator._render_declaration(c, documented_file, symbol_index, anchor, split))
+
+    @staticmethod
+    def _stream_page(file_path: str, package_name: Optional[str], layout: PageLayout, file_doc: str,
+                     classes: Iterator[str]) -> Iterator[str]:
+        directory = os.path.dirname(file_path)
+
+        package_name = package_name or ''
+        if layout.split:
+            package_name = '<a href="{0}">{1}</a>'.format(PageLayout.PACKAGE_SUMMARY_PAGE, package_name)
+
+        return PageGenerator.templates.get('root').stream(
+            rel_path_bootstrap=os.path.relpath('static/css/bootstrap.css', directory),
+            rel_path_stylesheet=os.path.relpath('static/css/styles.css', directory),
+            rel_path_search_script=os.path.relpath('static/js/search.js', directory),
+            package_structure_path=os.path.relpath(PageGenerator.PACKAGE_STRUCTURE_PAGE, directory),
+            root_path=os.path.relpath(os.curdir, directory),
+            file_path_hash=parse.quote(file_path),
+            file_path=file_path,
+            file_doc=file_doc,
+            package_name=package_name,
+            index_page_path=os.path.relpath('index.html', directory),
+            classes=classes)
+
+    @staticmethod
+    def _declared_classes(documented_file: DocumentedFile) -> Iterator[Tuple[str, object]]:
+        stack = [(None, c) for c in reversed(documented_file.classes)]
+        while stack:
+            parent_anchor, c = stack.pop()
+            anchor = SearchIndex.class_anchor(parent_anchor, c.name)
+            yield anchor, c
+            stack.extend((anchor, ic) for ic in reversed(c.inner_classes))
+
+    @staticmethod
+    def _render_class_like_object(obj, documented_file: DocumentedFile, symbol_index: SymbolIndex,
+                                  parent_anchor: str = None, split: Set[str] = frozenset()) -> Iterator[str]:
+        anchor = SearchIndex.class_anchor(parent_anchor, obj.name)
+
+        if anchor in split:
+            # the class has a page of its own, only a link to it stays here
+            return iter([PageGenerator._render_class_summary(
+                obj, documented_file, symbol_index, anchor,
+                os.path.basename(PageLayout.class_page(documented_file.file_path, anchor)))])
+
+        return PageGenerator._render_declaration(obj, documented_file, symbol_index, anchor, split)
+
+    @staticmethod
+    def _render_declaration(obj, documented_file: DocumentedFile, symbol_index: SymbolIndex, anchor: str,
+                            split: Set[str]) -> Iterator[str]:
         if isinstance(obj, DocumentedClass):
-            return PageGenerator._render_class(obj, documented_file, file_list)
+            return PageGenerator._render_class(obj, documented_file, symbol_index, anchor, split)
 
         elif isinstance(obj, DocumentedEnum):
-            return PageGenerator._render_enum(obj, documented_file, file_list)
+            return PageGenerator._render_enum(obj, documented_file, symbol_index, anchor, split)
 
         elif isinstance(obj, DocumentedInterface):
-            return PageGenerator._render_interface(obj, documented_file, file_list)
+            return PageGenerator._render_interface(obj, documented_file, symbol_index, anchor, split)
+
+    @staticmethod
+    def _render_class_summary(obj, documented_file: DocumentedFile, symbol_index: SymbolIndex, anchor: str,
+                              href: str) -> str:
+        return PageGenerator.templates.get('class_summary').render(
+            anchor=html.escape(anchor),
+            kind=SearchIndex.KINDS[SearchIndex.class_kind(obj)],
+            href=parse.quote(href, safe='/#'),
+            name=html.escape(obj.name),
+            summary=PageGenerator.render_doc_string(obj.javadoc.summary if obj.javadoc is not None else None,
+                                                   documented_file, symbol_index))
 
     @staticmethod
-    def _render_methods(methods, documented_file: DocumentedFile, file_list: List[DocumentedFile]) -> str:
-        return ''.join(PageGenerator.templates.get('method').render(
+    def _render_methods(methods, documented_file: DocumentedFile, symbol_index: SymbolIndex,
+                        class_anchor: str) -> Iterator[str]:
+        return (PageGenerator.templates.get('method').render(
+            anchor=html.escape(SearchIndex.member_anchor(class_anchor, m.name, SearchIndex.signature(m))),
             name=m.name,
             return_type=html.escape(m.return_type),
             args='<br>'.join(html.escape(' '.join(arg)) for arg in m.args),
@@ -74,91 +241,115 @@ class PageGenerator:
             access_modifier=m.access_modifier,
             modifiers=' '.join(html.escape(modifier) for modifier in m.modifiers),
             throws=', '.join(m.throws),
-            docs=PageGenerator.render_doc_string(m.docs, documented_file, file_list)) for m in methods)
+            docs=PageGenerator.render_javadoc(m.javadoc, documented_file, symbol_index)) for m in methods)
 
     @staticmethod
-    def _render_properties(properties, documented_file: DocumentedFile, file_list: List[DocumentedFile]) -> str:
-        return ''.join(PageGenerator.templates.get('property').render(
+    def _render_properties(properties, documented_file: DocumentedFile,
+                           symbol_index: SymbolIndex, class_anchor: str) -> Iterator[str]:
+        return (PageGenerator.templates.get('property').render(
+            anchor=html.escape(SearchIndex.member_anchor(class_anchor, p.name)),
             name=p.name,
             type=html.escape(p.type),
             annotations=' '.join(p.annotations),
             access_modifier=p.access_modifier,
             modifiers=' '.join(html.escape(modifier) for modifier in p.modifiers),
-            docs=PageGenerator.render_doc_string(p.docs, documented_file, file_list)) for p in properties)
+            docs=PageGenerator.render_javadoc(p.javadoc, documented_file, symbol_index)) for p in properties)
 
     @staticmethod
-    def _render_class(c: DocumentedClass, documented_file: DocumentedFile, file_list: List[DocumentedFile]) -> str:
+    def _render_class(c: DocumentedClass, documented_file: DocumentedFile,
+                      symbol_index: SymbolIndex, anchor: str, split: Set[str] = frozenset()) -> Iterator[str]:
 
         impl_list = []
         for class_name in c.implements_list:
-            impl_list.append(PageGenerator._render_class_link(class_name, documented_file, file_list))
+            impl_list.append(PageGenerator._render_class_link(class_name, documented_file, symbol_index))
         rendered_impl_list = ', '.join(impl_list)
 
-        rendered_methods = PageGenerator._render_methods(c.methods, documented_file, file_list)
-        rendered_properties = PageGenerator._render_properties(c.properties, documented_file, file_list)
+        rendered_methods = PageGenerator._render_methods(c.methods, documented_file, symbol_index, anchor)
+        rendered_properties = PageGenerator._render_properties(c.properties, documented_file, symbol_index,
+                                                               anchor)
 
-        rendered_extends = PageGenerator._render_class_link(c.extends, documented_file, file_list)
+        rendered_extends = PageGenerator._render_class_link(c.extends, documented_file, symbol_index)
 
-        return PageGenerator.templates.get('class').render(name=html.escape(c.name),
-                                                           docs=PageGenerator.render_doc_string(c.docs, documented_file,
-                                                                                                file_list),
+        return PageGenerator.templates.get('class').stream(anchor=html.escape(anchor),
+                                                           name=html.escape(c.name),
+                                                           docs=PageGenerator.render_javadoc(c.javadoc, documented_file,
+                                                                                             symbol_index),
                                                            extends=rendered_extends,
                                                            impl_list=rendered_impl_list,
-                                                           inner_classes=''.join(
+                                                           inner_classes=itertools.chain.from_iterable(
                                                                PageGenerator._render_class_like_object(ic,
                                                                                                        documented_file,
-                                                                                                       file_list)
+                                                                                                       symbol_index,
+                                                                                                       anchor, split)
                                                                for ic in c.inner_classes),
                                                            methods=rendered_methods,
                                                            properties=rendered_properties)
 
     @staticmethod
-    def _render_enum(c: DocumentedEnum, documented_file: DocumentedFile, file_list: List[DocumentedFile]) -> str:
+    def _render_enum(c: DocumentedEnum, documented_file: DocumentedFile,
+                     symbol_index: SymbolIndex, anchor: str, split: Set[str] = frozenset()) -> Iterator[str]:
 
         impl_list = []
         for class_name in c.implements_list:
-            impl_list.append(PageGenerator._render_class_link(class_name, documented_file, file_list))
+            impl_list.append(PageGenerator._render_class_link(class_name, documented_file, symbol_index))
         rendered_impl_list = ', '.join(impl_list)
 
-        rendered_methods = PageGenerator._render_methods(c.methods, documented_file, file_list)
-        rendered_properties = PageGenerator._render_properties(c.properties, documented_file, file_list)
+        rendered_methods = PageGenerator._render_methods(c.methods, documented_file, symbol_index, anchor)
+        rendered_properties = PageGenerator._render_properties(c.properties, documented_file, symbol_index,
+                                                               anchor)
 
-        return PageGenerator.templates.get('enum').render(name=html.escape(c.name),
-                                                          docs=PageGenerator.render_doc_string(c.docs, documented_file,
-                                                                                               file_list),
+        return PageGenerator.templates.get('enum').stream(anchor=html.escape(anchor),
+                                                          name=html.escape(c.name),
+                                                          docs=PageGenerator.render_javadoc(c.javadoc, documented_file,
+                                                                                            symbol_index),
                                                           impl_list=rendered_impl_list,
-                                                          inner_classes=''.join(
+                                                          inner_classes=itertools.chain.from_iterable(
                                                               PageGenerator._render_class_like_object(ic,
                                                                                                       documented_file,
-                                                                                                      file_list)
+                                                                                                      symbol_index,
+                                                                                                      anchor, split)
                                                               for ic in c.inner_classes),
                                                           methods=rendered_methods,
-                                                          values=' '.join(c.values),
+                                                          values=' '.join(
+                                                              PageGenerator._render_enum_value(value, anchor)
+                                                              for value in c.values),
                                                           properties=rendered_properties)
 
+    @staticmethod
+    def _render_enum_value(value: str, enum_anchor: str) -> str:
+        if not value.isidentifier():
+            return value
+        return '<span id="{0}">{1}</span>'.format(html.escape(SearchIndex.member_anchor(enum_anchor, value)), value)
+
     @staticmethod
     def _render_interface(c: DocumentedInterface, documented_file: DocumentedFile,
-                          file_list: List[DocumentedFile]) -> str:
+                          symbol_index: SymbolIndex, anchor: str, split: Set[str] = frozenset()) -> Iterator[str]:
 
         extends_list = []
         for class_name in c.extends_list:
-            extends_list.append(PageGenerator._render_class_link(class_name, documented_file, file_list))
+            extends_list.append(PageGenerator._render_class_link(class_name, documented_file, symbol_index))
         rendered_extends_list = ', '.join(extends_list)
 
-        rendered_methods = PageGenerator._render_methods(c.methods, documented_file, file_list)
+        rendered_methods = PageGenerator._render_methods(c.methods, documented_file, symbol_index, anchor)
 
-        return PageGenerator.templates.get('interface').render(name=html.escape(c.name),
-                                                               docs=PageGenerator.render_doc_string(c.docs,
-                                                                                                    documented_file,
-                                                                                                    file_list),
+        return PageGenerator.templates.get('interface').stream(anchor=html.escape(anchor),
+                                                               name=html.escape(c.name),
+                                                               docs=PageGenerator.render_javadoc(c.javadoc,
+                                                                                                 documented_file,
+                                                                                                 symbol_index),
                                                                extends_list=rendered_extends_list,
-                                                               inner_classes=''.join(
-                                                                   PageGenerator._render_class_like_object(ic,
-                                                                                                           documented_file,
-                                                                                                           file_list)
+                                                               inner_classes=itertools.chain.from_iterable(
+                                                                   PageGenerator._render_class_like_object(
+                                                                       ic, documented_file, symbol_index, anchor, split)
                                                                    for ic in c.inner_classes),
                                                                methods=rendered_methods)
 
+    @staticmethod
+    def render_package_structure(tree: FileTreeNode, current_file: Optional[DocumentedFile]) -> str:
+        return PageGenerator._render_tree(tree, current_file,
+                                          PageGenerator.templates.get('list_package'),
+                                          PageGenerator.templates.get('list_item'))
+
     @staticmethod
     def _render_tree(tree: FileTreeNode, current_file: Optional[DocumentedFile], package_template: FileTemplate,
                      item_template: FileTemplate) -> str:
@@ -185,32 +376,83 @@ class PageGenerator:
         return package_template.render(name=tree.directory, items=result)
 
     @staticmethod
-    def _render_class_link(class_name, documented_file, file_list):
-        if class_name is not None:
-            class_name = class_name.split('.')[-1]
-        path = documented_file.get_doc_import_path(class_name, file_list)
+    def _render_class_link(class_name, documented_file, symbol_index, label: str = None):
+        path = symbol_index.get_doc_path(class_name, documented_file)
+        if label is None and class_name is not None:
+            label = class_name.split('.')[-1]
         return '<a class="{0}" href="{1}">{2}</a>'.format('disabled' if path is None else '',
                                                           path,
-                                                          class_name or '')
+                                                          label or '')
 
     @staticmethod
     def create_index_page(tree: FileTreeNode, file_list: List[DocumentedFile], project_name, project_version, dir: str):
         file_path = os.path.join(dir, 'index.html')
 
-        rendered_package_structure = PageGenerator._render_tree(tree, None,
-                                                                PageGenerator.templates.get('list_package'),
-                                                                PageGenerator.templates.get('list_item'))
+        rendered_package_structure = PageGenerator.render_package_structure(tree, None)
 
         rendered_alphabetical_index = PageGenerator.render_alphabetical_index(file_list)
 
-        with open(file_path, 'w') as file:
-            file.write(PageGenerator.templates.get('index').render(
+        def render(generation_date: str) -> str:
+            return PageGenerator.templates.get('index').render(
                 package_structure=rendered_package_structure,
-                generation_date=time.strftime("%Y-%m-%d %H:%M:%S"),
+                generation_date=generation_date,
                 alphabetical_index=rendered_alphabetical_index,
                 project_name=project_name,
                 project_version=project_version or ''
-            ))
+            )
+
+        # the generation date alone does not make the index a new file, the key leaves it out
+        key = hashlib.sha1(render('').encode('utf-8')).hexdigest()
+        if not PageWriter.matches(file_path, key):
+            PageWriter.write_keyed(file_path, key, [render(time.strftime("%Y-%m-%d %H:%M:%S"))])
+
+    @staticmethod
+    def create_search_index(file_list: List[DocumentedFile], dir: str, layout: PageLayout = None):
+        SearchIndex.write(file_list, dir, layout)
+
+    @staticmethod
+    def create_package_summaries(file_list: List[DocumentedFile], dir: str, layout: PageLayout):
+        packages = collections.defaultdict(list)
+        for documented_file in file_list:
+            packages[documented_file.get_package_directory()].append(documented_file)
+
+        if not layout.split:
+            # summaries of an earlier build with split classes
+            for directory in packages:
+                try:
+                    os.remove(os.path.join(dir, layout.package_summary_page(directory)))
+                except FileNotFoundError:
+                    pass
+            return
+
+        symbol_index = SymbolIndex(file_list, layout)
+        for directory, files in packages.items():
+            PageWriter.write(os.path.join(dir, layout.package_summary_page(directory)),
+                             PageGenerator.stream_package_summary(directory, files, symbol_index, layout))
+
+    @staticmethod
+    def stream_package_summary(directory: str, files: List[DocumentedFile], symbol_index: SymbolIndex,
+                               layout: PageLayout) -> Iterator[str]:
+        """Yields the summary page of a package directory, a link with the first sentence for every class."""
+        files = sorted(files, key=lambda documented_file: documented_file.file_path)
+
+        summaries = []
+        for documented_file in files:
+            split = layout.split_classes(documented_file)
+            for c in documented_file.classes:
+                if c.name is None:
+                    continue
+
+                anchor = SearchIndex.class_anchor(None, c.name)
+                if anchor in split:
+                    href = os.path.basename(layout.class_page(documented_file.file_path, anchor))
+                else:
+                    href = os.path.basename(layout.file_page(documented_file.file_path)) + '#' + anchor
+                summaries.append(PageGenerator._render_class_summary(c, documented_file, symbol_index, anchor, href))
+
+        summary_page = layout.package_summary_page(directory)
+        return PageGenerator._stream_page(os.path.splitext(summary_page)[0], files[0].package, layout, '',
+                                          iter(summaries))
 
     @staticmethod
     def render_alphabetical_index(file_list: List[DocumentedFile]) -> str:
@@ -232,42 +474,20 @@ class PageGenerator:
         return result
 
     @staticmethod
-    def render_doc_string(doc: Optional[str], documented_file: DocumentedFile, file_list: List[DocumentedFile]):
+    def render_doc_string(doc: Optional[str], documented_file: DocumentedFile, symbol_index: SymbolIndex):
         if doc is None:
             return ''
 
-        lines = doc.split('\n')
-        result = ''
-        for line in lines:
-            result += PageGenerator._process_doc_string_line(line, documented_file, file_list)
-
-        return result
+        return DocTemplate.compile(doc).render(
+            lambda class_name, label: PageGenerator._render_class_link(class_name, documented_file, symbol_index, label))
 
     @staticmethod
-    def _process_doc_string_line(line: str, documented_file: DocumentedFile, file_list: List[DocumentedFile]):
-        i = line.rfind('*')
-
-        if i < 0:
-            line = line + '\n'
-        elif i + 1 < len(line) and line[i + 1] == '/':
-            line = ''
-        else:
-            line = line[i + 1:].strip() + '\n'
-
-        matches = re.finditer(PageGenerator.docstring_code_regex, line)
-        shift = 0
-        for match in matches:
-            argument = html.escape(match.group(1))
-            line = line[:match.start() + shift] + argument + line[match.end() + shift:]
-            shift += len(argument) - match.end() + match.start()
-
-        matches = re.finditer(PageGenerator.docstring_link_regex, line)
-        shift = 0
-        for match in matches:
-            argument = PageGenerator._render_class_link(match.group(1), documented_file, file_list)
-            line = line[:match.start() + shift] + argument + line[match.end() + shift:]
-            shift += len(argument) - match.end() + match.start()
+    def render_javadoc(javadoc: Optional[Javadoc], documented_file: DocumentedFile, symbol_index: SymbolIndex):
+        if javadoc is None:
+            return ''
 
-        line = re.sub(PageGenerator.docstring_directive_regex, r'<span class="text-primary">\1</span>', line)
+        if javadoc.template is None:
+            javadoc.template = DocTemplate.compile(javadoc.text)
 
-        return line
+        return javadoc.template.render(
+            lambda class_name, label: PageGenerator._render_class_link(class_name, documented_file, symbol_index, label))
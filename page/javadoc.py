@@ -0,0 +1,88 @@
+import functools
+import re
+from pydoc import html
+from typing import Callable, Optional
+
+
+class DocTemplate:
+    """Javadoc comment compiled to literal chunks with a slot for every link.
+
+    Comments are tokenized once per distinct text, links are resolved on render because they depend on the file the
+    comment is rendered in.
+    """
+
+    __slots__ = ('_chunks', '_links', '_text')
+
+    CACHE_SIZE = 4096
+
+    token_regex = re.compile(r'''
+        {@(?:code|literal)[^\S\n](?P<code>[^}\n]*)}
+      | {@(?:link|linkplain)[^\S\n]+(?P<class_name>[\w.$]*)(?:\#(?P<member>[\w$]*(?:\([^)\n]*\))?))?
+        (?:[^\S\n]+(?P<label>[^}\n]*?))?[^\S\n]*}
+      | {@value(?:[^\S\n]+(?P<value>[^}\s]*))?[^\S\n]*}
+      | (?P<tag>@[a-z]+)
+    ''', re.VERBOSE)
+
+    def __init__(self, doc: str):
+        text = ''.join(DocTemplate._strip_line(line) for line in doc.split('\n'))
+
+        self._chunks = []
+        self._links = []
+
+        position = 0
+        for match in DocTemplate.token_regex.finditer(text):
+            self._chunks.append(text[position:match.start()])
+            position = match.end()
+
+            if match.group('tag') is not None:
+                self._chunks.append('<span class="text-primary">' + match.group('tag') + '</span>')
+            elif match.group('code') is not None:
+                self._chunks.append(html.escape(match.group('code')))
+            elif match.group('class_name') is not None:
+                self._links.append((len(self._chunks), match.group('class_name'), DocTemplate._label(match)))
+                self._chunks.append(None)
+            else:
+                self._chunks.append(html.escape(match.group('value') or ''))
+        self._chunks.append(text[position:])
+
+        # comments without links render the same in every file, only the text is kept
+        self._text = None
+        if not self._links:
+            self._text = ''.join(self._chunks)
+            self._chunks = None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=CACHE_SIZE)
+    def compile(doc: str) -> 'DocTemplate':
+        return DocTemplate(doc)
+
+    def render(self, render_link: Callable[[str, Optional[str]], str]) -> str:
+        """Renders the comment, render_link is called with the class name and the label of every link."""
+        if self._text is not None:
+            return self._text
+
+        chunks = self._chunks.copy()
+        for index, class_name, label in self._links:
+            chunks[index] = render_link(class_name, label)
+        return ''.join(chunks)
+
+    @staticmethod
+    def _label(match) -> Optional[str]:
+        if match.group('label'):
+            return match.group('label')
+        if match.group('member') is not None:
+            # member references show the member, qualified by the class when there is one
+            return (match.group('class_name').split('.')[-1] + '.' if match.group('class_name') else '') \
+                   + html.escape(match.group('member'))
+        return None
+
+    @staticmethod
+    def _strip_line(line: str) -> str:
+        i = line.rfind('*')
+
+        if i < 0:
+            return line + '\n'
+        elif i + 1 < len(line) and line[i + 1] == '/':
+            return ''
+        else:
+            return line[i + 1:].strip() + '\n'
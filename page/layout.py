@@ -0,0 +1,90 @@
+import os
+from typing import List, Optional, Set
+
+from page.search import SearchIndex
+from util.util import DocumentedFile
+
+
+class PageLayout:
+    """Decides which page every class of the project is written to.
+
+    By default a source file is one page with all of its classes. With split_members set, a page keeps at most about
+    that many members: the largest classes move to pages of their own until the rest fits, a moved class leaves a
+    link in its place. Every package directory then also gets a summary page.
+    """
+
+    PACKAGE_SUMMARY_PAGE = 'package-summary.html'
+
+    def __init__(self, split_members: Optional[int] = None):
+        self.split_members = split_members
+
+    @property
+    def split(self) -> bool:
+        return self.split_members is not None
+
+    def fingerprint(self) -> str:
+        return 'split_members={}'.format(self.split_members)
+
+    @staticmethod
+    def file_page(file_path: str) -> str:
+        return file_path + '.html'
+
+    @staticmethod
+    def class_page(file_path: str, anchor: str) -> str:
+        # next to the page of the file, relative links are the same on both pages
+        return file_path + '.' + anchor + '.html'
+
+    @staticmethod
+    def package_summary_page(directory: str) -> str:
+        return os.path.join(directory, PageLayout.PACKAGE_SUMMARY_PAGE)
+
+    def split_classes(self, documented_file: DocumentedFile) -> Set[str]:
+        """Returns anchors of the classes of the file that are written to their own page."""
+        split = set()
+        if self.split:
+            self._page_size(0, documented_file.classes, None, split)
+        return split
+
+    def _page_size(self, size: int, classes: List, parent_anchor: Optional[str], split: Set[str]) -> int:
+        entries = []
+        for c in classes:
+            anchor = SearchIndex.class_anchor(parent_anchor, c.name)
+            entries.append((self._page_size(PageLayout.members(c), c.inner_classes, anchor, split), anchor, c.name))
+            size += entries[-1][0]
+
+        for class_size, anchor, name in sorted(entries, key=lambda entry: -entry[0]):
+            if size < self.split_members:
+                break
+
+            # anonymous classes have no anchor to link to, a link takes as much room as a class of one member
+            if name and class_size > 1:
+                split.add(anchor)
+                size -= class_size - 1
+        return size
+
+    @staticmethod
+    def members(c) -> int:
+        # the value list keeps the commas between values
+        return len(c.methods) + len(getattr(c, 'properties', ())) \
+               + sum(1 for value in getattr(c, 'values', ()) if value.isidentifier())
+
+    @staticmethod
+    def class_pages(directory: str, file_names: Set[str]) -> List[str]:
+        """Returns names of the class pages in the output directory that belong to the given files."""
+        try:
+            entries = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+
+        result = []
+        for entry in entries:
+            parts = entry.split('.')
+            if parts[-1] != 'html':
+                continue
+
+            # the owner is a prefix of the name, at least one part of an anchor follows it
+            for i in range(1, len(parts) - 1):
+                if '.'.join(parts[:i]) in file_names:
+                    result.append(entry)
+                    break
+        return result
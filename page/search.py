@@ -0,0 +1,124 @@
+import json
+import os
+import re
+from typing import List, Optional
+
+from page.writer import PageWriter
+from util.util import DocumentedFile, DocumentedEnum, DocumentedInterface, DocumentedMethod
+
+
+class SearchIndex:
+    """Symbol table of the project for the search box, loaded by the pages on first use.
+
+    Symbols are sorted by their lower-cased name so the client can find a prefix with a binary search. Names are
+    front-coded: every entry stores the length of the prefix it shares with the previous name and the rest of it.
+    """
+
+    FILE_NAME = 'search_index.js'
+    CALLBACK = 'searchIndexLoaded'
+    VERSION = 1
+
+    KINDS = ['class', 'interface', 'enum', 'method', 'property', 'value']
+    CLASS, INTERFACE, ENUM, METHOD, PROPERTY, VALUE = range(len(KINDS))
+
+    generics_regex = re.compile(r'<.*>')
+
+    @staticmethod
+    def class_anchor(parent: Optional[str], name: Optional[str]) -> str:
+        simple_name = SearchIndex.generics_regex.sub('', name or '')
+        return parent + '.' + simple_name if parent else simple_name
+
+    @staticmethod
+    def signature(method: DocumentedMethod) -> str:
+        # argument types without names and modifiers
+        return '(' + ','.join(arg[-2] if len(arg) > 1 else arg[0] for arg in method.args) + ')'
+
+    @staticmethod
+    def member_anchor(class_anchor: str, name: Optional[str], signature: str = '') -> str:
+        return class_anchor + '.' + (name or '') + signature
+
+    @staticmethod
+    def build(file_list: List[DocumentedFile], layout: 'PageLayout' = None) -> dict:
+        pages = []
+        containers = []
+        symbols = []
+
+        for documented_file in file_list:
+            file_page = len(pages)
+            pages.append(documented_file.file_path + '.html')
+            split = layout.split_classes(documented_file) if layout is not None else set()
+
+            stack = [(-1, file_page, c) for c in reversed(documented_file.classes)]
+            while stack:
+                parent, page, c = stack.pop()
+                if c.name is None:
+                    continue
+
+                anchor = SearchIndex.class_anchor(containers[parent] if parent >= 0 else None, c.name)
+                if anchor in split:
+                    page = len(pages)
+                    pages.append(layout.class_page(documented_file.file_path, anchor))
+                symbols.append((c.name, SearchIndex.class_kind(c), page, parent, None))
+
+                container = len(containers)
+                containers.append(anchor)
+
+                for m in c.methods:
+                    symbols.append((m.name, SearchIndex.METHOD, page, container, SearchIndex.signature(m)))
+                for p in getattr(c, 'properties', ()):
+                    symbols.append((p.name, SearchIndex.PROPERTY, page, container, None))
+                for value in getattr(c, 'values', ()):
+                    # the value list keeps the commas between values
+                    if value.isidentifier():
+                        symbols.append((value, SearchIndex.VALUE, page, container, None))
+
+                stack.extend((container, page, ic) for ic in reversed(c.inner_classes))
+
+        symbols = [symbol for symbol in symbols if symbol[0]]
+        symbols.sort(key=lambda symbol: (symbol[0].lower(), symbol[0], symbol[1], symbol[2], symbol[3]))
+
+        entries = []
+        previous = ''
+        for name, kind, page, container, signature in symbols:
+            shared = len(os.path.commonprefix([previous, name]))
+            entry = [shared, name[shared:], kind, page, container]
+            if signature is not None:
+                entry.append(signature)
+            entries.append(entry)
+            previous = name
+
+        return {'version': SearchIndex.VERSION, 'kinds': SearchIndex.KINDS, 'pages': pages, 'containers': containers,
+                'symbols': entries}
+
+    @staticmethod
+    def decode(index: dict) -> List[dict]:
+        """Expands the index the same way the search box does, mainly useful for tests and tooling."""
+        result = []
+        name = ''
+        for entry in index['symbols']:
+            shared, suffix, kind, page, container = entry[:5]
+            signature = entry[5] if len(entry) > 5 else ''
+            name = name[:shared] + suffix
+
+            if kind < SearchIndex.METHOD:
+                anchor = SearchIndex.class_anchor(index['containers'][container] if container >= 0 else None, name)
+            else:
+                anchor = SearchIndex.member_anchor(index['containers'][container], name, signature)
+
+            result.append({'name': name, 'kind': index['kinds'][kind], 'page': index['pages'][page],
+                           'anchor': anchor})
+        return result
+
+    @staticmethod
+    def write(file_list: List[DocumentedFile], dir: str, layout: 'PageLayout' = None) -> bool:
+        # a script instead of plain JSON, pages opened from the file system cannot fetch files
+        data = json.dumps(SearchIndex.build(file_list, layout), separators=(',', ':'), ensure_ascii=False)
+        return PageWriter.write(os.path.join(dir, SearchIndex.FILE_NAME), [SearchIndex.CALLBACK, '(', data, ');\n'])
+
+    @staticmethod
+    def class_kind(c) -> int:
+        if isinstance(c, DocumentedInterface):
+            return SearchIndex.INTERFACE
+        if isinstance(c, DocumentedEnum):
+            return SearchIndex.ENUM
+        return SearchIndex.CLASS
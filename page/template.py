@@ -1,48 +1,91 @@
+import hashlib
 import os
 import re
+from typing import Iterator
 
 cwd = os.path.dirname(os.path.realpath(__file__))
 
 
 class TemplateRegistry:
 
-    def __init__(self):
+    def __init__(self, strict=False):
         # todo template path
         self.templates = {
-            'root': FileTemplate('../templates/template.html'),
-            'method': FileTemplate('../templates/method_template.html'),
-            'property': FileTemplate('../templates/property_template.html'),
-            'class': FileTemplate('../templates/class_template.html'),
-            'interface': FileTemplate('../templates/interface_template.html'),
-            'enum': FileTemplate('../templates/enum_template.html'),
-            'list_package': FileTemplate('../templates/list_package_template.html'),
-            'list_item': FileTemplate('../templates/list_item_template.html'),
-            'index': FileTemplate('../templates/index_template.html')
+            'root': FileTemplate('../templates/template.html', strict),
+            'method': FileTemplate('../templates/method_template.html', strict),
+            'property': FileTemplate('../templates/property_template.html', strict),
+            'class': FileTemplate('../templates/class_template.html', strict),
+            'interface': FileTemplate('../templates/interface_template.html', strict),
+            'enum': FileTemplate('../templates/enum_template.html', strict),
+            'class_summary': FileTemplate('../templates/class_summary_template.html', strict),
+            'list_package': FileTemplate('../templates/list_package_template.html', strict),
+            'list_item': FileTemplate('../templates/list_item_template.html', strict),
+            'package_structure': FileTemplate('../templates/package_structure_template.html', strict),
+            'index': FileTemplate('../templates/index_template.html', strict)
         }
 
     def get(self, obj_name: str) -> 'FileTemplate':
         return self.templates[obj_name]
 
+    def fingerprint(self) -> str:
+        digest = hashlib.sha1()
+        for name in sorted(self.templates):
+            digest.update(self.templates[name].text.encode())
+        return digest.hexdigest()
+
 
 class TextTemplate:
+    placeholder_regex = re.compile(r'{{\s*([^\d\W]\w*)\s*}}')
 
-    def __init__(self, text):
+    def __init__(self, text, strict=False):
         self.text = text
-        self.matches = list(re.finditer(r'{{\s*([^\d\W]\w*)\s*}}', text))
+        self.strict = strict
+
+        # literal chunks with a None slot for every placeholder, filled and joined on render
+        self._chunks = []
+        self._slots = []
+
+        position = 0
+        for match in TextTemplate.placeholder_regex.finditer(text):
+            self._chunks.append(text[position:match.start()])
+            self._slots.append((len(self._chunks), match.group(1)))
+            self._chunks.append(None)
+            position = match.end()
+        self._chunks.append(text[position:])
 
     def render(self, **kwargs) -> str:
-        shift = 0
-        text = self.text
-        for match in self.matches:
-            argument = str(kwargs.get(match.group(1), None))
-            text = text[:match.start() + shift] + argument + text[match.end() + shift:]
-            shift += len(argument) - match.end() + match.start()
-        return text
+        chunks = self._chunks.copy()
+        for index, name in self._slots:
+            chunks[index] = str(self._argument(kwargs, name))
+        return ''.join(chunks)
+
+    def stream(self, **kwargs) -> Iterator[str]:
+        """Yields the rendered text in chunks, arguments that are iterators are streamed through in place."""
+        slots = iter(self._slots)
+        for chunk in self._chunks:
+            if chunk is not None:
+                yield chunk
+                continue
+
+            _, name = next(slots)
+            argument = self._argument(kwargs, name)
+            if isinstance(argument, Iterator):
+                yield from argument
+            else:
+                yield str(argument)
+
+    def _argument(self, kwargs, name: str):
+        try:
+            return kwargs[name]
+        except KeyError:
+            if self.strict:
+                raise KeyError('Missing template argument: ' + name) from None
+            return None
 
 
 class FileTemplate(TextTemplate):
 
-    def __init__(self, template_path):
+    def __init__(self, template_path, strict=False):
         with open(os.path.join(cwd, template_path), 'r') as file:
             text = file.read()
-        super().__init__(text)
+        super().__init__(text, strict)
@@ -0,0 +1,104 @@
+import itertools
+import os
+import secrets
+from typing import Iterable, Iterator
+
+
+class PageWriter:
+    """Writes output files atomically and leaves files whose contents did not change untouched."""
+
+    BUFFER_SIZE = 1 << 16
+
+    @staticmethod
+    def write(file_path: str, chunks: Iterable[str]) -> bool:
+        """Streams chunks into the target, returns whether the target was replaced.
+
+        Chunks are compared with the existing file as they come, a temporary file next to the target is only created
+        at the first difference.
+        """
+        directory = os.path.dirname(file_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+
+        chunks = iter(chunks)
+        try:
+            existing = open(file_path, 'rb', buffering=PageWriter.BUFFER_SIZE)
+        except OSError:
+            return PageWriter._replace(file_path, directory, [], chunks)
+
+        with existing:
+            position = 0
+            data = b''
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                if existing.read(len(data)) != data:
+                    break
+                position += len(data)
+                data = b''
+            else:
+                if not existing.read(1):
+                    return False
+
+            # the part that matched is copied from the existing file, the rest of the chunks follows it
+            existing.seek(0)
+            head = itertools.chain(PageWriter._read(existing, position), [data])
+            return PageWriter._replace(file_path, directory, head, chunks)
+
+    @staticmethod
+    def _replace(file_path: str, directory: str, head: Iterable[bytes], chunks: Iterator[str]) -> bool:
+        fd, temp_path = PageWriter._create_temp(file_path, directory)
+        try:
+            with open(fd, 'wb', buffering=PageWriter.BUFFER_SIZE) as file:
+                for data in head:
+                    file.write(data)
+                for chunk in chunks:
+                    file.write(chunk.encode('utf-8'))
+
+            os.replace(temp_path, file_path)
+            return True
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _create_temp(file_path: str, directory: str):
+        # created with the permissions open() would give the page, unlike the owner-only files of mkstemp
+        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+        while True:
+            temp_path = os.path.join(directory, '.{}.{}.tmp'.format(os.path.basename(file_path), secrets.token_hex(4)))
+            try:
+                return os.open(temp_path, flags, 0o666), temp_path
+            except FileExistsError:
+                continue
+
+    @staticmethod
+    def _read(file, size: int) -> Iterator[bytes]:
+        while size > 0:
+            data = file.read(min(size, PageWriter.BUFFER_SIZE))
+            if not data:
+                return
+            size -= len(data)
+            yield data
+
+    @staticmethod
+    def write_keyed(file_path: str, key: str, chunks: Iterable[str]):
+        """Writes the page with the key of its contents at the end, for pages with parts that change every run."""
+        PageWriter.write(file_path, itertools.chain(chunks, [PageWriter._key_comment(key)]))
+
+    @staticmethod
+    def matches(file_path: str, key: str) -> bool:
+        """Checks whether the file was written by write_keyed with the given key."""
+        comment = PageWriter._key_comment(key).encode('utf-8')
+        try:
+            with open(file_path, 'rb') as file:
+                size = file.seek(0, os.SEEK_END)
+                if size < len(comment):
+                    return False
+                file.seek(size - len(comment))
+                return file.read() == comment
+        except OSError:
+            return False
+
+    @staticmethod
+    def _key_comment(key: str) -> str:
+        return '\n<!-- key: {} -->\n'.format(key)
@@ -0,0 +1,210 @@
+import sys
+from collections import deque
+from typing import List, Tuple
+
+from lexer.util import Token, TokenKind
+from util.util import DocumentedFile, DocumentedClass, DocumentedInterface, DocumentedEnum, DocumentedMethod, \
+    DocumentedProperty, Declaration
+
+
+class StructureBuilder:
+    """Builds the DocumentedFile tree from the parser partition in a single pass.
+
+    Every parser state has a handler in `_state_handlers`; objects completed by a handler are placed in the tree
+    by the handler registered for their type in `_object_handlers`.
+    """
+
+    def __init__(self):
+        self.file = DocumentedFile()
+        self.stack = deque()
+        self.obj = None
+        self.declaration = Declaration()
+        self.imports = []
+
+    def build(self, partition: List[Tuple[str, List[Token]]]) -> DocumentedFile:
+        state_handlers = StructureBuilder._state_handlers
+
+        for state, tokens in partition:
+            handler = state_handlers.get(state)
+            if handler is not None:
+                handler(self, tokens)
+
+        return self.file
+
+    def _add(self, obj):
+        handler = StructureBuilder._object_handlers.get(type(obj))
+        if handler is not None:
+            handler(self, obj)
+
+    def _add_class_like(self, obj):
+        if len(self.stack) > 0:
+            self.stack[-1].inner_classes.append(obj)
+        else:
+            self.file.classes.append(obj)
+
+        self.stack.append(obj)
+
+    def _add_property(self, obj: DocumentedProperty):
+        if len(self.stack) == 0:
+            return
+
+        if isinstance(self.stack[-1], (DocumentedClass, DocumentedEnum)):
+            self.stack[-1].properties.append(obj)
+
+    def _add_method(self, obj: DocumentedMethod):
+        if len(self.stack) == 0:
+            return
+
+        if isinstance(self.stack[-1], (DocumentedClass, DocumentedInterface, DocumentedEnum)):
+            self.stack[-1].methods.append(obj)
+
+        if not obj.signature:
+            self.stack.append(obj)
+
+    def _start_class_like(self, obj):
+        # imports read so far belong to the file once its first type declaration starts
+        self.file.imports.extend(self.imports)
+        self.imports = []
+        self.obj = obj
+
+    def _finish_declaration(self):
+        self._add(self.obj)
+        self.declaration = Declaration()
+
+    # handlers of parser states
+
+    def _on_import(self, tokens):
+        if len(tokens) > 1:
+            self.imports.append(tokens[1].value)
+
+    def _on_package(self, tokens):
+        if len(tokens) > 1:
+            self.file.package = tokens[1].value
+
+    def _on_docs(self, tokens):
+        self.declaration.docs = tokens[0].value
+
+    def _on_annotations(self, tokens):
+        self.declaration.annotations.extend([sys.intern(token.value) for token in tokens])
+
+    def _on_access_modifier(self, tokens):
+        self.declaration.access_modifier = sys.intern(tokens[0].value)
+
+    def _on_modifiers(self, tokens):
+        self.declaration.modifiers.extend([sys.intern(token.value) for token in tokens])
+
+    def _on_multiline_comment(self, tokens):
+        if len(self.stack) == 0 and self.file.file_doc is None:
+            self.file.file_doc = tokens[0].value
+
+    def _on_class(self, tokens):
+        self._start_class_like(DocumentedClass.from_declaration(self.declaration))
+
+    def _on_enum(self, tokens):
+        self._start_class_like(DocumentedEnum.from_declaration(self.declaration))
+
+    def _on_interface(self, tokens):
+        self._start_class_like(DocumentedInterface.from_declaration(self.declaration))
+
+    def _on_name(self, tokens):
+        self.obj.name = tokens[0].value
+
+    def _on_extends(self, tokens):
+        self.obj.extends = sys.intern(tokens[1].value)
+
+    def _on_implements_list(self, tokens):
+        self.obj.implements_list.extend(StructureBuilder._names(tokens[1:]))
+
+    def _on_extends_list(self, tokens):
+        self.obj.extends_list.extend(StructureBuilder._names(tokens[1:]))
+
+    def _on_enum_values(self, tokens):
+        if len(self.stack) > 0 and isinstance(self.stack[-1], DocumentedEnum):
+            self.stack[-1].values.extend(token.value for token in tokens)
+
+    def _on_type(self, tokens):
+        self.declaration.type = sys.intern(tokens[0].value)
+
+    def _on_member_name(self, tokens):
+        self.declaration.name = tokens[0].value
+
+    def _on_property(self, tokens):
+        self.obj = DocumentedProperty.from_declaration(self.declaration)
+        self._finish_declaration()
+
+    def _on_method_arguments(self, tokens):
+        self.obj = DocumentedMethod.from_declaration(self.declaration)
+        self.obj.args = DocumentedMethod.parse_method_args(tokens[0].value)
+
+    def _on_method_post_arguments(self, tokens):
+        self.obj.post_args = tokens
+        if tokens[0].value == 'throws':
+            self.obj.throws = StructureBuilder._names(tokens[1:])
+
+    def _on_method_signature(self, tokens):
+        self.obj.signature = True
+        self._finish_declaration()
+
+    def _on_open_body(self, tokens):
+        self._finish_declaration()
+
+    def _on_bracket(self, tokens):
+        if tokens[0].value == '}':
+            if len(self.stack) > 0:
+                self.stack.pop()
+        elif tokens[0].value == '{':
+            self.stack.append(None)
+
+    def _on_dead_state(self, tokens):
+        self.declaration = Declaration()
+
+    @staticmethod
+    def _names(tokens: List[Token]) -> List[str]:
+        return [sys.intern(token.value) for token in tokens if token.kind != TokenKind.DELIMITER]
+
+    _state_handlers = {
+        'ImportState': _on_import,
+        'PackageState': _on_package,
+        'DeclarationWithDocsState': _on_docs,
+        'DeclarationWithAnnotationsState': _on_annotations,
+        'DeclarationWithAccessModifiersState': _on_access_modifier,
+        'DeclarationWithModifiersState': _on_modifiers,
+        'MultilineCommentState': _on_multiline_comment,
+
+        'ClassState': _on_class,
+        'ClassNameState': _on_name,
+        'ClassExtendsState': _on_extends,
+        'ClassImplementsListState': _on_implements_list,
+        'ClassOpenBracketState': _on_open_body,
+
+        'EnumState': _on_enum,
+        'EnumNameState': _on_name,
+        'EnumImplementsListState': _on_implements_list,
+        'EnumValuesListState': _on_enum_values,
+        'EnumOpenBracketState': _on_open_body,
+
+        'InterfaceState': _on_interface,
+        'InterfaceNameState': _on_name,
+        'InterfaceExtendsListState': _on_extends_list,
+        'InterfaceOpenBracketState': _on_open_body,
+
+        'MethodOrPropertyTypeState': _on_type,
+        'MethodOrPropertyNameState': _on_member_name,
+        'PropertyDelimiter': _on_property,
+        'MethodArgumentsState': _on_method_arguments,
+        'MethodPostArgumentsState': _on_method_post_arguments,
+        'InterfaceMethodDelimiter': _on_method_signature,
+        'MethodOpenBracketState': _on_open_body,
+
+        'ClosedBracketState': _on_bracket,
+        'OpenBracketState': _on_bracket,
+        'DeadState': _on_dead_state,
+    }
+
+    _object_handlers = {
+        DocumentedClass: _add_class_like,
+        DocumentedEnum: _add_class_like,
+        DocumentedInterface: _add_class_like,
+        DocumentedProperty: _add_property,
+        DocumentedMethod: _add_method,
+    }
@@ -1,8 +1,11 @@
-from pprint import pprint
-from typing import List
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from lexer.states import State
-from lexer.util import LexerPartition, Token
+from lexer.util import LexerPartition, Token, TokenKind
+
+DELIMITER_KINDS = frozenset({TokenKind.OPEN_BRACKET, TokenKind.CLOSED_BRACKET, TokenKind.DELIMITER})
 
 
 class ParserFiniteStateMachine:
@@ -11,31 +14,41 @@ class ParserFiniteStateMachine:
         self.initial_state = initial_state
         self.state = initial_state
         self.partition = []
+        self._pending = []
+        self._committed = 0
         self._current_series = []
-        self._last_initial_index = 0
 
     def process_tokens(self, partition: LexerPartition):
-        i = 0
-        previous_state = None
+        self.partition.extend(self.parse(partition.sequence))
 
-        while i < len(partition.sequence):
-            token = partition.sequence[i]
-            event = TokenEvent(token, partition.sequence[i + 1:])
+    def parse(self, tokens: Iterable[Token]) -> Iterator[Tuple[str, List[Token]]]:
+        """Consumes tokens lazily and yields partition entries as soon as a dead state can no longer remove them."""
+        previous_state = None
+        event = TokenEvent(tokens)
 
-            self.step(event)  # todo generator for lookahead
+        while not event.end:
+            self.step(event)
 
             if self.state.type == 'DeadState':
                 if previous_state is not None and previous_state.type == 'InitialState':
-                    i += 1
+                    event.advance()
 
                 self._append_to_partition(self.state)
                 self._remove_states_until_delimiter()
                 self.state = self.initial_state
             else:
-                i += 1
+                event.advance()
 
             previous_state = self.state
-        self.partition.append((self.state.type, self._current_series))
+
+            if self._committed > 0:
+                yield from self._pending[:self._committed]
+                del self._pending[:self._committed]
+                self._committed = 0
+
+        self._pending.append((self.state.type, self._current_series))
+        yield from self._pending
+        self._pending = []
 
     def step(self, event: 'TokenEvent'):
         _previous_state = self.state
@@ -47,30 +60,58 @@ class ParserFiniteStateMachine:
         self._current_series.append(event.token)
 
     def _append_to_partition(self, new_state):
-        self.partition.append((new_state.type, self._current_series))
+        entry = (new_state.type, self._current_series)
+        self._pending.append(entry)
         self._current_series = []
 
+        # removal stops at this entry, so it and everything before it is final
+        if ParserFiniteStateMachine._stops_removal(entry):
+            self._committed = len(self._pending)
+
     def _remove_states_until_delimiter(self):
-        while len(self.partition) > 0 \
-                and len(self.partition[-1][1]) > 0 \
-                and self.partition[-1][1][0].state not in ['OpenBracketState',
-                                                           'ClosedBracketState',
-                                                           'DelimiterState']:
-            if self.partition[-1][0] in ['PackageState', 'ImportState']:
-                break
+        while len(self._pending) > 0 and not ParserFiniteStateMachine._stops_removal(self._pending[-1]):
+            self._pending.pop()
 
-            self.partition.pop()
+    @staticmethod
+    def _stops_removal(entry: Tuple[str, List[Token]]) -> bool:
+        state_type, tokens = entry
+        return len(tokens) == 0 or tokens[0].kind in DELIMITER_KINDS or state_type in ('PackageState', 'ImportState')
 
 
 class TokenEvent:
+    """Current token of a token stream with a lookahead buffer holding only the tokens peeked at."""
+    __slots__ = ('_tokens', '_buffer', 'token', 'end')
 
-    def __init__(self, token: Token, lookahead: List[Token], end=False):
-        self.token = token
-        self.end = end
-        self._lookahead = lookahead
+    def __init__(self, tokens: Iterable[Token]):
+        self._tokens = iter(tokens)
+        self._buffer = deque()
+        self.advance()
 
     def __repr__(self) -> str:
         return 'TokenEvent[{0}]'.format(repr(self.token))
 
-    def lookahead(self, n) -> List[Token]:
-        return self._lookahead[:n]
+    def advance(self) -> 'TokenEvent':
+        self.token = self._buffer.popleft() if self._buffer else next(self._tokens, None)
+        self.end = self.token is None
+        return self
+
+    def peek(self, offset: int = 1) -> Optional[Token]:
+        """Returns the token offset positions after the current one, peek(0) is the current token."""
+        if offset <= 0:
+            if offset < 0:
+                raise ValueError('Cannot peek at consumed tokens: ' + str(offset))
+            return self.token
+
+        self._fill(offset)
+        return self._buffer[offset - 1] if len(self._buffer) >= offset else None
+
+    def lookahead(self, n) -> Sequence[Token]:
+        self._fill(n)
+        return tuple(islice(self._buffer, n))
+
+    def _fill(self, n: int):
+        while len(self._buffer) < n:
+            token = next(self._tokens, None)
+            if token is None:
+                break
+            self._buffer.append(token)
@@ -1,49 +1,117 @@
+import functools
 import os
+import time
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 
 from lexer.fmt import FiniteStateMachine
+from lexer.regex_lexer import RegexLexer
 from lexer.states import InitialState
+from lexer.util import TokenKind
 from page.generator import PageGenerator
+from page.layout import PageLayout
+from parser.builder import StructureBuilder
 from parser.fmt import ParserFiniteStateMachine
 from parser.states import ParserInitialState
-from util.util import FileTreeNode, SourceFile, Helpers, DocumentedClass, DocumentedMethod, DocumentedInterface, \
-    Delimiter, PackageName, Imports, Declaration, DocumentedFile, DocumentedProperty, DocumentedEnum, EnumValue, \
-    MultilineComment
+from util.cache import BuildCache
+from util.source_reader import DEFAULT_FALLBACK_ENCODING
+from util.util import FileTreeNode, SourceFile, Helpers, DocumentedFile
 
 
 class Parser:
     ACCEPTED_EXTENSIONS = ['.java']
+    LEXERS = {
+        'fsm': lambda: FiniteStateMachine(InitialState()),
+        'regex': RegexLexer
+    }
+    IGNORED_TOKENS = (TokenKind.WHITESPACE, TokenKind.INITIAL)
 
     @staticmethod
     def parse(input_path: str, output_dir: str, project_name: str = None, project_version: str = None,
-              verbose: bool = False, shallow: bool = False):
+              verbose: bool = False, shallow: bool = False, lexer: str = 'fsm', jobs: int = 1,
+              use_cache: bool = True, fallback_encoding: str = DEFAULT_FALLBACK_ENCODING, asset_mode: str = 'copy',
+              minified_assets: bool = False, split_members: int = None):
 
         if project_name is None:
             project_name = input_path
 
-        if os.path.isfile(input_path):
-            tree = Parser._generate_tree_from_list([(os.path.dirname(input_path), [], [os.path.basename(input_path)])])
-        elif os.path.isdir(input_path):
-            tree = Parser._generate_tree_from_list(Parser._list_files_hierarchy(input_path, shallow))
-        else:
-            raise ValueError('Invalid input path.')
+        tree = Parser.generate_tree(input_path, shallow)
 
         if verbose:
             print("Project file structure:")
             print(tree)
             print()
 
+        cache = BuildCache(output_dir, lexer, fallback_encoding) if use_cache else None
+        layout = PageLayout(split_members)
+
         root_path = tree.directory
-        tree.apply(lambda file: Parser.parse_source_file(file, root_path), verbose)
+        Parser._parse_tree(tree, root_path, lexer, verbose, jobs, cache, fallback_encoding)
 
-        PageGenerator.copy_resources(output_dir)
+        PageGenerator.copy_resources(output_dir, asset_mode, minified_assets, verbose)
 
         file_list = []
         tree.traverse(lambda documented_file: file_list.append(documented_file))
 
-        tree.traverse(lambda documented_file: PageGenerator.create_file(tree, documented_file, file_list, output_dir))
+        pages = file_list
+        if cache is not None:
+            for file_path in cache.update(file_list):
+                PageGenerator.remove_file(file_path, output_dir)
+            pages = cache.stale_pages(file_list, PageGenerator.templates.fingerprint(), layout)
+
+            if verbose:
+                print('rendering', len(pages), 'of', len(file_list), 'pages')
+
+        PageGenerator.create_package_structure(tree, output_dir)
+        PageGenerator.create_files(file_list, output_dir, jobs, pages, layout)
+        PageGenerator.create_package_summaries(file_list, output_dir, layout)
         PageGenerator.create_index_page(tree, file_list, project_name, project_version, output_dir)
+        PageGenerator.create_search_index(file_list, output_dir, layout)
+
+        if cache is not None:
+            cache.save()
+
+    @staticmethod
+    def generate_tree(input_path: str, shallow: bool = False) -> FileTreeNode:
+        if os.path.isfile(input_path):
+            return Parser._generate_tree_from_list([(os.path.dirname(input_path), [], [os.path.basename(input_path)])])
+        elif os.path.isdir(input_path):
+            return Parser._generate_tree_from_list(Parser._list_files_hierarchy(input_path, shallow))
+        else:
+            raise ValueError('Invalid input path.')
+
+    @staticmethod
+    def _parse_tree(tree: FileTreeNode, root_path: str, lexer: str, verbose: bool, jobs: int,
+                    cache: BuildCache = None, fallback_encoding: str = DEFAULT_FALLBACK_ENCODING):
+        parse_file = functools.partial(Parser.parse_source_file, root_path=root_path, lexer=lexer,
+                                       fallback_encoding=fallback_encoding)
+
+        if cache is not None:
+            tree.apply(functools.partial(cache.lookup, root_path=root_path), False)
+
+        files = []
+        tree.traverse(files.append)
+        source_files = [file for file in files if isinstance(file, SourceFile)]
+
+        if verbose and cache is not None:
+            print('parsing', len(source_files), 'of', len(files), 'files')
+
+        not_parsed = lambda file: isinstance(file, SourceFile)
+        started = time.perf_counter()
+
+        if jobs <= 1:
+            tree.apply(parse_file, verbose, predicate=not_parsed)
+        else:
+            with ProcessPoolExecutor(jobs) as executor:
+                tree.apply(parse_file, verbose, executor, chunksize=max(1, len(source_files) // (jobs * 4)),
+                           predicate=not_parsed)
+
+        if verbose:
+            elapsed = time.perf_counter() - started
+            source_bytes = sum(os.path.getsize(file.file_path) for file in source_files)
+            print('parsed {} files, {:.1f} KB at {:.1f} KB/s'.format(len(source_files), source_bytes / 1024,
+                                                                      source_bytes / 1024 / max(elapsed, 1e-9)))
 
     @staticmethod
     def _list_files_hierarchy(dir_path: str, shallow: bool) -> List:
@@ -84,218 +152,18 @@ class Parser:
         return root_node
 
     @staticmethod
-    def parse_source_file(source_file: SourceFile, root_path: str) -> DocumentedFile:
-        contents = source_file.read_all()
-        doc_file = Parser.parse_structure(contents)
+    def parse_source_file(source_file: SourceFile, root_path: str, lexer: str = 'fsm',
+                          fallback_encoding: str = DEFAULT_FALLBACK_ENCODING) -> DocumentedFile:
+        contents = source_file.read_all(fallback_encoding)
+        doc_file = Parser.parse_structure(contents, lexer)
 
         rel_file_path = os.path.relpath(source_file.file_path, root_path)
         doc_file.file_path = rel_file_path
         return doc_file
 
     @staticmethod
-    def parse_structure(file_contents: str) -> DocumentedFile:
-        fmt = FiniteStateMachine(InitialState())
-        fmt.process_string(file_contents)
-
-        partition = fmt.partition.exclude('WhitespaceState', 'InitialState')
+    def parse_structure(file_contents: str, lexer: str = 'fsm') -> DocumentedFile:
+        tokens = Parser.LEXERS[lexer]().tokens(file_contents, Parser.IGNORED_TOKENS)
 
         parser_fmt = ParserFiniteStateMachine(ParserInitialState())
-        parser_fmt.process_tokens(partition)
-
-        iterator = Parser.generate_data_objects(parser_fmt.partition)
-
-        stack = deque()
-
-        file = DocumentedFile()
-
-        for obj in iterator:
-            if isinstance(obj, MultilineComment):
-                if len(stack) == 0 and file.file_doc is None:
-                    file.file_doc = obj.value
-
-            elif isinstance(obj, DocumentedClass) or \
-                    isinstance(obj, DocumentedInterface) or \
-                    isinstance(obj, DocumentedEnum):
-                if len(stack) > 0:
-                    stack[-1].inner_classes.append(obj)
-                else:
-                    file.classes.append(obj)
-
-                stack.append(obj)
-
-            elif isinstance(obj, DocumentedProperty):
-                if len(stack) == 0:
-                    continue
-
-                if isinstance(stack[-1], DocumentedClass) or isinstance(stack[-1], DocumentedEnum):
-                    stack[-1].properties.append(obj)
-
-            elif isinstance(obj, DocumentedMethod):
-                if len(stack) == 0:
-                    continue
-
-                if isinstance(stack[-1], DocumentedClass) or \
-                        isinstance(stack[-1], DocumentedInterface) or \
-                        isinstance(stack[-1], DocumentedEnum):
-                    stack[-1].methods.append(obj)
-
-                if not obj.signature:
-                    stack.append(obj)
-
-            elif isinstance(obj, EnumValue):
-                if len(stack) == 0:
-                    continue
-
-                if isinstance(stack[-1], DocumentedEnum):
-                    stack[-1].values.append(obj.value)
-
-            elif isinstance(obj, Delimiter) and obj.char == '}':
-                try:
-                    stack.pop()
-                except IndexError:
-                    continue
-
-            elif isinstance(obj, Delimiter) and obj.char == '{':
-                stack.append(None)
-
-            elif isinstance(obj, PackageName):
-                file.package = obj.name
-
-            elif isinstance(obj, Imports):
-                file.imports.extend(obj.names)
-
-        return file
-
-    @staticmethod
-    def generate_data_objects(token_states):
-        obj = None
-        imports = Imports()
-        package = PackageName()
-        declaration = Declaration()
-
-        for state, tokens in token_states:
-            if state == 'ImportState':
-                if len(tokens) > 1:
-                    imports.add_name(tokens[1].value)
-
-            elif state == 'PackageState':
-                if len(tokens) > 1:
-                    package.name = tokens[1].value
-                    yield package
-                    package = PackageName()
-
-            elif state == 'DeclarationWithDocsState':
-                declaration.docs = tokens[0].value
-
-            elif state == 'DeclarationWithAnnotationsState':
-                declaration.annotations.extend([token.value for token in tokens])
-
-            elif state == 'DeclarationWithAccessModifiersState':
-                declaration.access_modifier = tokens[0].value
-
-            elif state == 'DeclarationWithModifiersState':
-                declaration.modifiers.extend([token.value for token in tokens])
-
-            elif state == 'MultilineCommentState':
-                yield MultilineComment(tokens[0].value)
-
-            # class
-
-            elif state == 'ClassState':
-                yield imports
-                imports = Imports()
-                obj = DocumentedClass.from_declaration(declaration)
-
-            elif state == 'ClassNameState':
-                obj.name = tokens[0].value
-
-            elif state == 'ClassExtendsState':
-                obj.extends = tokens[1].value
-
-            elif state == 'ClassImplementsListState':
-                obj.implements_list.extend([token.value for token in tokens[1:] if token.state != 'DelimiterState'])
-
-            elif state == 'ClassOpenBracketState':
-                yield obj
-                declaration = Declaration()
-
-            # enum
-
-            elif state == 'EnumState':
-                yield imports
-                imports = Imports()
-                obj = DocumentedEnum.from_declaration(declaration)
-
-            elif state == 'EnumNameState':
-                obj.name = tokens[0].value
-
-            elif state == 'EnumImplementsListState':
-                obj.implements_list.extend([token.value for token in tokens[1:] if token.state != 'DelimiterState'])
-
-            elif state == 'EnumValuesListState':
-                yield from (EnumValue(token.value) for token in tokens)
-
-            elif state == 'EnumOpenBracketState':
-                yield obj
-                declaration = Declaration()
-
-            # interface
-
-            elif state == 'InterfaceState':
-                yield imports
-                imports = Imports()
-                obj = DocumentedInterface.from_declaration(declaration)
-
-            elif state == 'InterfaceNameState':
-                obj.name = tokens[0].value
-
-            elif state == 'InterfaceExtendsListState':
-                obj.extends_list.extend([token.value for token in tokens[1:] if token.state != 'DelimiterState'])
-
-            elif state == 'InterfaceOpenBracketState':
-                yield obj
-                declaration = Declaration()
-
-            elif state == 'MethodOrPropertyTypeState':
-                declaration.type = tokens[0].value
-
-            elif state == 'MethodOrPropertyNameState':
-                declaration.name = tokens[0].value
-
-            # property
-
-            elif state == 'PropertyDelimiter':
-                obj = DocumentedProperty.from_declaration(declaration)
-                yield obj
-                declaration = Declaration()
-
-            # method
-
-            elif state == 'MethodArgumentsState':
-                obj = DocumentedMethod.from_declaration(declaration)
-                obj.args = DocumentedMethod.parse_method_args(tokens[0].value)
-
-            elif state == 'MethodPostArgumentsState':
-                obj.post_args = tokens
-                if tokens[0].value == 'throws':
-                    obj.throws = [token.value for token in tokens[1:] if token.state != 'DelimiterState']
-
-            elif state == 'InterfaceMethodDelimiter':
-                obj.signature = True
-                yield obj
-                declaration = Declaration()
-
-            elif state == 'MethodOpenBracketState':
-                yield obj
-                declaration = Declaration()
-
-            elif state == 'ClosedBracketState':
-                yield Delimiter(tokens[0].value)
-
-            elif state == 'OpenBracketState':
-                yield Delimiter(tokens[0].value)
-
-            elif state == 'DeadState':
-                declaration = Declaration()
-
-        return
+        return StructureBuilder().build(parser_fmt.parse(tokens))
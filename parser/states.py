@@ -1,43 +1,84 @@
-from collections import deque
-
 from lexer.states import State, SkipState
+from lexer.util import TokenKind
 from parser.fmt import TokenEvent
 
 
-class ParserInitialState(State):
+class ParserState(State):
+    """State whose transitions are looked up by token kind.
+
+    A transition is called with the state and the event, when it returns None `otherwise` decides.
+    """
+    __slots__ = ()
+
+    transitions = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = [cls.transitions.get(kind) for kind in TokenKind]
 
     def on_event(self, event: TokenEvent) -> 'State':
-        if event.token.state == 'JavadocState':
-            return DeclarationWithDocsState()
-        elif event.token.state == 'MultilineCommentState':
-            return MultilineCommentState()
-        elif event.token.state == 'AnnotationState':
-            return DeclarationWithAnnotationsState()
-        elif event.token.state == 'AccessModifierState':
-            return DeclarationWithAccessModifiersState()
-        elif event.token.state == 'ModifierState':
-            return DeclarationWithModifiersState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'class':
-            return ClassState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == '@interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'enum':
-            return EnumState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'import':
-            return ImportState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'package':
-            return PackageState()
-        elif event.token.state == 'NameState':
-            return MethodOrPropertyTypeState()
-        elif event.token.state == 'ClosedBracketState':
-            return ClosedBracketState()
-        elif event.token.state == 'OpenBracketState':
-            return OpenBracketState()
+        transition = self._dispatch[event.token.kind]
+        if transition is not None:
+            next_state = transition(self, event)
+            if next_state is not None:
+                return next_state
+
+        return self.otherwise(event)
 
+    def otherwise(self, event: TokenEvent) -> 'State':
         return DeadState()
 
+
+def _next_is_name(event: TokenEvent) -> bool:
+    return event.lookahead(1)[0].kind == TokenKind.NAME
+
+
+def _keyword(event: TokenEvent, keywords: dict):
+    next_state = keywords.get(event.token.value)
+    return next_state() if next_state is not None else None
+
+
+def _skip_to_list(event: TokenEvent, value: str, list_state: type):
+    if event.token.value == value and _next_is_name(event):
+        return SkipState(list_state())
+
+
+def _skip_list_delimiter(state: State, event: TokenEvent):
+    return _skip_to_list(event, ',', type(state))
+
+
+def _skip_multiline_comment(state: State, event: TokenEvent):
+    return SkipState(state, activate=True, as_state='MultilineCommentState')
+
+
+def _open_bracket(event: TokenEvent, next_state: type):
+    if event.token.value == '{':
+        return next_state()
+
+
+def _skip_interface_open_bracket(state: State, event: TokenEvent):
+    if event.token.value == '{':
+        return SkipState(ParserInitialState(), activate=True, as_state='InterfaceOpenBracketState')
+
+
+def _skip_method_delimiter(state: State, event: TokenEvent):
+    if event.token.value == ';':
+        return SkipState(ParserInitialState(), activate=True, as_state='InterfaceMethodDelimiter')
+
+
+class ParserInitialState(ParserState):
+    transitions = {
+        TokenKind.JAVADOC: lambda state, event: DeclarationWithDocsState(),
+        TokenKind.MULTILINE_COMMENT: lambda state, event: MultilineCommentState(),
+        TokenKind.ANNOTATION: lambda state, event: DeclarationWithAnnotationsState(),
+        TokenKind.ACCESS_MODIFIER: lambda state, event: DeclarationWithAccessModifiersState(),
+        TokenKind.MODIFIER: lambda state, event: DeclarationWithModifiersState(),
+        TokenKind.IDENTIFIER: lambda state, event: _keyword(event, INITIAL_KEYWORDS),
+        TokenKind.NAME: lambda state, event: MethodOrPropertyTypeState(),
+        TokenKind.CLOSED_BRACKET: lambda state, event: ClosedBracketState(),
+        TokenKind.OPEN_BRACKET: lambda state, event: OpenBracketState(),
+    }
+
     @property
     def type(self) -> str:
         return 'InitialState'
@@ -50,13 +91,13 @@ class ImportState(State):
         lookahead = event.lookahead(2)
         token = event.token
 
-        if token.state == 'ModifierState' and token.value == 'static':
+        if token.kind == TokenKind.MODIFIER and token.value == 'static':
             token = lookahead[0]
             lookahead = lookahead[1]
         else:
             lookahead = lookahead[0]
 
-        if token.state == 'NameState' and lookahead.state == 'DelimiterState' and lookahead.value == ';':
+        if token.kind == TokenKind.NAME and lookahead.kind == TokenKind.DELIMITER and lookahead.value == ';':
             return SkipState(ParserInitialState(), activate=True, skip_count=2, as_state=self.type)
 
         return DeadState()
@@ -66,213 +107,134 @@ class PackageState(State):
 
     def on_event(self, event) -> 'State':
         lookahead = event.lookahead(1)[0]
-        if event.token.state == 'NameState' and lookahead.state == 'DelimiterState' and lookahead.value == ';':
+        if event.token.kind == TokenKind.NAME and lookahead.kind == TokenKind.DELIMITER and lookahead.value == ';':
             return SkipState(ParserInitialState(), activate=True, skip_count=2, as_state=self.type)
 
         return DeadState()
 
 
-class DeclarationWithDocsState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'AnnotationState':
-            return DeclarationWithAnnotationsState()
-        elif event.token.state == 'AccessModifierState':
-            return DeclarationWithAccessModifiersState()
-        elif event.token.state == 'ModifierState':
-            return DeclarationWithModifiersState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'class':
-            return ClassState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == '@interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'enum':
-            return EnumState()
-        elif event.token.state == 'NameState':
-            return MethodOrPropertyTypeState()
+class DeclarationWithDocsState(ParserState):
+    transitions = {
+        TokenKind.ANNOTATION: lambda state, event: DeclarationWithAnnotationsState(),
+        TokenKind.ACCESS_MODIFIER: lambda state, event: DeclarationWithAccessModifiersState(),
+        TokenKind.MODIFIER: lambda state, event: DeclarationWithModifiersState(),
+        TokenKind.IDENTIFIER: lambda state, event: _keyword(event, DECLARATION_KEYWORDS),
+        TokenKind.NAME: lambda state, event: MethodOrPropertyTypeState(),
+    }
 
-        return DeadState()
 
+class DeclarationWithAnnotationsState(ParserState):
+    transitions = {
+        TokenKind.ANNOTATION: lambda state, event: state,
+        TokenKind.ACCESS_MODIFIER: lambda state, event: DeclarationWithAccessModifiersState(),
+        TokenKind.MODIFIER: lambda state, event: DeclarationWithModifiersState(),
+        TokenKind.IDENTIFIER: lambda state, event: _keyword(event, DECLARATION_KEYWORDS),
+        TokenKind.NAME: lambda state, event: MethodOrPropertyTypeState(),
+    }
 
-class DeclarationWithAnnotationsState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'AnnotationState':
-            return self
-        elif event.token.state == 'AccessModifierState':
-            return DeclarationWithAccessModifiersState()
-        elif event.token.state == 'ModifierState':
-            return DeclarationWithModifiersState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'class':
-            return ClassState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == '@interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'enum':
-            return EnumState()
-        elif event.token.state == 'NameState':
-            return MethodOrPropertyTypeState()
 
-        return DeadState()
+class DeclarationWithAccessModifiersState(ParserState):
+    transitions = {
+        TokenKind.MODIFIER: lambda state, event: DeclarationWithModifiersState(),
+        TokenKind.IDENTIFIER: lambda state, event: _keyword(event, DECLARATION_KEYWORDS),
+        TokenKind.NAME: lambda state, event: MethodOrPropertyTypeState(),
+    }
 
 
-class DeclarationWithAccessModifiersState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'ModifierState':
-            return DeclarationWithModifiersState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'class':
-            return ClassState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == '@interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'enum':
-            return EnumState()
-        elif event.token.state == 'NameState':
-            return MethodOrPropertyTypeState()
+class DeclarationWithModifiersState(ParserState):
+    transitions = {
+        TokenKind.MODIFIER: lambda state, event: state,
+        TokenKind.IDENTIFIER: lambda state, event: _keyword(event, DECLARATION_KEYWORDS),
+        TokenKind.NAME: lambda state, event: MethodOrPropertyTypeState(),
+    }
 
-        return DeadState()
 
+class EnumState(ParserState):
+    transitions = {
+        TokenKind.NAME: lambda state, event: EnumNameState(),
+    }
 
-class DeclarationWithModifiersState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'ModifierState':
-            return self
-        elif event.token.state == 'IdentifierState' and event.token.value == 'class':
-            return ClassState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == '@interface':
-            return InterfaceState()
-        elif event.token.state == 'IdentifierState' and event.token.value == 'enum':
-            return EnumState()
-        elif event.token.state == 'NameState':
-            return MethodOrPropertyTypeState()
 
-        return DeadState()
+class EnumNameState(ParserState):
+    transitions = {
+        TokenKind.IDENTIFIER: lambda state, event: _skip_to_list(event, 'implements', ClassImplementsListState),
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, EnumOpenBracketState),
+    }
 
 
-class EnumState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'NameState':
-            return EnumNameState()
+class EnumImplementsState(ParserState):
+    transitions = {
+        TokenKind.IDENTIFIER: lambda state, event: _skip_to_list(event, 'implements', EnumImplementsListState),
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, EnumOpenBracketState),
+    }
 
-        return DeadState()
 
+class EnumImplementsListState(ParserState):
+    transitions = {
+        TokenKind.DELIMITER: _skip_list_delimiter,
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, EnumOpenBracketState),
+    }
 
-class EnumNameState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'IdentifierState':
-            if event.token.value == 'implements':
-                if event.lookahead(1)[0].state == 'NameState':
-                    return SkipState(ClassImplementsListState())
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return EnumOpenBracketState()
 
-        return DeadState()
+class EnumOpenBracketState(ParserState):
+    transitions = {
+        TokenKind.NAME: lambda state, event: EnumValuesListState(),
+    }
 
 
-class EnumImplementsState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'IdentifierState' and event.token.value == 'implements':
-            if event.lookahead(1)[0].state == 'NameState':
-                return SkipState(EnumImplementsListState())
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return EnumOpenBracketState()
+def _enum_values_delimiter(state: State, event: TokenEvent):
+    if event.token.value == ';':
+        return SkipState(ParserInitialState(), activate=True, as_state='EnumValuesDelimiter')
 
-        return DeadState()
+    return _skip_list_delimiter(state, event)
 
 
-class EnumImplementsListState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'DelimiterState' and event.token.value == ',':
-            if event.lookahead(1)[0].state == 'NameState':
-                return SkipState(self)
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return EnumOpenBracketState()
+class EnumValuesListState(ParserState):
+    transitions = {
+        TokenKind.DELIMITER: _enum_values_delimiter,
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, OpenBracketState),
+    }
 
-        return DeadState()
 
+class ClassState(ParserState):
+    transitions = {
+        TokenKind.NAME: lambda state, event: ClassNameState(),
+    }
 
-class EnumOpenBracketState(State):
 
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'NameState':
-            return EnumValuesListState()
+def _class_extends_or_implements(state: State, event: TokenEvent):
+    if event.token.value == 'extends' and _next_is_name(event):
+        return SkipState(ClassImplementsState(), activate=True, skip_count=2, as_state='ClassExtendsState')
 
-        return DeadState()
+    return _skip_to_list(event, 'implements', ClassImplementsListState)
 
 
-class EnumValuesListState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'DelimiterState' and event.token.value == ',':
-            if event.lookahead(1)[0].state == 'NameState':
-                return SkipState(self)
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return OpenBracketState()
-        elif event.token.state == 'DelimiterState' and event.token.value == ';':
-            return SkipState(ParserInitialState(), activate=True, as_state='EnumValuesDelimiter')
-
-        return DeadState()
+class ClassNameState(ParserState):
+    transitions = {
+        TokenKind.IDENTIFIER: _class_extends_or_implements,
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, ClassOpenBracketState),
+    }
 
 
-class ClassState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'NameState':
-            return ClassNameState()
+class ClassImplementsState(ParserState):
+    transitions = {
+        TokenKind.IDENTIFIER: lambda state, event: _skip_to_list(event, 'implements', ClassImplementsListState),
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, ClassOpenBracketState),
+    }
 
-        return DeadState()
 
-
-class ClassNameState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'IdentifierState':
-            if event.token.value == 'extends':
-                if event.lookahead(1)[0].state == 'NameState':
-                    return SkipState(ClassImplementsState(), activate=True, skip_count=2, as_state='ClassExtendsState')
-            elif event.token.value == 'implements':
-                if event.lookahead(1)[0].state == 'NameState':
-                    return SkipState(ClassImplementsListState())
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return ClassOpenBracketState()
-
-        return DeadState()
-
-
-class ClassImplementsState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'IdentifierState' and event.token.value == 'implements':
-            if event.lookahead(1)[0].state == 'NameState':
-                return SkipState(ClassImplementsListState())
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return ClassOpenBracketState()
-
-        return DeadState()
-
-
-class ClassImplementsListState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'DelimiterState' and event.token.value == ',':
-            if event.lookahead(1)[0].state == 'NameState':
-                return SkipState(self)
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return ClassOpenBracketState()
-
-        return DeadState()
+class ClassImplementsListState(ParserState):
+    transitions = {
+        TokenKind.DELIMITER: _skip_list_delimiter,
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, ClassOpenBracketState),
+    }
 
 
 class ClassOpenBracketState(State):
@@ -281,122 +243,110 @@ class ClassOpenBracketState(State):
         return ParserInitialState().on_event(event)
 
 
-class MethodOrPropertyTypeState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'NameState':
-            return MethodOrPropertyNameState()
+class MethodOrPropertyTypeState(ParserState):
+    transitions = {
+        TokenKind.NAME: lambda state, event: MethodOrPropertyNameState(),
+    }
 
-        return DeadState()
 
+def _skip_property_delimiter(state: State, event: TokenEvent):
+    if event.token.value in ('=', ';'):
+        return SkipState(ParserInitialState(), activate=True, as_state='PropertyDelimiter')
 
-class MethodOrPropertyNameState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'ArgumentsParenthesisState':
-            return MethodArgumentsState()
-        elif event.token.state == 'DelimiterState':
-            if event.token.value in ['=', ';']:
-                return SkipState(ParserInitialState(), activate=True, as_state='PropertyDelimiter')
-
-        return DeadState()
 
+class MethodOrPropertyNameState(ParserState):
+    transitions = {
+        TokenKind.ARGUMENTS_PARENTHESIS: lambda state, event: MethodArgumentsState(),
+        TokenKind.DELIMITER: _skip_property_delimiter,
+    }
 
-class MethodArgumentsState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'ModifierState':
-            if event.token.value in ['throws', 'default']:
-                return MethodPostArgumentsState()
 
-        elif event.token.state == 'DelimiterState' and event.token.value == ';':
-            return SkipState(ParserInitialState(), activate=True, as_state='InterfaceMethodDelimiter')
+def _method_post_arguments(state: State, event: TokenEvent):
+    if event.token.value in ('throws', 'default'):
+        return MethodPostArgumentsState()
 
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
 
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return MethodOpenBracketState()
-
-        return DeadState()
+class MethodArgumentsState(ParserState):
+    transitions = {
+        TokenKind.MODIFIER: _method_post_arguments,
+        TokenKind.DELIMITER: _skip_method_delimiter,
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, MethodOpenBracketState),
+    }
 
 
-class MethodPostArgumentsState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'DelimiterState' and event.token.value == ';':
-            return SkipState(ParserInitialState(), activate=True, as_state='InterfaceMethodDelimiter')
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return MethodOpenBracketState()
+class MethodPostArgumentsState(ParserState):
+    transitions = {
+        TokenKind.DELIMITER: _skip_method_delimiter,
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: lambda state, event: _open_bracket(event, MethodOpenBracketState),
+    }
 
+    def otherwise(self, event) -> 'State':
         return self
 
 
-class InterfaceState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'NameState':
-            return InterfaceNameState()
+class InterfaceState(ParserState):
+    transitions = {
+        TokenKind.NAME: lambda state, event: InterfaceNameState(),
+    }
 
-        return DeadState()
 
+class InterfaceNameState(ParserState):
+    transitions = {
+        TokenKind.IDENTIFIER: lambda state, event: _skip_to_list(event, 'extends', InterfaceExtendsListState),
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: _skip_interface_open_bracket,
+    }
 
-class InterfaceNameState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'IdentifierState':
-            if event.token.value == 'extends':
-                if event.lookahead(1)[0].state == 'NameState':
-                    return SkipState(InterfaceExtendsListState())
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return SkipState(ParserInitialState(), activate=True, as_state='InterfaceOpenBracketState')
-
-        return DeadState()
 
+class InterfaceExtendsListState(ParserState):
+    transitions = {
+        TokenKind.DELIMITER: _skip_list_delimiter,
+        TokenKind.MULTILINE_COMMENT: _skip_multiline_comment,
+        TokenKind.OPEN_BRACKET: _skip_interface_open_bracket,
+    }
 
-class InterfaceExtendsListState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'DelimiterState' and event.token.value == ',':
-            if event.lookahead(1)[0].state == 'NameState':
-                return SkipState(self)
-        elif event.token.state == 'MultilineCommentState':
-            return SkipState(self, activate=True, as_state='MultilineCommentState')
-        elif event.token.state == 'OpenBracketState' and event.token.value == '{':
-            return SkipState(ParserInitialState(), activate=True, as_state='InterfaceOpenBracketState')
 
-        return DeadState()
+class MethodOpenBracketState(ParserState):
+    transitions = {
+        TokenKind.CLOSED_BRACKET: lambda state, event: ClosedBracketState(),
+    }
 
+    def otherwise(self, event) -> 'State':
+        return MethodBodyState(0)
 
-class MethodOpenBracketState(State):
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'ClosedBracketState':
-            return ClosedBracketState()
 
-        return MethodBodyState()
+def _close_method_body(state: 'MethodBodyState', event: TokenEvent):
+    if state.depth == 0:
+        return ClosedBracketState()
 
+    return MethodBodyState(state.depth - 1)
 
-class MethodBodyState(State):
 
-    def __init__(self):
-        self.stack = deque()
+class MethodBodyState(ParserState):
+    __slots__ = ('depth',)
 
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'OpenBracketState':
-            self.stack.append('{')
-        elif event.token.state == 'ClosedBracketState':
-            if len(self.stack) == 0:
-                return ClosedBracketState()
+    transitions = {
+        TokenKind.OPEN_BRACKET: lambda state, event: MethodBodyState(state.depth + 1),
+        TokenKind.CLOSED_BRACKET: _close_method_body,
+    }
 
-            self.stack.pop()
+    def __init__(self, depth: int):
+        self.depth = depth
 
+    def otherwise(self, event) -> 'State':
         return self
 
 
-class ClosedBracketState(State):
+class ClosedBracketState(ParserState):
     separated = True
 
-    def on_event(self, event) -> 'State':
-        if event.token.state == 'DelimiterState' and event.token.value == ',':
-            if event.lookahead(1)[0].state == 'NameState':
-                return SkipState(EnumValuesListState())
+    transitions = {
+        TokenKind.DELIMITER: lambda state, event: _skip_to_list(event, ',', EnumValuesListState),
+    }
+
+    def otherwise(self, event) -> 'State':
         return ParserInitialState().on_event(event)
 
 
@@ -416,3 +366,16 @@ class MultilineCommentState(State):
 class DeadState(State):
     def on_event(self, event):
         return None
+
+
+DECLARATION_KEYWORDS = {
+    'class': ClassState,
+    'interface': InterfaceState,
+    '@interface': InterfaceState,
+    'enum': EnumState,
+}
+
+INITIAL_KEYWORDS = dict(DECLARATION_KEYWORDS, **{
+    'import': ImportState,
+    'package': PackageState,
+})
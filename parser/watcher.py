@@ -0,0 +1,131 @@
+import os
+import time
+import traceback
+
+from page.generator import PageGenerator
+from page.layout import PageLayout
+from parser.parser import Parser
+from util.source_reader import DEFAULT_FALLBACK_ENCODING
+from util.util import SymbolIndex
+
+
+class Watcher:
+    """Keeps parsed files in memory and regenerates pages of sources whose stat changed."""
+
+    def __init__(self, input_path: str, output_dir: str, project_name: str = None, project_version: str = None,
+                 verbose: bool = False, shallow: bool = False, lexer: str = 'fsm', interval: float = 0.5,
+                 fallback_encoding: str = DEFAULT_FALLBACK_ENCODING, asset_mode: str = 'copy',
+                 minified_assets: bool = False, split_members: int = None):
+        self.input_path = input_path
+        self.output_dir = output_dir
+        self.project_name = project_name if project_name is not None else input_path
+        self.project_version = project_version
+        self.verbose = verbose
+        self.shallow = shallow
+        self.lexer = lexer
+        self.interval = interval
+        self.fallback_encoding = fallback_encoding
+        self.asset_mode = asset_mode
+        self.minified_assets = minified_assets
+        self.layout = PageLayout(split_members)
+
+        self._stats = {}
+        self._documented_files = {}
+        self._structure = None
+
+    def run(self):
+        self.rebuild()
+        print('watching', self.input_path)
+
+        try:
+            while True:
+                time.sleep(self.interval)
+                self.rebuild()
+        except KeyboardInterrupt:
+            pass
+
+    def rebuild(self) -> int:
+        """Regenerates pages affected by changes since the last call, returns the number of changed sources."""
+        started = time.perf_counter()
+
+        tree = Parser.generate_tree(self.input_path, self.shallow)
+        root_path = tree.directory
+
+        source_files = []
+        tree.traverse(source_files.append)
+
+        stats = {}
+        for source_file in source_files:
+            try:
+                stat = os.stat(source_file.file_path)
+            except FileNotFoundError:
+                continue
+            stats[source_file.file_path] = (stat.st_mtime_ns, stat.st_size)
+
+        changed = [source_file for source_file in source_files if source_file.file_path in stats
+                   and self._stats.get(source_file.file_path) != stats[source_file.file_path]]
+        removed = [file_path for file_path in self._stats if file_path not in stats]
+
+        if not changed and not removed:
+            return 0
+
+        for source_file in changed:
+            try:
+                self._documented_files[source_file.file_path] = Parser.parse_source_file(
+                    source_file, root_path, self.lexer, self.fallback_encoding)
+                if self.verbose:
+                    print('read', source_file.file_path)
+            except Exception:
+                # keep the previous version of the page, files that never parsed are retried on the next poll
+                print('failed to parse', source_file.file_path)
+                traceback.print_exc()
+                if source_file.file_path not in self._documented_files:
+                    stats.pop(source_file.file_path)
+
+        for file_path in removed:
+            documented_file = self._documented_files.pop(file_path, None)
+            if documented_file is not None:
+                PageGenerator.remove_file(documented_file.file_path, self.output_dir)
+
+        self._stats = stats
+
+        for node in self._nodes(tree):
+            node.files = [self._documented_files[file.file_path] for file in node.files
+                          if file.file_path in self._documented_files]
+
+        file_list = []
+        tree.traverse(file_list.append)
+
+        # link targets include classes declared in other files
+        structure = ([(documented_file.file_path, documented_file.package) for documented_file in file_list],
+                     SymbolIndex(file_list, self.layout).link_targets())
+        if structure != self._structure:
+            if self._structure is None:
+                PageGenerator.copy_resources(self.output_dir, self.asset_mode, self.minified_assets, self.verbose)
+
+            # sidebar and link targets changed, every page has to be regenerated
+            self._structure = structure
+            pages = file_list
+            PageGenerator.create_package_structure(tree, self.output_dir)
+            PageGenerator.create_index_page(tree, list(file_list), self.project_name, self.project_version,
+                                            self.output_dir)
+        else:
+            pages = [self._documented_files[source_file.file_path] for source_file in changed
+                     if source_file.file_path in self._documented_files]
+
+        PageGenerator.create_files(file_list, self.output_dir, pages=pages, layout=self.layout)
+        PageGenerator.create_package_summaries(file_list, self.output_dir, self.layout)
+        PageGenerator.create_search_index(file_list, self.output_dir, self.layout)
+
+        print('regenerated {} of {} pages in {:.3f} s'.format(len(pages), len(file_list),
+                                                              time.perf_counter() - started))
+
+        return len(changed) + len(removed)
+
+    @staticmethod
+    def _nodes(tree):
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children)
@@ -0,0 +1,98 @@
+(function () {
+    const input = document.getElementById("search-input");
+    const results = document.getElementById("search-results");
+    if (input === null || results === null) {
+        return;
+    }
+
+    const root = input.dataset.root;
+    const limit = 20;
+    let index = null;
+    let requested = false;
+
+    // called by search_index.js, names are front-coded and sorted by their lower-cased form
+    window.searchIndexLoaded = function (data) {
+        const names = new Array(data.symbols.length);
+        const keys = new Array(data.symbols.length);
+
+        let name = "";
+        for (let i = 0; i < data.symbols.length; i++) {
+            name = name.substring(0, data.symbols[i][0]) + data.symbols[i][1];
+            names[i] = name;
+            keys[i] = name.toLowerCase();
+        }
+
+        index = {data: data, names: names, keys: keys};
+        search();
+    };
+
+    function load() {
+        if (requested) {
+            return;
+        }
+        requested = true;
+
+        const script = document.createElement("script");
+        script.src = root + "/search_index.js";
+        document.head.appendChild(script);
+    }
+
+    function anchor(i) {
+        const entry = index.data.symbols[i];
+        const container = entry[4] >= 0 ? index.data.containers[entry[4]] + "." : "";
+
+        // classes, interfaces and enums are the first three kinds
+        if (entry[2] < 3) {
+            return container + index.names[i].replace(/<.*>/, "");
+        }
+        return container + index.names[i] + (entry[5] || "");
+    }
+
+    function lowerBound(query) {
+        let low = 0;
+        let high = index.keys.length;
+
+        while (low < high) {
+            const middle = (low + high) >>> 1;
+            if (index.keys[middle] < query) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        return low;
+    }
+
+    function search() {
+        results.textContent = "";
+
+        const query = input.value.trim().toLowerCase();
+        if (index === null || query.length === 0) {
+            return;
+        }
+
+        for (let i = lowerBound(query); i < index.keys.length && index.keys[i].startsWith(query)
+        && results.childElementCount < limit; i++) {
+            const entry = index.data.symbols[i];
+
+            const link = document.createElement("a");
+            link.className = "list-group-item list-group-item-action";
+            link.href = root + "/" + index.data.pages[entry[3]] + "#" + encodeURIComponent(anchor(i));
+            link.textContent = index.names[i] + (entry[5] || "");
+
+            const kind = document.createElement("small");
+            kind.className = "text-black-50 ml-2";
+            kind.textContent = index.data.kinds[entry[2]]
+                + (entry[4] >= 0 ? " in " + index.data.containers[entry[4]] : "");
+            link.appendChild(kind);
+
+            results.appendChild(link);
+        }
+    }
+
+    input.addEventListener("focus", load);
+    input.addEventListener("input", function () {
+        load();
+        search();
+    });
+})();
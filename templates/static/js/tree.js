@@ -0,0 +1,78 @@
+(function () {
+    const container = document.getElementById("package-structure");
+    const current = decodeURIComponent(window.location.hash.substring(1));
+    let selected = null;
+
+    // called by package_manifest.js, a package is [name, file paths, packages]
+    window.packageStructureLoaded = function (root) {
+        container.appendChild(renderPackage(root, current.split("/").slice(0, -1), true));
+
+        if (selected !== null) {
+            selected.scrollIntoView({block: "center"});
+        }
+    };
+
+    function fileName(filePath) {
+        return filePath.split("/").pop().split(".")[0];
+    }
+
+    // items of a package are only created the first time it is expanded
+    function renderPackage(node, path, expanded) {
+        const tree = document.createElement("div");
+        tree.className = "tree";
+
+        const label = document.createElement("span");
+        label.className = "list-group-item package-item";
+        label.textContent = node[0];
+
+        const nested = document.createElement("div");
+        nested.className = "list-group nested";
+
+        tree.appendChild(label);
+        tree.appendChild(nested);
+
+        let materialized = false;
+
+        function expand() {
+            if (!materialized) {
+                materialized = true;
+
+                for (const filePath of node[1]) {
+                    const item = document.createElement("a");
+                    item.href = filePath + ".html";
+                    item.textContent = fileName(filePath);
+
+                    if (filePath === current) {
+                        item.className = "list-group-item text-primary";
+                        selected = item;
+                    } else {
+                        item.className = "list-group-item text-secondary";
+                    }
+                    nested.appendChild(item);
+                }
+
+                for (const child of node[2]) {
+                    const onPath = path !== null && path.length > 0 && path[0] === child[0];
+                    nested.appendChild(renderPackage(child, onPath ? path.slice(1) : null, onPath));
+                }
+            }
+
+            nested.classList.add("active");
+            label.classList.add("arrow-down");
+        }
+
+        label.addEventListener("click", function () {
+            if (nested.classList.contains("active")) {
+                nested.classList.remove("active");
+                label.classList.remove("arrow-down");
+            } else {
+                expand();
+            }
+        });
+
+        if (expanded) {
+            expand();
+        }
+        return tree;
+    }
+})();
@@ -0,0 +1,91 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from page.assets import AssetSync
+
+
+class TestAssetSync(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.tmp.name, 'static')
+        self.target_dir = os.path.join(self.tmp.name, 'out', 'static')
+
+        for rel_path, contents in [('css/bootstrap.css', 'a {}'), ('css/bootstrap.min.css', 'a{}'),
+                                   ('css/bootstrap.css.map', '{}'), ('css/styles.css', 'b {}'),
+                                   ('js/search.js', 'c()'), ('js/tree.js', 'd()')]:
+            os.makedirs(os.path.dirname(os.path.join(self.source_dir, rel_path)), exist_ok=True)
+            with open(os.path.join(self.source_dir, rel_path), 'w') as file:
+                file.write(contents)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def target(self, rel_path: str) -> str:
+        return os.path.join(self.target_dir, rel_path)
+
+    def read(self, file_path: str) -> str:
+        with open(file_path) as file:
+            return file.read()
+
+    def test_copy_skips_identical_files(self):
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir), (6, 0))
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir), (0, 6))
+
+        # same contents with a different mtime is not copied again
+        os.utime(self.target('css/styles.css'), (0, 0))
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir), (0, 6))
+        self.assertEqual(os.stat(self.target('css/styles.css')).st_mtime_ns,
+                         os.stat(os.path.join(self.source_dir, 'css/styles.css')).st_mtime_ns)
+
+        with open(self.target('css/styles.css'), 'w') as file:
+            file.write('c {}')
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir), (1, 5))
+        self.assertEqual(self.read(self.target('css/styles.css')), 'b {}')
+
+    def test_hardlink(self):
+        AssetSync.sync(self.source_dir, self.target_dir, 'hardlink')
+
+        self.assertTrue(os.path.samefile(self.target('css/styles.css'),
+                                         os.path.join(self.source_dir, 'css/styles.css')))
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir, 'hardlink'), (0, 6))
+
+        # switching back to copies must not write through the links
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir, 'copy'), (6, 0))
+        self.assertFalse(os.path.samefile(self.target('css/styles.css'),
+                                          os.path.join(self.source_dir, 'css/styles.css')))
+
+    def test_symlink(self):
+        AssetSync.sync(self.source_dir, self.target_dir, 'symlink')
+
+        self.assertTrue(os.path.islink(self.target('css/styles.css')))
+        self.assertEqual(self.read(self.target('css/styles.css')), 'b {}')
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir, 'symlink'), (0, 6))
+
+    def test_hardlink_fallback_to_copy(self):
+        with mock.patch('os.link', side_effect=OSError('cross-device link')):
+            self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir, 'hardlink'), (6, 0))
+            self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir, 'hardlink'), (0, 6))
+
+        self.assertFalse(os.path.samefile(self.target('css/styles.css'),
+                                          os.path.join(self.source_dir, 'css/styles.css')))
+
+    def test_minified(self):
+        self.assertEqual(AssetSync.list_minified_assets(self.source_dir), {
+            os.path.join('css', 'bootstrap.css'): os.path.join('css', 'bootstrap.min.css'),
+            os.path.join('css', 'styles.css'): os.path.join('css', 'styles.css'),
+            os.path.join('js', 'search.js'): os.path.join('js', 'search.js'),
+            os.path.join('js', 'tree.js'): os.path.join('js', 'tree.js'),
+        })
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir, minified=True), (4, 0))
+
+        self.assertEqual(sorted(os.listdir(self.target('css'))), ['bootstrap.css', 'styles.css'])
+        self.assertEqual(self.read(self.target('css/bootstrap.css')), 'a{}')
+
+    def test_switch_to_minified_removes_full_assets(self):
+        AssetSync.sync(self.source_dir, self.target_dir)
+        self.assertEqual(AssetSync.sync(self.source_dir, self.target_dir, minified=True), (1, 3))
+
+        self.assertEqual(sorted(os.listdir(self.target('css'))), ['bootstrap.css', 'styles.css'])
+        self.assertEqual(self.read(self.target('css/bootstrap.css')), 'a{}')
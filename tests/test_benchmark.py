@@ -0,0 +1,167 @@
+import filecmp
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmark import JAVA_SOURCE, generate_synthetic_tree, generate_documented_files, template_arguments, \
+    render_by_splicing, render_doc_string_by_splicing, record_states, measure_page_memory, measure_model_memory, \
+    measure_sidebar, measure_split_pages, measure_parse_memory
+from lexer.fmt import FiniteStateMachine
+from lexer.states import InitialState
+from page.generator import PageGenerator
+from page.javadoc import DocTemplate
+from page.search import SearchIndex
+from parser.fmt import ParserFiniteStateMachine
+from parser.parser import Parser
+from parser.states import ParserInitialState
+from util.source_reader import SourceReader
+from util.util import SymbolIndex
+
+
+class TestBenchmark(TestCase):
+
+    def test_state_allocations_per_kb(self):
+        allocated = []
+
+        for copies in [1, 10]:
+            source = JAVA_SOURCE * copies
+            kb = len(source) / 1024
+
+            lexer_recorder, parser_recorder = record_states(source)
+            allocated.append((lexer_recorder.allocated, parser_recorder.allocated))
+
+        # shared states: the number of distinct state objects does not grow with the source size
+        self.assertEqual(allocated[0], allocated[1])
+        self.assertLess(allocated[1][0] / kb, 10)
+        self.assertLess(allocated[1][1] / kb, 10)
+
+    def test_parallel_page_rendering(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root_path = generate_synthetic_tree(os.path.join(tmp, 'src'), packages=3, files_per_package=5)
+
+            tree = Parser._generate_tree_from_list(Parser._list_files_hierarchy(root_path, False))
+            Parser._parse_tree(tree, root_path, 'fsm', False, 1)
+
+            file_list = []
+            tree.traverse(file_list.append)
+
+            for jobs in [1, 4]:
+                PageGenerator.create_files(file_list, os.path.join(tmp, 'out{}'.format(jobs)), jobs)
+
+            self.assertDirectoriesEqual(os.path.join(tmp, 'out1'), os.path.join(tmp, 'out4'))
+
+    def assertDirectoriesEqual(self, left: str, right: str):
+        comparison = filecmp.dircmp(left, right)
+        self.assertEqual(comparison.left_only + comparison.right_only, [])
+
+        _, mismatch, errors = filecmp.cmpfiles(left, right, comparison.common_files, shallow=False)
+        self.assertEqual(mismatch + errors, [])
+
+        for subdir in comparison.common_dirs:
+            self.assertDirectoriesEqual(os.path.join(left, subdir), os.path.join(right, subdir))
+
+    def test_template_render_matches_splicing(self):
+        arguments = template_arguments(100000)
+
+        for name, kwargs in arguments.items():
+            template = PageGenerator.templates.get(name)
+            self.assertEqual(template.render(**kwargs), render_by_splicing(template, **kwargs))
+
+    def test_streaming_page_peak_memory(self):
+        page_size, streaming_peak, _ = measure_page_memory(3000)
+        self.assertLess(streaming_peak, page_size / 4)
+
+    def test_source_reading_matches_decoding(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root_path = generate_synthetic_tree(os.path.join(tmp, 'src'), packages=2, files_per_package=5)
+            with open(os.path.join(root_path, 'Large.java'), 'w', encoding='utf-8') as file:
+                file.write(JAVA_SOURCE.replace('Sample', 'Próbka') * 2000)
+
+            file_paths = [os.path.join(directory, file) for directory, _, files in os.walk(root_path) for file in files]
+            for file_path in file_paths:
+                with open(file_path, 'rb') as file:
+                    self.assertEqual(SourceReader.read(file_path), file.read().decode('utf-8'))
+
+    def test_data_model_memory(self):
+        slotted, dict_backed = measure_model_memory(200)
+        self.assertLess(slotted, dict_backed)
+
+    def test_doc_string_rendering_matches_splicing(self):
+        documented_file = Parser.parse_structure(JAVA_SOURCE)
+        documented_file.file_path = 'org/example/core/Sample.java'
+        symbol_index = SymbolIndex([documented_file])
+
+        # inherited and boilerplate comments repeat, every tenth one is distinct
+        docs = ['/**\n * Returns the {{@code value}} of {{@link Base}} number {0}.\n *\n * @param x the x\n */'.format(
+            i % 10 if i % 10 else i) for i in range(100)]
+
+        hits = DocTemplate.compile.cache_info().hits
+        rendered = [PageGenerator.render_doc_string(doc, documented_file, symbol_index) for doc in docs]
+
+        self.assertEqual(rendered, [render_doc_string_by_splicing(doc, documented_file, symbol_index) for doc in docs])
+        self.assertGreaterEqual(DocTemplate.compile.cache_info().hits - hits, 100 - len(set(docs)))
+
+    def test_documented_class_rendering(self):
+        methods = ''.join('''
+    /**
+     * Returns the {{@code value}} number {0}. Uses {{@link Base}}.
+     *
+     * @param x the x
+     * @return the value
+     */
+    public int value{0}(int x) {{ return x; }}
+'''.format(i) for i in range(500))
+        documented_file = Parser.parse_structure('package org.example;\nclass Documented {' + methods + '}\n')
+        documented_file.file_path = 'org/example/Documented.java'
+        symbol_index = SymbolIndex([documented_file])
+
+        page = PageGenerator.render_file(documented_file, symbol_index)
+        templates = [method.javadoc.template for method in documented_file.classes[0].methods]
+        hits, misses = DocTemplate.compile.cache_info()[:2]
+        self.assertNotIn(None, templates)
+
+        # comments compiled for the first page are kept on the model, a repeated render does not compile them again
+        self.assertEqual(PageGenerator.render_file(documented_file, symbol_index), page)
+        for method, template in zip(documented_file.classes[0].methods, templates):
+            self.assertIs(method.javadoc.template, template)
+        self.assertEqual(DocTemplate.compile.cache_info()[:2], (hits, misses))
+
+    def test_search_index_size(self):
+        file_list = generate_documented_files(1000)
+        data = json.dumps(SearchIndex.build(file_list), separators=(',', ':'))
+
+        symbols = len(file_list) * 100
+        self.assertLess(len(data) / symbols, 32)
+
+    def test_sidebar_size(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            small_page, _ = measure_sidebar(os.path.join(tmp, 'small'), 2)
+            large_page, _ = measure_sidebar(os.path.join(tmp, 'large'), 20)
+
+        self.assertEqual(small_page, large_page)
+
+    def test_split_page_size(self):
+        (_, page_size), (_, split_page_size) = measure_split_pages(400, 100)
+
+        # the page of the outer class still links every inner class
+        self.assertLess(split_page_size * 5, page_size)
+
+    def test_streaming_parse_peak_memory(self):
+        staged_peak, streamed_peak = measure_parse_memory(200)
+        self.assertLess(streamed_peak, staged_peak)
+
+    def test_parser_dispatch_partition(self):
+        lexer_fmt = FiniteStateMachine(InitialState())
+        lexer_fmt.process_string('package a;\nclass C extends B { int x; void f(int y) { } }\n')
+
+        parser_fmt = ParserFiniteStateMachine(ParserInitialState())
+        parser_fmt.process_tokens(lexer_fmt.partition.exclude('WhitespaceState', 'InitialState'))
+
+        self.assertEqual([(state, [token.value for token in tokens]) for state, tokens in parser_fmt.partition], [
+            ('InitialState', []), ('PackageState', ['package', 'a', ';']), ('ClassState', ['class']),
+            ('ClassNameState', ['C']), ('ClassExtendsState', ['extends', 'B']), ('ClassOpenBracketState', ['{']),
+            ('MethodOrPropertyTypeState', ['int']), ('MethodOrPropertyNameState', ['x']),
+            ('PropertyDelimiter', [';']), ('MethodOrPropertyTypeState', ['void']),
+            ('MethodOrPropertyNameState', ['f']), ('MethodArgumentsState', ['(int y)']),
+            ('MethodOpenBracketState', ['{']), ('ClosedBracketState', ['}']), ('ClosedBracketState', ['}'])])
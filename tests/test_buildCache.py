@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from parser.parser import Parser
+from util.cache import BuildCache
+from util.util import SourceFile, DocumentedFile
+
+
+class TestBuildCache(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.tmp, 'src')
+        self.output_dir = os.path.join(self.tmp, 'out')
+        shutil.copytree('tests/testdata/Java', self.source_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_lookup_unchanged_file(self):
+        Parser.parse(self.source_dir, self.output_dir)
+
+        source_file = SourceFile(os.path.join(self.source_dir, 'org/example/util/Maps.java'))
+        cached = BuildCache(self.output_dir).lookup(source_file, self.source_dir)
+
+        self.assertIsInstance(cached, DocumentedFile)
+        self.assertEqual(cached.file_path, 'org/example/util/Maps.java')
+
+    def test_lookup_changed_file(self):
+        Parser.parse(self.source_dir, self.output_dir)
+
+        source_file = SourceFile(os.path.join(self.source_dir, 'org/example/util/Maps.java'))
+        with open(source_file.file_path, 'a') as file:
+            file.write('// changed\n')
+
+        self.assertIs(BuildCache(self.output_dir).lookup(source_file, self.source_dir), source_file)
+
+    def test_lookup_with_other_parse_settings(self):
+        Parser.parse(self.source_dir, self.output_dir)
+
+        source_file = SourceFile(os.path.join(self.source_dir, 'org/example/util/Maps.java'))
+        self.assertIsInstance(BuildCache(self.output_dir, 'fsm').lookup(source_file, self.source_dir), DocumentedFile)
+        self.assertIs(BuildCache(self.output_dir, 'regex').lookup(source_file, self.source_dir), source_file)
+        self.assertIs(BuildCache(self.output_dir, fallback_encoding='cp1252').lookup(source_file, self.source_dir),
+                      source_file)
+
+    def test_only_changed_pages_are_rewritten(self):
+        Parser.parse(self.source_dir, self.output_dir)
+
+        changed_page = os.path.join(self.output_dir, 'org/example/util/Maps.java.html')
+        unchanged_page = os.path.join(self.output_dir, 'org/example/core/Circle.java.html')
+        for page in [changed_page, unchanged_page]:
+            os.utime(page, (0, 0))
+
+        with open(os.path.join(self.source_dir, 'org/example/util/Maps.java'), 'a') as file:
+            file.write('class MapsHelper {}\n')
+        Parser.parse(self.source_dir, self.output_dir)
+
+        self.assertNotEqual(os.path.getmtime(changed_page), 0)
+        self.assertEqual(os.path.getmtime(unchanged_page), 0)
+
+    def test_declared_class_invalidates_linking_pages(self):
+        with open(os.path.join(self.source_dir, 'org/example/core/User.java'), 'w') as file:
+            file.write('package org.example.core;\n\npublic class User extends AbstractShape.Inner {}\n')
+        Parser.parse(self.source_dir, self.output_dir)
+
+        shape_path = os.path.join(self.source_dir, 'org/example/core/AbstractShape.java')
+        with open(shape_path) as file:
+            source = file.read()
+        with open(shape_path, 'w') as file:
+            file.write(source[:source.rindex('}')] + '    public static class Inner {}\n}\n')
+        Parser.parse(self.source_dir, self.output_dir)
+
+        with open(os.path.join(self.output_dir, 'org/example/core/User.java.html')) as file:
+            page = file.read()
+        self.assertIn('<a class="" href="AbstractShape.java.html#AbstractShape.Inner">Inner</a>', page)
+
+    def test_removed_file_invalidates_all_pages(self):
+        Parser.parse(self.source_dir, self.output_dir)
+
+        fingerprint = BuildCache(self.output_dir).pages['org/example/core/Circle.java']
+
+        os.remove(os.path.join(self.source_dir, 'org/example/util/Maps.java'))
+        Parser.parse(self.source_dir, self.output_dir)
+
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'org/example/util/Maps.java.html')))
+        self.assertNotEqual(BuildCache(self.output_dir).pages['org/example/core/Circle.java'], fingerprint)
@@ -0,0 +1,99 @@
+import pickle
+from unittest import TestCase
+
+from lexer.util import Token
+from parser.parser import Parser
+from util.util import DocumentedMethod, DocumentedProperty, Declaration, Javadoc
+
+
+class TestDataModel(TestCase):
+
+    def test_repr(self):
+        self.assertEqual(repr(Declaration()), 'Declaration[docs=None, annotations=[], access_modifier=None, '
+                                              'modifiers=[], type=None, name=None]')
+        self.assertEqual(repr(Token('NameState', 'x')), 'Token[value=x, state=NameState]')
+        self.assertEqual(repr(DocumentedProperty.create(None, [], 'private', ['static'], 'int', 'count')),
+                         'DocumentedProperty[docs=None, annotations=[], access_modifier=private, '
+                         'modifiers=[\'static\'], type=int, name=count]')
+
+    def test_slots(self):
+        method = DocumentedMethod()
+
+        with self.assertRaises(AttributeError):
+            method.unknown = None
+
+    def test_equality_and_pickle(self):
+        source = 'package a;\nclass A {\n    /** doc */\n    public static List<String> names(int x) { }\n}\n'
+        documented_file = Parser.parse_structure(source)
+        restored = pickle.loads(pickle.dumps(documented_file, pickle.HIGHEST_PROTOCOL))
+
+        self.assertEqual(restored.classes, documented_file.classes)
+        self.assertNotEqual(restored.classes[0].methods[0], DocumentedMethod())
+        self.assertEqual(Token('NameState', 'x'), Token('NameState', 'x'))
+        self.assertNotEqual(Token('NameState', 'x'), Token('DelimiterState', 'x'))
+
+    def test_repeated_strings_are_interned(self):
+        source = 'class A {\n    public static String a;\n    public static String b;\n}\n'
+        first, second = Parser.parse_structure(source).classes[0].properties
+
+        self.assertIs(first.access_modifier, second.access_modifier)
+        self.assertIs(first.modifiers[0], second.modifiers[0])
+        self.assertIs(first.type, second.type)
+
+    def test_javadoc(self):
+        docs = '''/**
+     * Runs it. Then stops
+     *   when asked.
+     *
+     * @param x the x,
+     *          never null
+     * @return the result
+     * @throws IOException on failure
+     * @see Other
+     * @since 1.0
+     * @deprecated use {@link Other}
+     */'''
+        javadoc = DocumentedMethod.create(docs, [], 'public', [], 'int', 'run', [['int', 'x']]).javadoc
+
+        self.assertEqual(javadoc.summary, 'Runs it.')
+        self.assertEqual(javadoc.body, 'Then stops\n  when asked.')
+        self.assertEqual(javadoc.params, {'x': 'the x,\nnever null'})
+        self.assertEqual(javadoc.returns, 'the result')
+        self.assertEqual(javadoc.throws, {'IOException': 'on failure'})
+        self.assertEqual(javadoc.see, ('Other',))
+        self.assertEqual(javadoc.deprecated, 'use {@link Other}')
+        self.assertEqual(javadoc.tags, (('since', '1.0'),))
+
+    def test_javadoc_is_cached_and_shared(self):
+        source = 'class A {\n    /** Same. */\n    int a;\n    /** Same. */\n    int b;\n}\n'
+        first, second = Parser.parse_structure(source).classes[0].properties
+
+        self.assertIs(first.javadoc, first.javadoc)
+        self.assertIs(first.javadoc, second.javadoc)
+        self.assertEqual(first.javadoc.summary, 'Same.')
+        self.assertIsNone(DocumentedProperty().javadoc)
+
+        first.docs = '/** Changed. */'
+        self.assertEqual(first.javadoc.summary, 'Changed.')
+
+    def test_javadoc_is_read_only(self):
+        javadoc = Javadoc.parse('/**\n * Shared.\n * @param x the x\n * @see Other\n */')
+
+        with self.assertRaises(TypeError):
+            javadoc.params['y'] = 'the y'
+        with self.assertRaises(AttributeError):
+            javadoc.see.append('Another')
+        with self.assertRaises(AttributeError):
+            javadoc.summary = 'Changed.'
+
+        self.assertEqual(Javadoc.parse(javadoc.text).params, {'x': 'the x'})
+        self.assertEqual(Javadoc.parse(javadoc.text).see, ('Other',))
+
+    def test_javadoc_is_not_pickled(self):
+        method = DocumentedMethod.create('/** doc */', [], 'public', [], 'void', 'run', [])
+        javadoc = method.javadoc
+        restored = pickle.loads(pickle.dumps(method, pickle.HIGHEST_PROTOCOL))
+
+        self.assertEqual(restored, method)
+        self.assertNotIn(b'Javadoc', pickle.dumps(method, pickle.HIGHEST_PROTOCOL))
+        self.assertIs(restored.javadoc, javadoc)
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from util.util import DocumentedFile
+from util.util import DocumentedFile, DocumentedClass, SymbolIndex
 
 
 class TestDocumentedFile(TestCase):
@@ -34,3 +34,41 @@ class TestDocumentedFile(TestCase):
 
         # or return link to online java doc
         self.assertEqual(file.get_doc_import_path('JavaClass', []), None)
+
+    def test_get_import_path_repeated_lookups(self):
+        file = DocumentedFile()
+        file.package = 'org.test.package'
+        file.imports = ['org.test.package.core.A', 'org.test.package.core.B']
+
+        file_list = [DocumentedFile(), DocumentedFile()]
+        for f, name in zip(file_list, ['A', 'B']):
+            f.package = 'org.test.package.core'
+            f.file_path = 'org/test/package/core/{}.java'.format(name)
+
+        index = SymbolIndex(file_list)
+        self.assertEqual(index.get_doc_path('B', file), 'core/B.java.html')
+        self.assertEqual(index.get_doc_path('A', file), 'core/A.java.html')
+        self.assertEqual(index.get_doc_path('B', file), 'core/B.java.html')
+
+    def test_symbol_index_same_package_and_inner_classes(self):
+        outer = DocumentedFile()
+        outer.package = 'org.test'
+        outer.file_path = 'org/test/Outer.java'
+        inner = DocumentedClass()
+        inner.name = 'Inner'
+        outer_class = DocumentedClass()
+        outer_class.name = 'Outer<T>'
+        outer_class.inner_classes = [inner]
+        outer.classes = [outer_class]
+
+        file = DocumentedFile()
+        file.package = 'org.test'
+        file.file_path = 'org/test/User.java'
+
+        index = SymbolIndex([outer, file])
+        self.assertEqual(index.get_doc_path('Outer', file), 'Outer.java.html')
+        self.assertEqual(index.get_doc_path('Outer.Inner', file), 'Outer.java.html#Outer.Inner')
+        self.assertEqual(index.get_doc_path('org.test.Outer.Inner', file), 'Outer.java.html#Outer.Inner')
+        self.assertEqual(index.get_doc_path('Inner', outer), 'Outer.java.html#Outer.Inner')
+        self.assertIsNone(index.get_doc_path('Inner', file))
+        self.assertIsNone(index.get_doc_path(None, file))
@@ -2,12 +2,22 @@ from pprint import pprint
 from unittest import TestCase
 
 from lexer.fmt import FiniteStateMachine
-from lexer.states import CharacterEvent, MultilineCommentState, InitialState, JavadocState, SkipState, CommentState
-from lexer.util import LexerPartition, Token
+from lexer.states import CharacterEvent, MultilineCommentState, InitialState, JavadocState, SkipState, CommentState, \
+    StateMeta
+from lexer.util import LexerPartition, Token, KeywordTable, TokenKind
 
 
 class TestStates(TestCase):
 
+    def setUp(self):
+        # every test starts without shared states, the ones created before are restored afterwards
+        self.flyweights = StateMeta._flyweights.copy()
+        StateMeta._flyweights.clear()
+
+    def tearDown(self):
+        StateMeta._flyweights.clear()
+        StateMeta._flyweights.update(self.flyweights)
+
     def test_WhitespaceState(self):
         self.fmt = FiniteStateMachine(InitialState())
         test_string = '  \n \t'
@@ -115,6 +125,17 @@ class TestStates(TestCase):
         self.fmt.step(event=CharacterEvent(1, test_string))
         self.assertEqual(self.fmt.state.type, 'CommentState')
 
+    def test_SkipState_shared(self):
+        state = SkipState(InitialState(), skip_count=2)
+
+        self.assertIs(SkipState(InitialState(), False, 2), state)
+        self.assertIs(SkipState(InitialState(), False, skip_count=2, separated=False), state)
+        self.assertIsNot(SkipState(InitialState(), activate=True, skip_count=2), state)
+        self.assertTrue(SkipState(InitialState(), True, 2)._activate_next_state)
+
+        with self.assertRaises(TypeError):
+            SkipState(InitialState(), activated=True)
+
     def test_AnnotationState(self):
         self.fmt = FiniteStateMachine(InitialState())
         test_string = '@x class C/*c0*/@y void main/**javadoc*/@z(p = 1, q = 2)/*c1*/'
@@ -132,5 +153,47 @@ class TestStates(TestCase):
         self.assert_contains_state('AnnotationState', '@z(p = 1, q = 2)', self.fmt.partition)
         self.assert_contains_state('MultilineCommentState', '/*c1*/', self.fmt.partition)
 
+    def test_CharacterEvent_lookahead(self):
+        test_string = 'class'
+        event = CharacterEvent(0, test_string)
+
+        self.assertEqual(event.lookahead(2), 'la')
+        self.assertTrue(event.is_start_of('class'))
+        self.assertFalse(event.is_start_of('classes'))
+
+        event.move_to(3)
+        self.assertEqual(event.character_met, 's')
+        self.assertEqual(event.lookahead(3), 's  ')
+
+        event.move_to(len(test_string))
+        self.assertTrue(event.eof)
+        self.assertEqual(event.lookahead(1), ' ')
+        self.assertFalse(event.is_start_of('c'))
+
+    def test_KeywordTable(self):
+        table = KeywordTable({'class': 'IdentifierState'})
+        table.add('record', 'IdentifierState')
+        table.add('@interface', 'IdentifierState')
+
+        self.assertEqual(table.match(CharacterEvent(0, 'record R')), ('record', 'IdentifierState'))
+        self.assertEqual(table.match(CharacterEvent(0, '@interface A')), ('@interface', 'IdentifierState'))
+        self.assertIsNone(table.match(CharacterEvent(0, 'records')))
+        self.assertIsNone(table.match(CharacterEvent(0, '@Override')))
+
+    def test_TokenKind(self):
+        self.assertEqual(TokenKind.of('ArgumentsParenthesisState'), TokenKind.ARGUMENTS_PARENTHESIS)
+        self.assertEqual(TokenKind.OPEN_BRACKET.state_name, 'OpenBracketState')
+
+        token = Token('NameState', 'x')
+        self.assertEqual(token.kind, TokenKind.NAME)
+        self.assertEqual(token.state, 'NameState')
+        self.assertEqual(token, Token(TokenKind.NAME, 'x'))
+
+        partition = LexerPartition([('NameState', 'x'), ('WhitespaceState', ' '), ('DelimiterState', ';')])
+        self.assertEqual(partition.exclude('WhitespaceState').sequence,
+                         partition.exclude(TokenKind.WHITESPACE).sequence)
+        self.assertEqual([token.kind for token in partition.exclude('WhitespaceState').sequence],
+                         [TokenKind.NAME, TokenKind.DELIMITER])
+
     def assert_contains_state(self, state_type, string_value, partition: LexerPartition):
         self.assertIn(Token(state_type, string_value), partition.sequence)
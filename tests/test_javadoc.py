@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from page.javadoc import DocTemplate
+
+
+def render_link(class_name, label):
+    return '[{0}|{1}]'.format(class_name, label)
+
+
+class TestDocTemplate(TestCase):
+
+    def test_strip_comment(self):
+        doc = '/**\n     * Runs it.\n     *\n     * @since 1.0\n     */'
+        self.assertEqual(DocTemplate(doc).render(render_link),
+                         '\nRuns it.\n\n<span class="text-primary">@since</span> 1.0\n')
+
+    def test_code(self):
+        self.assertEqual(DocTemplate('* {@code a < b} and {@literal @x}').render(render_link),
+                         'a &lt; b and @x\n')
+
+    def test_links(self):
+        doc = '* {@link Foo}, {@linkplain a.b.Bar the bar}, {@link Foo#run(int)} and {@link #stop}'
+        self.assertEqual(DocTemplate(doc).render(render_link),
+                         '[Foo|None], [a.b.Bar|the bar], [Foo|Foo.run(int)] and [|stop]\n')
+
+    def test_value(self):
+        self.assertEqual(DocTemplate('* {@value} {@value Foo#MAX}').render(render_link), ' Foo#MAX\n')
+
+    def test_tags_are_not_read_inside_code(self):
+        self.assertEqual(DocTemplate('* @param{@code @return}').render(render_link),
+                         '<span class="text-primary">@param</span>@return\n')
+
+    def test_tokens_do_not_span_lines(self):
+        self.assertEqual(DocTemplate('* {@code a\n* b}').render(render_link),
+                         '{<span class="text-primary">@code</span> a\nb}\n')
+
+    def test_compile_is_memoized(self):
+        doc = '/** {@link Foo} */\n * shared'
+        self.assertIs(DocTemplate.compile(doc), DocTemplate.compile(doc))
+
+    def test_render_without_links(self):
+        template = DocTemplate('* plain')
+        self.assertEqual(template.render(None), 'plain\n')
@@ -1,8 +1,40 @@
+import os
+import tempfile
 from unittest import TestCase
 
+from page.generator import PageGenerator
 from parser.parser import Parser
 
 
 class TestPageGenerator(TestCase):
     def test_from_directory(self):
         Parser.parse('tests/testdata/Java/', 'html/', verbose=True)
+
+    def test_package_structure_rendered_once(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            Parser.parse('tests/testdata/Java/', output_dir, use_cache=False)
+
+            with open(os.path.join(output_dir, 'package_structure.html')) as file:
+                package_structure = file.read()
+            with open(os.path.join(output_dir, 'package_manifest.js')) as file:
+                manifest = file.read()
+            with open(os.path.join(output_dir, 'org/example/core/Circle.java.html')) as file:
+                page = file.read()
+
+            self.assertIn('"org/example/util/Maps.java"', manifest)
+            self.assertNotIn('Maps', package_structure)
+            self.assertIn('src="../../../package_structure.html#org/example/core/Circle.java"', page)
+            self.assertNotIn('Maps.java.html', page)
+
+    def test_package_manifest(self):
+        tree = Parser.generate_tree('tests/testdata/Java/')
+        Parser._parse_tree(tree, tree.directory, 'fsm', False, 1)
+
+        name, files, packages = PageGenerator.package_manifest(tree)
+        org = packages[0]
+        example = org[2][0]
+
+        self.assertEqual((name, files), ('tests/testdata/Java/', []))
+        self.assertEqual(org[0], 'org')
+        self.assertEqual(sorted(package[0] for package in example[2]), ['api', 'core', 'util'])
+        self.assertIn('org/example/util/Maps.java', [file for package in example[2] for file in package[1]])
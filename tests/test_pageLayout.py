@@ -0,0 +1,152 @@
+import html
+import os
+import tempfile
+from unittest import TestCase
+
+from page.generator import PageGenerator
+from page.layout import PageLayout
+from page.search import SearchIndex
+from parser.parser import Parser
+from util.util import SymbolIndex
+
+SOURCE = '''package org.example;
+
+/** Outer class. */
+public class Outer {
+    public void first() { }
+
+    public void second() { }
+
+    /** Large inner class. */
+    static class Large {
+        public void a() { }
+        public void b() { }
+        public void c() { }
+
+        class Nested {
+            public void d() { }
+            public void e() { }
+        }
+    }
+
+    enum Small { ONE }
+}
+'''
+
+
+class TestPageLayout(TestCase):
+
+    def setUp(self):
+        self.documented_file = Parser.parse_structure(SOURCE)
+        self.documented_file.file_path = 'org/example/Outer.java'
+        self.symbol_index = SymbolIndex([self.documented_file])
+
+    def test_one_page_per_file_by_default(self):
+        layout = PageLayout()
+
+        self.assertEqual(layout.split_classes(self.documented_file), set())
+        self.assertEqual([page for page, _ in PageGenerator.stream_pages(self.documented_file, self.symbol_index)],
+                         ['org/example/Outer.java.html'])
+
+    def test_largest_classes_move_out_first(self):
+        self.assertEqual(PageLayout(20).split_classes(self.documented_file), set())
+        self.assertEqual(PageLayout(8).split_classes(self.documented_file), {'Outer.Large'})
+        self.assertEqual(PageLayout(5).split_classes(self.documented_file), {'Outer.Large', 'Outer.Large.Nested'})
+        self.assertEqual(PageLayout(0).split_classes(self.documented_file),
+                         {'Outer', 'Outer.Large', 'Outer.Large.Nested'})
+
+    def test_split_pages(self):
+        layout = PageLayout(8)
+        pages = dict(PageGenerator.render_pages(self.documented_file, self.symbol_index, layout))
+
+        self.assertEqual(sorted(pages), ['org/example/Outer.java.Outer.Large.html', 'org/example/Outer.java.html'])
+        self.assertIn('<a href="Outer.java.Outer.Large.html">Large</a>', pages['org/example/Outer.java.html'])
+        self.assertIn('<a href="package-summary.html">org.example</a>', pages['org/example/Outer.java.html'])
+        self.assertNotIn('id="Outer.Large.a()"', pages['org/example/Outer.java.html'])
+
+        for symbol in SearchIndex.decode(SearchIndex.build([self.documented_file], layout)):
+            with self.subTest(anchor=symbol['anchor']):
+                self.assertIn('id="{}"'.format(html.escape(symbol['anchor'])), pages[symbol['page']])
+
+    def test_links_to_split_classes(self):
+        user = Parser.parse_structure('package org.example;\n\n'
+                                      'public class User extends Outer.Large implements Outer.Small {}\n')
+        user.file_path = 'org/example/User.java'
+        layout = PageLayout(8)
+
+        page = PageGenerator.render_file(user, SymbolIndex([self.documented_file, user], layout))
+
+        self.assertIn('<a class="" href="Outer.java.Outer.Large.html">Large</a>', page)
+        self.assertIn('<a class="" href="Outer.java.html#Outer.Small">Small</a>', page)
+
+    def test_package_summary(self):
+        layout = PageLayout(8)
+        page = ''.join(PageGenerator.stream_package_summary('org/example', [self.documented_file],
+                                                            self.symbol_index, layout))
+
+        self.assertIn('<a href="Outer.java.html#Outer">Outer</a>', page)
+        self.assertIn('Outer class.', page)
+        self.assertIn('src="../../package_structure.html#org/example/package-summary"', page)
+
+    def test_stale_pages_removed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source_dir = os.path.join(tmp, 'src')
+            output_dir = os.path.join(tmp, 'out')
+            os.makedirs(os.path.join(source_dir, 'org/example'))
+            with open(os.path.join(source_dir, 'org/example/Outer.java'), 'w') as file:
+                file.write(SOURCE)
+
+            def output_files():
+                return sorted(os.listdir(os.path.join(output_dir, 'org/example')))
+
+            Parser.parse(source_dir, output_dir, split_members=0, jobs=2)
+            self.assertEqual(output_files(), ['Outer.java.Outer.Large.Nested.html', 'Outer.java.Outer.Large.html',
+                                              'Outer.java.Outer.html', 'Outer.java.html', 'package-summary.html'])
+
+            Parser.parse(source_dir, output_dir, split_members=8)
+            self.assertEqual(output_files(), ['Outer.java.Outer.Large.html', 'Outer.java.html',
+                                              'package-summary.html'])
+
+            Parser.parse(source_dir, output_dir)
+            self.assertEqual(output_files(), ['Outer.java.html'])
+
+            Parser.parse(source_dir, output_dir, split_members=0)
+            PageGenerator.remove_file('org/example/Outer.java', output_dir)
+            self.assertEqual(output_files(), ['package-summary.html'])
+
+    def test_links_follow_split_classes_between_builds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source_dir = os.path.join(tmp, 'src')
+            output_dir = os.path.join(tmp, 'out')
+            os.makedirs(os.path.join(source_dir, 'org/example'))
+            with open(os.path.join(source_dir, 'org/example/Outer.java'), 'w') as file:
+                file.write(SOURCE)
+            with open(os.path.join(source_dir, 'org/example/User.java'), 'w') as file:
+                file.write('package org.example;\n\npublic class User extends Outer.Large {}\n')
+
+            def user_page():
+                with open(os.path.join(output_dir, 'org/example/User.java.html')) as file:
+                    return file.read()
+
+            Parser.parse(source_dir, output_dir, split_members=8)
+            self.assertIn('href="Outer.java.Outer.Large.html"', user_page())
+
+            with open(os.path.join(source_dir, 'org/example/Outer.java'), 'w') as file:
+                file.write(SOURCE.replace('public void a() { }', ''))
+            Parser.parse(source_dir, output_dir, split_members=8)
+            self.assertIn('href="Outer.java.html#Outer.Large"', user_page())
+
+    def test_deleted_class_page_is_rewritten(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source_dir = os.path.join(tmp, 'src')
+            output_dir = os.path.join(tmp, 'out')
+            os.makedirs(os.path.join(source_dir, 'org/example'))
+            with open(os.path.join(source_dir, 'org/example/Outer.java'), 'w') as file:
+                file.write(SOURCE)
+
+            class_page = os.path.join(output_dir, 'org/example/Outer.java.Outer.Large.html')
+
+            Parser.parse(source_dir, output_dir, split_members=8)
+            os.remove(class_page)
+            Parser.parse(source_dir, output_dir, split_members=8)
+            self.assertTrue(os.path.exists(class_page))
@@ -0,0 +1,87 @@
+import os
+import stat
+import tempfile
+from unittest import TestCase, mock
+
+from page.writer import PageWriter
+from parser.parser import Parser
+
+
+class TestPageWriter(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.tmp.name, 'org', 'Page.java.html')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_write_if_changed(self):
+        self.assertTrue(PageWriter.write(self.file_path, ['<html>', 'ą', '</html>']))
+        os.utime(self.file_path, (0, 0))
+
+        self.assertFalse(PageWriter.write(self.file_path, ['<html>ą</html>']))
+        self.assertEqual(os.stat(self.file_path).st_mtime, 0)
+
+        self.assertTrue(PageWriter.write(self.file_path, ['<html>ę</html>']))
+        with open(self.file_path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), '<html>ę</html>')
+
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ['Page.java.html'])
+
+        with open(self.file_path + '.plain', 'w'):
+            pass
+        self.assertEqual(stat.S_IMODE(os.stat(self.file_path).st_mode),
+                         stat.S_IMODE(os.stat(self.file_path + '.plain').st_mode))
+
+    def test_unchanged_file_is_not_copied(self):
+        PageWriter.write(self.file_path, ['<html>', 'body', '</html>'])
+
+        with mock.patch.object(PageWriter, '_create_temp', wraps=PageWriter._create_temp) as create_temp:
+            self.assertFalse(PageWriter.write(self.file_path, ['<html>body', '</html>']))
+            self.assertEqual(create_temp.call_count, 0)
+
+            # a change after the first chunk, a shorter and a longer file
+            for chunks in [['<html>', 'head', '</html>'], ['<html>'], ['<html>', '</html>', '\n']]:
+                self.assertTrue(PageWriter.write(self.file_path, chunks))
+                with open(self.file_path) as file:
+                    self.assertEqual(file.read(), ''.join(chunks))
+            self.assertEqual(create_temp.call_count, 3)
+
+    def test_write_failure_keeps_previous_file(self):
+        PageWriter.write(self.file_path, ['previous'])
+
+        def chunks():
+            yield 'next'
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            PageWriter.write(self.file_path, chunks())
+
+        with open(self.file_path) as file:
+            self.assertEqual(file.read(), 'previous')
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ['Page.java.html'])
+
+    def test_matches(self):
+        PageWriter.write_keyed(self.file_path, 'abc', ['<p>Generation date: <code>2020-01-01</code></p>'])
+
+        self.assertTrue(PageWriter.matches(self.file_path, 'abc'))
+        self.assertFalse(PageWriter.matches(self.file_path, 'abd'))
+        self.assertFalse(PageWriter.matches(self.file_path + '.missing', 'abc'))
+
+        PageWriter.write(self.file_path, ['<p>Generation date: <code>2020-01-01</code></p>'])
+        self.assertFalse(PageWriter.matches(self.file_path, 'abc'))
+
+    def test_rebuild_leaves_output_untouched(self):
+        output_dir = os.path.join(self.tmp.name, 'html')
+        Parser.parse('tests/testdata/Java/', output_dir, use_cache=False)
+
+        html_files = [os.path.join(root, file) for root, _, files in os.walk(output_dir) for file in files
+                      if file.endswith('.html')]
+        for file_path in html_files:
+            os.utime(file_path, (0, 0))
+
+        Parser.parse('tests/testdata/Java/', output_dir, use_cache=False)
+
+        self.assertIn(os.path.join(output_dir, 'index.html'), html_files)
+        self.assertEqual([file_path for file_path in html_files if os.stat(file_path).st_mtime != 0], [])
@@ -343,3 +343,17 @@ public interface FilterResult extends Result, Serializable {
                                                                                            'innerClassMethod', [])],
                                                                [])]),
             file.classes[0])
+
+    def test_parse_tree_in_parallel(self):
+        root_path = 'tests/testdata/Java'
+        serial_tree = self.parser._generate_tree_from_list(self.parser._list_files_hierarchy(root_path, False))
+        parallel_tree = self.parser._generate_tree_from_list(self.parser._list_files_hierarchy(root_path, False))
+
+        Parser._parse_tree(serial_tree, root_path, 'fsm', False, 1)
+        Parser._parse_tree(parallel_tree, root_path, 'fsm', False, 2)
+
+        serial_files, parallel_files = [], []
+        serial_tree.traverse(serial_files.append)
+        parallel_tree.traverse(parallel_files.append)
+
+        self.assertEqual(repr(serial_files), repr(parallel_files))
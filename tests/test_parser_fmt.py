@@ -1,11 +1,13 @@
 from pprint import pprint
 from unittest import TestCase
 
+from lexer.fmt import FiniteStateMachine
+from lexer.states import InitialState
 from lexer.util import Token, LexerPartition
-from parser.fmt import ParserFiniteStateMachine
-from parser.parser import Parser
+from parser.builder import StructureBuilder
+from parser.fmt import ParserFiniteStateMachine, TokenEvent
 from parser.states import ParserInitialState
-from util.util import DocumentedClass, DocumentedInterface, DocumentedMethod, Delimiter, DocumentedProperty
+from util.util import DocumentedClass, DocumentedInterface, DocumentedMethod, DocumentedProperty
 
 
 class TestFMT(TestCase):
@@ -22,9 +24,8 @@ class TestFMT(TestCase):
         fmt = ParserFiniteStateMachine(ParserInitialState())
         fmt.process_tokens(partition)
 
-        iterator = Parser.generate_data_objects(fmt.partition)
-        next(iterator)  # imports
-        self.assertEqual(next(iterator), DocumentedClass.create(None, [], None, [], 'E', None, [], [], []))
+        file = StructureBuilder().build(fmt.partition)
+        self.assertEqual(file.classes, [DocumentedClass.create(None, [], None, [], 'E', None, [], [], [])])
 
     def test_partition_for_class_2(self):
         test_list = [Token('JavadocState', 'doc1'), Token('JavadocState', 'doc2'), Token('AnnotationState', '@a'),
@@ -41,11 +42,10 @@ class TestFMT(TestCase):
         fmt = ParserFiniteStateMachine(ParserInitialState())
         fmt.process_tokens(partition)
 
-        iterator = Parser.generate_data_objects(fmt.partition)
-        next(iterator)  # imports
-        self.assertEqual(next(iterator),
-                         DocumentedClass.create('doc2', ['@a', '@b'], 'public', ['static'], 'A', 'B', ['C', 'D'], [],
-                                                []))
+        file = StructureBuilder().build(fmt.partition)
+        self.assertEqual(file.classes,
+                         [DocumentedClass.create('doc2', ['@a', '@b'], 'public', ['static'], 'A', 'B', ['C', 'D'], [],
+                                                 [])])
 
     def test_partition_for_interface(self):
         test_list = [Token('IdentifierState', 'interface'), Token('NameState', 'X<T>'),
@@ -59,12 +59,12 @@ class TestFMT(TestCase):
         fmt = ParserFiniteStateMachine(ParserInitialState())
         fmt.process_tokens(partition)
 
-        iterator = Parser.generate_data_objects(fmt.partition)
-        next(iterator)
-        self.assertEqual(next(iterator), DocumentedInterface.create(None, [], None, [], 'X<T>', ['E', 'Y'], [], []))
+        file = StructureBuilder().build(fmt.partition)
+        self.assertEqual(file.classes, [DocumentedInterface.create(None, [], None, [], 'X<T>', ['E', 'Y'], [], [])])
 
     def test_partition_for_method(self):
-        test_list = [Token('NameState', 'void'), Token('NameState', 'method'),
+        test_list = [Token('IdentifierState', 'class'), Token('NameState', 'A'), Token('OpenBracketState', '{'),
+                     Token('NameState', 'void'), Token('NameState', 'method'),
                      Token('ArgumentsParenthesisState', '(String arg, int arg)'),
                      Token('OpenBracketState', '{')]
 
@@ -74,9 +74,10 @@ class TestFMT(TestCase):
         fmt = ParserFiniteStateMachine(ParserInitialState())
         fmt.process_tokens(partition)
 
-        iterator = Parser.generate_data_objects(fmt.partition)
-        self.assertEqual(next(iterator), DocumentedMethod.create(None, [], 'package-private', [], 'void', 'method',
-                                                                 [['String', 'arg'], ['int', 'arg']]))
+        file = StructureBuilder().build(fmt.partition)
+        expected = DocumentedMethod.create(None, [], 'package-private', [], 'void', 'method',
+                                           [['String', 'arg'], ['int', 'arg']])
+        self.assertEqual(file.classes[0].methods, [expected])
 
     def test_parser(self):
         test_list = [Token('IdentifierState', 'class'), Token('NameState', 'X<T>'), Token('IdentifierState', 'extends'),
@@ -92,10 +93,65 @@ class TestFMT(TestCase):
         fmt = ParserFiniteStateMachine(ParserInitialState())
         fmt.process_tokens(partition)
 
-        iterator = Parser.generate_data_objects(fmt.partition)
-
-        next(iterator)  # imports
-        self.assertEqual(next(iterator), DocumentedClass.create(None, [], None, [], 'X<T>', 'E', [], [], []))
-        self.assertEqual(next(iterator), DocumentedProperty.create(None, [], 'package-private', [], 'String', 'property'))
-        self.assertEqual(next(iterator), DocumentedMethod.create(None, [], 'package-private', [], 'void', 'method',
-                                                                 [['String', 'arg'], ['int', 'arg']]))
+        file = StructureBuilder().build(fmt.partition)
+
+        expected = DocumentedClass.create(None, [], None, [], 'X<T>', 'E', [], [
+            DocumentedMethod.create(None, [], 'package-private', [], 'void', 'method',
+                                    [['String', 'arg'], ['int', 'arg']])
+        ], [])
+        expected.properties = [DocumentedProperty.create(None, [], 'package-private', [], 'String', 'property')]
+        self.assertEqual(file.classes, [expected])
+
+    def test_token_event_lookahead(self):
+        test_list = (Token('NameState', 'String'), Token('NameState', 'property'), Token('DelimiterState', ';'))
+
+        event = TokenEvent(test_list)
+        self.assertEqual(event.token, test_list[0])
+        self.assertEqual(event.peek(), test_list[1])
+        self.assertEqual(event.lookahead(5), test_list[1:])
+        self.assertEqual(event.peek(0), test_list[0])
+        with self.assertRaises(ValueError):
+            event.peek(-1)
+
+        event.advance().advance()
+        self.assertEqual(event.token, test_list[2])
+        self.assertIsNone(event.peek())
+        self.assertEqual(event.lookahead(1), ())
+
+        event.advance()
+        self.assertTrue(event.end)
+        self.assertIsNone(event.token)
+
+    def test_token_event_reads_lazily(self):
+        consumed = []
+
+        def tokens():
+            for value in ['String', 'property', ';', 'int', 'count', ';']:
+                consumed.append(value)
+                yield Token('DelimiterState' if value == ';' else 'NameState', value)
+
+        event = TokenEvent(tokens())
+        self.assertEqual(consumed, ['String'])
+        self.assertEqual(event.lookahead(2), (Token('NameState', 'property'), Token('DelimiterState', ';')))
+        self.assertEqual(len(consumed), 3)
+
+        event.advance()
+        self.assertEqual(event.token, Token('NameState', 'property'))
+        self.assertEqual(len(consumed), 3)
+
+    def test_parse_streams_partition(self):
+        source = 'class A { int a; int b; void c() { } }'
+        expected = ParserFiniteStateMachine(ParserInitialState())
+        lexer = FiniteStateMachine(InitialState())
+        lexer.process_string(source)
+        partition = lexer.partition.exclude('WhitespaceState', 'InitialState')
+        expected.process_tokens(partition)
+
+        consumed = []
+        tokens = FiniteStateMachine(InitialState()).tokens(source, ('WhitespaceState', 'InitialState'))
+        entries = ParserFiniteStateMachine(ParserInitialState()).parse(token for token in tokens
+                                                                      if consumed.append(token) is None)
+
+        self.assertEqual(next(entries), expected.partition[0])
+        self.assertLess(len(consumed), len(partition.sequence))
+        self.assertEqual([expected.partition[0]] + list(entries), expected.partition)
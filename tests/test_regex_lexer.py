@@ -0,0 +1,54 @@
+import glob
+import os
+from unittest import TestCase
+
+from lexer.fmt import FiniteStateMachine
+from lexer.regex_lexer import RegexLexer
+from lexer.states import InitialState
+
+testdata = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'testdata')
+
+
+class TestRegexLexer(TestCase):
+
+    def test_same_tokens_as_fsm(self):
+        paths = glob.glob(os.path.join(testdata, '**', '*.java'), recursive=True)
+        self.assertTrue(paths)
+
+        for path in paths:
+            with open(path, 'r') as file:
+                contents = file.read()
+
+            with self.subTest(path=path):
+                self.assertEqual(self.tokenize(FiniteStateMachine(InitialState()), contents),
+                                 self.tokenize(RegexLexer(), contents))
+
+    def test_same_tokens_as_fsm_for_edge_cases(self):
+        test_strings = ['/*xxx*//*z*/\n///*yyy*/',
+                        '/**/ x */ /** unclosed',
+                        '@x class C/*c0*/@y void main/**javadoc*/@z(p = 1, q = 2)/*c1*/',
+                        '@A@B @C; @D{',
+                        'class1 classes @interface static<T> List<T>x Map<K, V>(a) m(int[] a, T<?> b)',
+                        'a;;b==c {{}} x.y.z[] <a, b>']
+
+        for test_string in test_strings:
+            with self.subTest(test_string=test_string):
+                self.assertEqual(self.tokenize(FiniteStateMachine(InitialState()), test_string),
+                                 self.tokenize(RegexLexer(), test_string))
+
+    def test_streamed_tokens_match_partition(self):
+        paths = glob.glob(os.path.join(testdata, '**', '*.java'), recursive=True)
+
+        for path in paths:
+            with open(path, 'r') as file:
+                contents = file.read()
+
+            for lexer in [lambda: FiniteStateMachine(InitialState()), RegexLexer]:
+                with self.subTest(path=path, lexer=lexer):
+                    self.assertEqual(tuple(lexer().tokens(contents, ('WhitespaceState', 'InitialState'))),
+                                     self.tokenize(lexer(), contents))
+
+    @staticmethod
+    def tokenize(lexer, contents):
+        lexer.process_string(contents)
+        return lexer.partition.exclude('WhitespaceState', 'InitialState').sequence
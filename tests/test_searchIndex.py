@@ -0,0 +1,75 @@
+import html
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from page.generator import PageGenerator
+from page.search import SearchIndex
+from parser.parser import Parser
+from util.util import SymbolIndex
+
+SOURCE = '''package org.example;
+
+public class Outer<T> {
+    private int count;
+
+    public void getCount() { }
+
+    public void get(final int a, String b) { }
+
+    enum Color { RED, GREEN }
+
+    interface Listener {
+        void changed(Outer<T> outer);
+    }
+}
+'''
+
+
+class TestSearchIndex(TestCase):
+
+    def setUp(self):
+        self.documented_file = Parser.parse_structure(SOURCE)
+        self.documented_file.file_path = 'org/example/Outer.java'
+
+    def test_symbols(self):
+        symbols = SearchIndex.decode(SearchIndex.build([self.documented_file]))
+
+        self.assertEqual([(symbol['name'], symbol['kind'], symbol['anchor']) for symbol in symbols], [
+            ('changed', 'method', 'Outer.Listener.changed(Outer<T>)'),
+            ('Color', 'enum', 'Outer.Color'),
+            ('count', 'property', 'Outer.count'),
+            ('get', 'method', 'Outer.get(int,String)'),
+            ('getCount', 'method', 'Outer.getCount()'),
+            ('GREEN', 'value', 'Outer.Color.GREEN'),
+            ('Listener', 'interface', 'Outer.Listener'),
+            ('Outer<T>', 'class', 'Outer'),
+            ('RED', 'value', 'Outer.Color.RED'),
+        ])
+        self.assertEqual({symbol['page'] for symbol in symbols}, {'org/example/Outer.java.html'})
+
+    def test_names_are_front_coded(self):
+        entries = SearchIndex.build([self.documented_file])['symbols']
+
+        self.assertEqual(entries[3][:2], [0, 'get'])
+        self.assertEqual(entries[4][:2], [3, 'Count'])
+
+    def test_anchors_exist_on_pages(self):
+        page = PageGenerator.render_file(self.documented_file, SymbolIndex([self.documented_file]))
+
+        for symbol in SearchIndex.decode(SearchIndex.build([self.documented_file])):
+            with self.subTest(anchor=symbol['anchor']):
+                self.assertIn('id="{}"'.format(html.escape(symbol['anchor'])), page)
+
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertTrue(SearchIndex.write([self.documented_file], tmp))
+            self.assertFalse(SearchIndex.write([self.documented_file], tmp))
+
+            with open(os.path.join(tmp, SearchIndex.FILE_NAME), encoding='utf-8') as file:
+                script = file.read()
+
+        prefix = SearchIndex.CALLBACK + '('
+        self.assertTrue(script.startswith(prefix))
+        self.assertEqual(json.loads(script[len(prefix):-len(');\n')]), SearchIndex.build([self.documented_file]))
@@ -0,0 +1,44 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from util.source_reader import SourceReader
+
+
+class TestSourceReader(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, contents: bytes) -> str:
+        file_path = os.path.join(self.tmp.name, 'Source.java')
+        with open(file_path, 'wb') as file:
+            file.write(contents)
+        return file_path
+
+    def test_read_utf8(self):
+        self.assertEqual(SourceReader.read(self.write('/** Zażółć */'.encode('utf-8'))), '/** Zażółć */')
+
+    def test_read_fallback_encoding(self):
+        file_path = self.write('/** Zażółć */'.encode('cp1250'))
+
+        self.assertEqual(SourceReader.read(file_path, 'cp1250'), '/** Zażółć */')
+        self.assertEqual(SourceReader.read(file_path), '/** Za¿ó³æ */')
+
+    def test_read_translates_newlines(self):
+        self.assertEqual(SourceReader.read(self.write(b'class A {\r\n}\rclass B {}\n')), 'class A {\n}\nclass B {}\n')
+
+    def test_read_empty(self):
+        self.assertEqual(SourceReader.read(self.write(b'')), '')
+
+    def test_read_memory_mapped(self):
+        contents = 'class A {} // ą\n' * (SourceReader.MMAP_THRESHOLD // 8)
+        file_path = self.write(contents.encode('utf-8'))
+
+        with SourceReader.open_buffer(file_path) as buffer:
+            self.assertNotIsInstance(buffer, bytes)
+
+        self.assertEqual(SourceReader.read(file_path), contents)
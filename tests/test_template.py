@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from page.template import TextTemplate
+
+
+class TestTextTemplate(TestCase):
+
+    def test_render(self):
+        template = TextTemplate('<a href="{{ href }}">{{name}}</a>{{ name }}')
+        self.assertEqual(template.render(href='x.html', name='X'), '<a href="x.html">X</a>X')
+
+    def test_render_without_placeholders(self):
+        self.assertEqual(TextTemplate('plain {text}').render(name='X'), 'plain {text}')
+
+    def test_render_missing_argument(self):
+        self.assertEqual(TextTemplate('{{ name }}!').render(), 'None!')
+
+    def test_render_missing_argument_strict(self):
+        with self.assertRaises(KeyError):
+            TextTemplate('{{ name }}!', strict=True).render(other='X')
+
+    def test_stream(self):
+        template = TextTemplate('<ul>{{ items }}</ul>{{ count }}')
+        chunks = list(template.stream(items=('<li>{}</li>'.format(i) for i in range(3)), count=3))
+
+        self.assertEqual(chunks, ['<ul>', '<li>0</li>', '<li>1</li>', '<li>2</li>', '</ul>', '3', ''])
+        self.assertEqual(''.join(chunks), template.render(items='<li>0</li><li>1</li><li>2</li>', count=3))
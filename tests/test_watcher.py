@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
+
+from page.generator import PageGenerator
+from page.search import SearchIndex
+from parser.watcher import Watcher
+
+
+class TestWatcher(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.tmp, 'src')
+        self.output_dir = os.path.join(self.tmp, 'out')
+        shutil.copytree('tests/testdata/Java', self.source_dir)
+
+        self.watcher = Watcher(self.source_dir, self.output_dir)
+        self.watcher.rebuild()
+
+        self.maps_page = os.path.join(self.output_dir, 'org/example/util/Maps.java.html')
+        self.circle_page = os.path.join(self.output_dir, 'org/example/core/Circle.java.html')
+        for page in [self.maps_page, self.circle_page]:
+            os.utime(page, (0, 0))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def touch_source(self, rel_path: str, text: str):
+        path = os.path.join(self.source_dir, rel_path)
+        with open(path, 'a') as file:
+            file.write(text)
+        os.utime(path, (1, 1))
+
+    def test_no_changes(self):
+        self.assertEqual(self.watcher.rebuild(), 0)
+        self.assertEqual(os.path.getmtime(self.maps_page), 0)
+
+    def test_changed_file(self):
+        self.touch_source('org/example/util/Maps.java', 'class MapsHelper {}\n')
+
+        self.assertEqual(self.watcher.rebuild(), 1)
+        self.assertNotEqual(os.path.getmtime(self.maps_page), 0)
+        self.assertEqual(os.path.getmtime(self.circle_page), 0)
+
+        with open(os.path.join(self.output_dir, SearchIndex.FILE_NAME), encoding='utf-8') as file:
+            self.assertIn('"MapsHelper"', file.read())
+
+    def test_added_and_removed_file(self):
+        self.touch_source('org/example/util/Sets.java', 'package org.example.util;\npublic class Sets {}\n')
+
+        with mock.patch.object(PageGenerator, 'create_file', wraps=PageGenerator.create_file) as create_file:
+            self.assertEqual(self.watcher.rebuild(), 1)
+
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'org/example/util/Sets.java.html')))
+        self.assertEqual(create_file.call_count, 8)
+        # re-rendered, but the circle page itself did not change
+        self.assertEqual(os.path.getmtime(self.circle_page), 0)
+
+        os.remove(os.path.join(self.source_dir, 'org/example/util/Sets.java'))
+
+        self.assertEqual(self.watcher.rebuild(), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'org/example/util/Sets.java.html')))
+
+    def test_declared_class_updates_links(self):
+        self.touch_source('org/example/core/User.java',
+                          'package org.example.core;\npublic class User extends AbstractShape.Inner {}\n')
+        self.watcher.rebuild()
+
+        shape_path = os.path.join(self.source_dir, 'org/example/core/AbstractShape.java')
+        with open(shape_path) as file:
+            source = file.read()
+        with open(shape_path, 'w') as file:
+            file.write(source[:source.rindex('}')] + '    public static class Inner {}\n}\n')
+        os.utime(shape_path, (1, 1))
+        self.watcher.rebuild()
+
+        with open(os.path.join(self.output_dir, 'org/example/core/User.java.html')) as file:
+            self.assertIn('<a class="" href="AbstractShape.java.html#AbstractShape.Inner">Inner</a>', file.read())
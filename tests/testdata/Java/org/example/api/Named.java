@@ -0,0 +1,9 @@
+package org.example.api;
+
+/**
+ * Something with a human readable name.
+ */
+@FunctionalInterface
+public interface Named {
+    String name();
+}
@@ -0,0 +1,39 @@
+/*
+ * Shapes API.
+ */
+package org.example.api;
+
+import java.io.Serializable;
+
+/**
+ * A geometric shape.
+ *
+ * @see org.example.core.Circle
+ * @since 1.0
+ */
+public interface Shape extends Serializable, Comparable<Shape> {
+
+    /**
+     * Computes the area of this shape.
+     *
+     * @return the area, never negative
+     */
+    double area();
+
+    /**
+     * Scales the shape by {@code factor}.
+     *
+     * @param factor the scale factor
+     * @return a new scaled {@link Shape}
+     * @throws IllegalArgumentException if {@code factor <= 0}
+     */
+    Shape scale(double factor) throws IllegalArgumentException;
+
+    /**
+     * Compares shapes by area.
+     */
+    @Override
+    default int compareTo(Shape other) {
+        return Double.compare(area(), other.area());
+    }
+}
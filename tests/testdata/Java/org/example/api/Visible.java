@@ -0,0 +1,8 @@
+package org.example.api;
+
+/**
+ * Marks shapes that are rendered.
+ */
+public @interface Visible {
+    String layer() default "main";
+}
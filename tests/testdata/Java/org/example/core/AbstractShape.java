@@ -0,0 +1,25 @@
+package org.example.core;
+
+import org.example.api.Shape;
+
+/**
+ * Base class for shapes.
+ */
+public abstract class AbstractShape implements Shape {
+
+    /**
+     * Identifier of this shape.
+     */
+    protected String id;
+
+    /**
+     * Returns a short description, see {@link Circle}.
+     *
+     * @return the description
+     */
+    public String describe() {
+        return id + ": " + area();
+    }
+
+    protected abstract void validate();
+}
@@ -0,0 +1,91 @@
+/*
+ * Circle implementation.
+ */
+package org.example.core;
+
+import java.util.List;
+import java.util.ArrayList;
+import org.example.api.Shape;
+import org.example.api.Named;
+import static org.example.util.Colors.DEFAULT;
+
+/**
+ * A circle defined by its radius.
+ * Implements {@link Shape} and {@link Named}.
+ *
+ * @author example
+ */
+@Visible(layer = "front")
+public final class Circle extends AbstractShape implements Shape, Named {
+
+    /** Number of circles created so far. */
+    private static int created = 0;
+
+    /**
+     * Radius of the circle.
+     */
+    protected final double radius;
+
+    List<Point> points;
+
+    /**
+     * Creates a circle.
+     *
+     * @param radius the radius
+     */
+    public Circle(double radius) {
+        this.radius = radius;
+        created++;
+    }
+
+    @Override
+    public double area() {
+        return Math.PI * radius * radius;
+    }
+
+    /**
+     * {@inheritDoc}
+     */
+    @Override
+    public Shape scale(double factor) throws IllegalArgumentException {
+        if (factor <= 0) {
+            throw new IllegalArgumentException("factor");
+        }
+        return new Circle(radius * factor);
+    }
+
+    public String name() {
+        return "circle";
+    }
+
+    /**
+     * Returns the points on the circle.
+     *
+     * @param count how many points
+     * @return the points
+     */
+    public synchronized List<Point> points(int count) {
+        List<Point> result = new ArrayList<>();
+        for (int i = 0; i < count; i++) {
+            result.add(new Point(i, i));
+        }
+        return result;
+    }
+
+    /**
+     * A point on the plane.
+     */
+    public static class Point {
+        private final int x;
+        private final int y;
+
+        Point(int x, int y) {
+            this.x = x;
+            this.y = y;
+        }
+
+        public int getX() {
+            return x;
+        }
+    }
+}
@@ -0,0 +1,15 @@
+package org.example.util;
+
+/**
+ * Known colors.
+ */
+public enum Colors implements Named {
+    RED, GREEN, BLUE;
+
+    /** The default color. */
+    public static final Colors DEFAULT = RED;
+
+    public String name() {
+        return "color";
+    }
+}
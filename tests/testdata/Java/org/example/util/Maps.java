@@ -0,0 +1,32 @@
+package org.example.util;
+
+import java.util.Map;
+import java.util.HashMap;
+
+/**
+ * Map helpers.
+ */
+public class Maps {
+
+    private Maps() {}
+
+    /**
+     * Inverts a map.
+     *
+     * @param map the map to invert
+     * @param <K> key type
+     * @param <V> value type
+     * @return inverted map
+     */
+    public static <K, V> Map<V, K> invert(Map<K, V> map) {
+        Map<V, K> result = new HashMap<>();
+        for (Map.Entry<K, V> entry : map.entrySet()) {
+            result.put(entry.getValue(), entry.getKey());
+        }
+        return result;
+    }
+
+    // line comment
+    /* block comment */
+    public static <T> T first(java.util.List<T> values) { return values.get(0); }
+}
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import pickle
+from typing import List, Union
+
+from page.layout import PageLayout
+from util.source_reader import SourceReader, DEFAULT_FALLBACK_ENCODING
+from util.util import SourceFile, DocumentedFile, SymbolIndex
+
+GENERATOR_VERSION = 3
+
+
+class BuildCache:
+    """Parsed files and rendered page fingerprints from the previous run, stored in the output directory.
+
+    Files are parsed with a lexer and a fallback encoding, a cache stored with other ones is not used.
+    """
+
+    FILE_NAME = '.build_cache'
+
+    def __init__(self, output_dir: str, lexer: str = 'fsm', fallback_encoding: str = DEFAULT_FALLBACK_ENCODING):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, BuildCache.FILE_NAME)
+        self.settings = (lexer, fallback_encoding)
+        self.files = {}
+        self.pages = {}
+        self._hashes = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as file:
+                version, settings, files, pages = pickle.load(file)
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+            return
+
+        if version == GENERATOR_VERSION and settings == self.settings:
+            self.files = files
+            self.pages = pages
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump((GENERATOR_VERSION, self.settings, self.files, self.pages), file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+
+    def lookup(self, source_file: SourceFile, root_path: str) -> Union[SourceFile, DocumentedFile]:
+        rel_file_path = os.path.relpath(source_file.file_path, root_path)
+
+        with SourceReader.open_buffer(source_file.file_path) as buffer:
+            content_hash = hashlib.sha1(buffer).hexdigest()
+        self._hashes[rel_file_path] = content_hash
+
+        entry = self.files.get(rel_file_path)
+        if entry is not None and entry[0] == content_hash:
+            return entry[1]
+
+        return source_file
+
+    def update(self, file_list: List[DocumentedFile]) -> List[str]:
+        """Stores the parsed files of this run and returns paths of files that no longer exist."""
+        removed = [file_path for file_path in self.files if file_path not in self._hashes]
+
+        self.files = {documented_file.file_path: (self._hashes[documented_file.file_path], documented_file)
+                      for documented_file in file_list}
+
+        for file_path in removed:
+            self.pages.pop(file_path, None)
+
+        return removed
+
+    def stale_pages(self, file_list: List[DocumentedFile], templates_fingerprint: str,
+                    layout=None) -> List[DocumentedFile]:
+        """Returns files whose page inputs changed and records their new fingerprints.
+
+        A page depends on its own source, on the project structure (sidebar and link targets, including classes
+        declared in other files), on templates and on how classes are split into pages.
+        """
+        project = hashlib.sha1()
+        project.update(str(GENERATOR_VERSION).encode())
+        project.update(templates_fingerprint.encode())
+        if layout is not None:
+            project.update(layout.fingerprint().encode())
+        for documented_file in sorted(file_list, key=lambda f: f.file_path):
+            project.update('{}\0{}\0'.format(documented_file.file_path, documented_file.package).encode())
+        for class_name, page in SymbolIndex(file_list, layout).link_targets():
+            project.update('{}\0{}\0'.format(class_name, page).encode())
+        project_fingerprint = project.hexdigest()
+
+        stale = []
+        for documented_file in file_list:
+            fingerprint = project_fingerprint + self._hashes[documented_file.file_path]
+            if self.pages.get(documented_file.file_path) != fingerprint or not self._pages_exist(documented_file, layout):
+                stale.append(documented_file)
+                self.pages[documented_file.file_path] = fingerprint
+
+        return stale
+
+    def _pages_exist(self, documented_file: DocumentedFile, layout=None) -> bool:
+        page_paths = [PageLayout.file_page(documented_file.file_path)]
+        if layout is not None:
+            page_paths += [layout.class_page(documented_file.file_path, anchor)
+                           for anchor in layout.split_classes(documented_file)]
+
+        return all(os.path.exists(os.path.join(self.output_dir, page_path)) for page_path in page_paths)
@@ -0,0 +1,53 @@
+import contextlib
+import mmap
+import os
+from typing import Iterator, Union
+
+DEFAULT_FALLBACK_ENCODING = 'latin-1'
+
+
+class SourceReader:
+    """Reads sources as UTF-8 with a fallback encoding, large files are decoded straight from a memory map."""
+
+    MMAP_THRESHOLD = 1 << 16
+
+    @staticmethod
+    @contextlib.contextmanager
+    def open_buffer(file_path: str) -> Iterator[Union[bytes, mmap.mmap]]:
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            size = os.fstat(fd).st_size
+
+            if size >= SourceReader.MMAP_THRESHOLD:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as buffer:
+                    yield buffer
+                return
+
+            # small files: one read of the known size, without a buffered text wrapper
+            chunks = []
+            while True:
+                chunk = os.read(fd, max(size, 1))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            yield b''.join(chunks)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def read(file_path: str, fallback_encoding: str = DEFAULT_FALLBACK_ENCODING) -> str:
+        with SourceReader.open_buffer(file_path) as buffer:
+            return SourceReader.decode(buffer, fallback_encoding)
+
+    @staticmethod
+    def decode(buffer: Union[bytes, mmap.mmap], fallback_encoding: str = DEFAULT_FALLBACK_ENCODING) -> str:
+        try:
+            text = str(buffer, 'utf-8')
+        except UnicodeDecodeError:
+            text = str(buffer, fallback_encoding)
+
+        # same newlines as a file opened in text mode
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+
+        return text
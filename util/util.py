@@ -1,6 +1,12 @@
+import functools
 import os
+import re
+import sys
 from collections import deque
-from typing import List
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+from util.source_reader import SourceReader, DEFAULT_FALLBACK_ENCODING
 
 
 class Helpers:
@@ -11,9 +17,17 @@ class Helpers:
 
 
 class Representable:
+    __slots__ = ()
 
     def __repr__(self) -> str:
-        return '{}[{}]'.format(type(self).__name__, ', '.join('%s=%s' % item for item in vars(self).items()))
+        return '{}[{}]'.format(type(self).__name__, ', '.join('%s=%s' % item for item in self._attributes().items()))
+
+    def _attributes(self) -> dict:
+        try:
+            return vars(self)
+        except TypeError:
+            return {name: getattr(self, name) for cls in reversed(type(self).__mro__)
+                    for name in getattr(cls, '__slots__', ()) if not name.startswith('_')}
 
 
 class FileTreeNode:
@@ -67,29 +81,40 @@ class FileTreeNode:
             for subtree in tree.children:
                 queue.append(subtree)
 
-    def apply(self, function, verbose):
+    def apply(self, function, verbose, executor=None, chunksize=1, predicate=None):
+        slots = []
         queue = deque()
         queue.append(self)
 
         while queue:
             tree = queue.popleft()
             for i, file in enumerate(tree.files):
-                tree.files[i] = function(file)
-                if verbose:
-                    print('read', file.file_path)
+                if predicate is None or predicate(file):
+                    slots.append((tree, i, file))
 
             for subtree in tree.children:
                 queue.append(subtree)
 
+        files = [file for _, _, file in slots]
+        if executor is None:
+            results = map(function, files)
+        else:
+            results = executor.map(function, files, chunksize=chunksize)
+
+        # results come back in submission order, so the tree is filled the same way as in a serial run
+        for (tree, i, file), result in zip(slots, results):
+            tree.files[i] = result
+            if verbose:
+                print('read', file.file_path)
+
 
 class SourceFile(Representable):
 
     def __init__(self, file_path: str):
         self.file_path = file_path
 
-    def read_all(self):
-        with open(self.file_path, 'r') as file:
-            return file.read()
+    def read_all(self, fallback_encoding: str = DEFAULT_FALLBACK_ENCODING) -> str:
+        return SourceReader.read(self.file_path, fallback_encoding)
 
     def __eq__(self, o: object) -> bool:
         if isinstance(o, SourceFile):
@@ -100,7 +125,114 @@ class SourceFile(Representable):
         return hash(self.file_path)
 
 
-class DocumentedEnum(Representable):
+class Javadoc(Representable):
+    """Javadoc comment split into its description and block tags, inline tags are kept as written.
+
+    Parsed comments are shared by every declaration with the same docs, so they are read-only: block tags are held in
+    tuples and read-only mappings and only the compiled template can be set after parsing.
+    """
+    __slots__ = ('text', 'summary', 'body', 'params', 'returns', 'throws', 'see', 'deprecated', 'tags', 'template',
+                 '_frozen')
+
+    CACHE_SIZE = 4096
+
+    comment_line_regex = re.compile(r'^\s*(?:/\*\*+|\*+(?!/))?[ \t]?(.*?)\s*(?:\*+/)?\s*$')
+    block_tag_regex = re.compile(r'@([a-zA-Z]+)\s*(.*)', re.DOTALL)
+    sentence_end_regex = re.compile(r'\.(?=\s|$)')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.summary = ''
+        self.body = ''
+        self.params = {}  # type: Dict[str, str]
+        self.returns = None
+        self.throws = {}  # type: Dict[str, str]
+        self.see = []
+        self.deprecated = None
+        self.tags = []  # type: List[Tuple[str, str]]
+        # compiled by the page generator on first render
+        self.template = None
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return self.text == other.text
+        return False
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False) and name != 'template':
+            raise AttributeError('Javadoc is shared between declarations and cannot be changed: ' + name)
+        super().__setattr__(name, value)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=CACHE_SIZE)
+    def parse(text: str) -> 'Javadoc':
+        """Parses the comment once per distinct text, objects with the same docs share the result."""
+        self = Javadoc(text)
+
+        lines = [Javadoc.comment_line_regex.match(line).group(1) for line in text.split('\n')]
+
+        sections = [[]]
+        for line in lines:
+            if line.startswith('@') and line[1:2].isalpha():
+                sections.append([])
+            sections[-1].append(line)
+
+        description = '\n'.join(sections[0]).strip()
+        match = Javadoc.sentence_end_regex.search(description)
+        if match is None:
+            self.summary = description
+        else:
+            self.summary = description[:match.end()]
+            self.body = description[match.end():].strip()
+
+        for section in sections[1:]:
+            name, content = Javadoc.block_tag_regex.match('\n'.join(line.strip() for line in section)).groups()
+            self._add_block_tag(name, content.strip())
+
+        self.params = MappingProxyType(self.params)
+        self.throws = MappingProxyType(self.throws)
+        self.see = tuple(self.see)
+        self.tags = tuple(self.tags)
+        self._frozen = True
+        return self
+
+    def _add_block_tag(self, name: str, content: str):
+        if name in ('param', 'throws', 'exception'):
+            parts = content.split(None, 1)
+            key = parts[0] if parts else ''
+            (self.params if name == 'param' else self.throws)[key] = parts[1] if len(parts) > 1 else ''
+        elif name == 'return':
+            self.returns = content
+        elif name == 'see':
+            self.see.append(content)
+        elif name == 'deprecated':
+            self.deprecated = content
+        else:
+            self.tags.append((name, content))
+
+
+class Documented(Representable):
+    """Declaration with a Javadoc comment in docs, parsed on first access of javadoc."""
+    __slots__ = ('_javadoc',)
+
+    @property
+    def javadoc(self) -> Optional[Javadoc]:
+        if self.docs is None:
+            return None
+
+        javadoc = getattr(self, '_javadoc', None)
+        if javadoc is None or javadoc.text != self.docs:
+            javadoc = self._javadoc = Javadoc.parse(self.docs)
+        return javadoc
+
+    def __getstate__(self):
+        # the parsed comment is derived from docs and not stored in the build cache
+        return None, self._attributes()
+
+
+class DocumentedEnum(Documented):
+    __slots__ = ('docs', 'annotations', 'access_modifier', 'modifiers', 'name', 'extends', 'implements_list', 'methods',
+                 'inner_classes', 'properties', 'values')
 
     def __init__(self):
         self.docs = None
@@ -117,7 +249,7 @@ class DocumentedEnum(Representable):
 
     def __eq__(self, other):
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self._attributes() == other._attributes()
         return False
 
     @staticmethod
@@ -130,13 +262,9 @@ class DocumentedEnum(Representable):
         return self
 
 
-class EnumValue(Representable):
-
-    def __init__(self, value):
-        self.value = value
-
-
-class DocumentedClass(Representable):
+class DocumentedClass(Documented):
+    __slots__ = ('docs', 'annotations', 'access_modifier', 'modifiers', 'name', 'extends', 'implements_list', 'methods',
+                 'inner_classes', 'properties')
 
     def __init__(self):
         self.docs = None
@@ -152,7 +280,7 @@ class DocumentedClass(Representable):
 
     def __eq__(self, other):
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self._attributes() == other._attributes()
         return False
 
     @staticmethod
@@ -180,7 +308,9 @@ class DocumentedClass(Representable):
         return self
 
 
-class DocumentedInterface(Representable):
+class DocumentedInterface(Documented):
+    __slots__ = ('docs', 'annotations', 'access_modifier', 'modifiers', 'name', 'extends_list', 'methods',
+                 'inner_classes')
 
     def __init__(self):
         self.docs = None
@@ -194,7 +324,7 @@ class DocumentedInterface(Representable):
 
     def __eq__(self, other):
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self._attributes() == other._attributes()
         return False
 
     @staticmethod
@@ -221,7 +351,9 @@ class DocumentedInterface(Representable):
         return self
 
 
-class DocumentedMethod(Representable):
+class DocumentedMethod(Documented):
+    __slots__ = ('docs', 'annotations', 'access_modifier', 'modifiers', 'return_type', 'name', 'args', 'signature',
+                 'post_args', 'throws')
 
     def __init__(self):
         self.docs = None
@@ -237,7 +369,7 @@ class DocumentedMethod(Representable):
 
     def __eq__(self, other):
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self._attributes() == other._attributes()
         return False
 
     @staticmethod
@@ -247,7 +379,7 @@ class DocumentedMethod(Representable):
         if len(args_without_parenthesis) == 0:
             return []
         args_with_types = args_without_parenthesis.split(',')
-        return [arg.split() for arg in args_with_types]
+        return [[sys.intern(part) for part in arg.split()] for arg in args_with_types]
 
     @staticmethod
     def create(docs, annotations, access_modifier, modifiers, return_type, name, args,
@@ -275,7 +407,8 @@ class DocumentedMethod(Representable):
         return self
 
 
-class DocumentedProperty(Representable):
+class DocumentedProperty(Documented):
+    __slots__ = ('docs', 'annotations', 'access_modifier', 'modifiers', 'type', 'name')
 
     def __init__(self):
         self.docs = None
@@ -287,7 +420,7 @@ class DocumentedProperty(Representable):
 
     def __eq__(self, other):
         if type(other) is type(self):
-            return self.__dict__ == other.__dict__
+            return self._attributes() == other._attributes()
         return False
 
     @staticmethod
@@ -313,39 +446,8 @@ class DocumentedProperty(Representable):
         return self
 
 
-class Delimiter(Representable):
-
-    def __init__(self, char):
-        self.char = char
-
-    def __eq__(self, other):
-        if type(other) is type(self):
-            return self.__dict__ == other.__dict__
-        return False
-
-
-class Imports(Representable):
-
-    def __init__(self):
-        self.names = []
-
-    def add_name(self, name: str):
-        self.names.append(name)
-
-
-class PackageName(Representable):
-
-    def __init__(self):
-        self.name = None
-
-
-class MultilineComment(Representable):
-
-    def __init__(self, value):
-        self.value = value
-
-
 class Declaration(Representable):
+    __slots__ = ('docs', 'annotations', 'access_modifier', 'modifiers', 'type', 'name')
 
     def __init__(self):
         self.docs = None
@@ -375,20 +477,139 @@ class DocumentedFile(Representable):
         return os.path.join(*self.package.split('.'), self.get_full_file_name())
 
     def get_import_name(self):
+        if not self.package:
+            return self.get_file_name()
         return self.package + '.' + self.get_file_name()
 
+    def get_package_directory(self) -> str:
+        if self.file_path is not None:
+            return os.path.dirname(self.file_path)
+        return os.path.join(*self.package.split('.')) if self.package else ''
+
     def get_doc_import_path(self, class_name: str, file_list):
-        import_names = map(lambda f: f.get_import_name(), file_list)
-        for import_path in self.imports:
+        return SymbolIndex(file_list).get_doc_path(class_name, self)
+
+
+class SymbolIndex:
+    """Maps fully-qualified class names of the project, including inner classes, to the files declaring them.
+
+    With a page layout, links to classes written to a page of their own point to that page.
+    """
+
+    def __init__(self, file_list: List[DocumentedFile], layout=None):
+        self.paths = {}
+        self.anchors = {}
+        self.layout = layout
+        self._files = {}
+        self._split_classes = {}
+        self._scopes = {}
 
-            splitted_path = import_path.split('.')
-            if splitted_path[-1] == class_name:
+        for documented_file in file_list:
+            self.paths[documented_file.get_import_name()] = documented_file.file_path
+            self._files[documented_file.file_path] = documented_file
 
-                if import_path not in import_names:
-                    return None
+            prefix_length = len(documented_file.package) + 1 if documented_file.package else 0
+            for qualified_name, _ in SymbolIndex._declared_classes(documented_file):
+                if self.paths.setdefault(qualified_name, documented_file.file_path) == documented_file.file_path:
+                    self.anchors.setdefault(qualified_name, qualified_name[prefix_length:])
 
-                import_path = os.path.join(*splitted_path)
-                package_path = os.path.join(*self.package.split('.'))
+    @staticmethod
+    def _declared_classes(documented_file: DocumentedFile):
+        stack = [(documented_file.package, c) for c in reversed(documented_file.classes)]
+
+        while stack:
+            prefix, c = stack.pop()
+            if c.name is None:
+                continue
+
+            simple_name = SymbolIndex._strip_generics(c.name)
+            qualified_name = prefix + '.' + simple_name if prefix else simple_name
+            yield qualified_name, simple_name
+
+            stack.extend((qualified_name, inner) for inner in reversed(c.inner_classes))
+
+    @staticmethod
+    def _strip_generics(class_name: str) -> str:
+        return class_name.split('<', 1)[0].strip()
+
+    def _scope(self, documented_file: DocumentedFile):
+        entry = self._scopes.get(id(documented_file))
+        if entry is not None and entry[0] is documented_file:
+            return entry[1], entry[2]
+
+        names = {}
+        wildcards = []
+        for import_path in documented_file.imports:
+            if import_path.endswith('.*'):
+                wildcards.append(import_path[:-2])
+            else:
+                names[import_path.split('.')[-1]] = import_path
+
+        # classes declared in the file shadow imported ones
+        for qualified_name, simple_name in SymbolIndex._declared_classes(documented_file):
+            names[simple_name] = qualified_name
+
+        self._scopes[id(documented_file)] = (documented_file, names, wildcards)
+        return names, wildcards
+
+    def resolve(self, class_name: Optional[str], documented_file: DocumentedFile) -> Optional[str]:
+        """Returns path of the file declaring class_name as seen from documented_file."""
+        qualified_name = self._qualified_name(class_name, documented_file)
+        return self.paths[qualified_name] if qualified_name is not None else None
+
+    def _qualified_name(self, class_name: Optional[str], documented_file: DocumentedFile) -> Optional[str]:
+        if not class_name:
+            return None
+
+        class_name = SymbolIndex._strip_generics(class_name)
+        names, wildcards = self._scope(documented_file)
+
+        head, _, tail = class_name.partition('.')
+        if head in names:
+            candidates = [names[head] + ('.' + tail if tail else '')]
+        else:
+            candidates = []
+
+        if documented_file.package:
+            candidates.append(documented_file.package + '.' + class_name)
+        candidates.append(class_name)
+        candidates.extend(package + '.' + class_name for package in wildcards)
+
+        for candidate in candidates:
+            if candidate in self.paths:
+                return candidate
 
-                return os.path.relpath(import_path, package_path) + '.java.html'
         return None
+
+    def get_doc_path(self, class_name: Optional[str], documented_file: DocumentedFile) -> Optional[str]:
+        qualified_name = self._qualified_name(class_name, documented_file)
+        if qualified_name is None:
+            return None
+
+        return os.path.relpath(self._page(qualified_name), documented_file.get_package_directory() or os.curdir)
+
+    def link_targets(self) -> List[Tuple[str, str]]:
+        """Returns every class name with the page its links point to, sorted by the name."""
+        return sorted((qualified_name, self._page(qualified_name)) for qualified_name in self.paths)
+
+    def _page(self, qualified_name: str) -> str:
+        file_path = self.paths[qualified_name]
+        page = file_path + '.html'
+
+        anchor = self.anchors.get(qualified_name)
+        if anchor is not None:
+            if anchor in self._split(file_path):
+                page = self.layout.class_page(file_path, anchor)
+            elif anchor != self._files[file_path].get_file_name():
+                # the class the file is named after starts its page
+                page += '#' + anchor
+        return page
+
+    def _split(self, file_path: str):
+        if self.layout is None:
+            return ()
+
+        split = self._split_classes.get(file_path)
+        if split is None:
+            split = self._split_classes[file_path] = self.layout.split_classes(self._files[file_path])
+        return split